@@ -0,0 +1,284 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes a small reduced ordered binary decision diagram (BDD)
+  package used by the symbolic engine. Nodes are integers, 0 and 1 are the
+  FALSE and TRUE terminals, and every internal node is unique for its triple
+  (variable, low, high), so equal functions are the same node. Variables are
+  ordered by their index.
+
+  Operations are memoized in computed tables, which are cleared when they
+  grow over CACHE_LIMIT entries. Nodes are never freed, the number of nodes
+  allocated is available to measure the cost of the computations.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+import sys
+
+FALSE = 0
+TRUE = 1
+CACHE_LIMIT = 1 << 20
+
+
+class BDD(object):
+    """
+    Class to manage the nodes of BDDs over 'num_vars' boolean variables.
+    """
+
+    def __init__(self, num_vars):
+        self._num_vars = num_vars
+        self._var = [num_vars, num_vars]
+        self._low = [FALSE, TRUE]
+        self._high = [FALSE, TRUE]
+        self._unique = {}
+        self._caches = {"and": {}, "or": {}, "not": {}, "relprod": {}}
+        limit = 4 * num_vars + 1000
+        if sys.getrecursionlimit() < limit:
+            sys.setrecursionlimit(limit)
+
+
+    def node(self, var, low, high):
+        """ Get the node testing 'var' with children 'low' and 'high' """
+        if low == high:
+            return low
+        key = (var, low, high)
+        u = self._unique.get(key)
+        if u is None:
+            u = len(self._var)
+            self._var.append(var)
+            self._low.append(low)
+            self._high.append(high)
+            self._unique[key] = u
+        return u
+
+
+    def var(self, var):
+        """ Get the BDD of the variable 'var' """
+        return self.node(var, FALSE, TRUE)
+
+
+    def nvar(self, var):
+        """ Get the BDD of the negation of the variable 'var' """
+        return self.node(var, TRUE, FALSE)
+
+
+    def num_vars(self):
+        """ Get the number of variables """
+        return self._num_vars
+
+
+    def num_nodes(self):
+        """ Get the number of nodes allocated, including the terminals """
+        return len(self._var)
+
+
+    def top(self, u):
+        """ Get the variable tested by the node 'u' """
+        return self._var[u]
+
+
+    def _cache(self, name):
+        cache = self._caches[name]
+        if len(cache) > CACHE_LIMIT:
+            cache.clear()
+        return cache
+
+
+    def negation(self, u):
+        """ Get the BDD of not 'u' """
+        if u <= TRUE:
+            return TRUE - u
+        cache = self._cache("not")
+        result = cache.get(u)
+        if result is None:
+            result = self.node(self._var[u], self.negation(self._low[u]),
+                               self.negation(self._high[u]))
+            cache[u] = result
+        return result
+
+
+    def conjunction(self, u, v):
+        """ Get the BDD of 'u' and 'v' """
+        if u == FALSE or v == FALSE:
+            return FALSE
+        if u == TRUE or u == v:
+            return v
+        if v == TRUE:
+            return u
+        if u > v:
+            (u, v) = (v, u)
+        cache = self._cache("and")
+        result = cache.get((u, v))
+        if result is None:
+            (var, u_0, u_1, v_0, v_1) = self._cofactors(u, v)
+            result = self.node(var, self.conjunction(u_0, v_0),
+                               self.conjunction(u_1, v_1))
+            cache[(u, v)] = result
+        return result
+
+
+    def disjunction(self, u, v):
+        """ Get the BDD of 'u' or 'v' """
+        if u == TRUE or v == TRUE:
+            return TRUE
+        if u == FALSE or u == v:
+            return v
+        if v == FALSE:
+            return u
+        if u > v:
+            (u, v) = (v, u)
+        cache = self._cache("or")
+        result = cache.get((u, v))
+        if result is None:
+            (var, u_0, u_1, v_0, v_1) = self._cofactors(u, v)
+            result = self.node(var, self.disjunction(u_0, v_0),
+                               self.disjunction(u_1, v_1))
+            cache[(u, v)] = result
+        return result
+
+
+    def difference(self, u, v):
+        """ Get the BDD of 'u' and not 'v' """
+        return self.conjunction(u, self.negation(v))
+
+
+    def _cofactors(self, u, v):
+        """
+        Get the top variable of 'u' and 'v' and the cofactors of both nodes
+        for that variable.
+        """
+        var_u = self._var[u]
+        var_v = self._var[v]
+        var = min(var_u, var_v)
+        if var_u == var:
+            (u_0, u_1) = (self._low[u], self._high[u])
+        else:
+            (u_0, u_1) = (u, u)
+        if var_v == var:
+            (v_0, v_1) = (self._low[v], self._high[v])
+        else:
+            (v_0, v_1) = (v, v)
+        return (var, u_0, u_1, v_0, v_1)
+
+
+    def and_exists(self, u, v, variables):
+        """
+        Get the BDD of 'u' and 'v' with the 'variables' (a frozenset of
+        variable indexes) existentially quantified, without building the
+        conjunction first.
+        """
+        if u == FALSE or v == FALSE:
+            return FALSE
+        if u == TRUE and v == TRUE:
+            return TRUE
+        if u > v:
+            (u, v) = (v, u)
+        cache = self._cache("relprod")
+        key = (u, v, variables)
+        result = cache.get(key)
+        if result is not None:
+            return result
+        (var, u_0, u_1, v_0, v_1) = self._cofactors(u, v)
+        low = self.and_exists(u_0, v_0, variables)
+        if var in variables:
+            if low == TRUE:
+                result = TRUE
+            else:
+                result = self.disjunction(
+                    low, self.and_exists(u_1, v_1, variables))
+        else:
+            result = self.node(var, low, self.and_exists(u_1, v_1, variables))
+        cache[key] = result
+        return result
+
+
+    def exists(self, u, variables):
+        """ Get the BDD of 'u' with the 'variables' quantified """
+        return self.and_exists(u, TRUE, variables)
+
+
+    def rename(self, u, mapping):
+        """
+        Get the BDD of 'u' with its variables renamed by the dictionary
+        'mapping'. The renaming must keep the order of the variables of 'u'.
+        """
+        done = {}
+
+        def visit(u):
+            if u <= TRUE:
+                return u
+            result = done.get(u)
+            if result is None:
+                var = self._var[u]
+                result = self.node(mapping.get(var, var),
+                                   visit(self._low[u]), visit(self._high[u]))
+                done[u] = result
+            return result
+
+        return visit(u)
+
+
+    def size(self, u):
+        """ Get the number of nodes of the BDD 'u', including terminals """
+        seen = set()
+        pending = [u]
+        while pending:
+            u = pending.pop()
+            if u in seen:
+                continue
+            seen.add(u)
+            if u > TRUE:
+                pending.append(self._low[u])
+                pending.append(self._high[u])
+        return len(seen)
+
+
+    def count(self, u, variables):
+        """
+        Get the number of assignments of the sorted list of 'variables'
+        satisfying 'u', which must only depend on them.
+        """
+        rank = dict([(var, i) for (i, var) in enumerate(variables)])
+        rank[self._num_vars] = len(variables)
+        done = {FALSE: 0, TRUE: 1}
+
+        def visit(u):
+            if u not in done:
+                level = rank[self._var[u]]
+                low = self._low[u]
+                high = self._high[u]
+                done[u] = (
+                    visit(low) << (rank[self._var[low]] - level - 1)) + (
+                    visit(high) << (rank[self._var[high]] - level - 1))
+            return done[u]
+
+        return visit(u) << rank[self._var[u]]
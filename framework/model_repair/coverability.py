@@ -0,0 +1,290 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the coverability analysis of Petri Nets, following
+  the Karp-Miller construction. Markings are packed tuples where a place can
+  hold OMEGA, standing for an unbounded number of tokens. When a new marking
+  covers one of its ancestors, the places where it has more tokens are
+  accelerated to OMEGA, so the coverability graph is always finite.
+
+  Ancestors are compared only after a cheap test over the number of OMEGA
+  places and the total of tokens, and the maximal markings of the graph are
+  kept in an antichain sorted by total of tokens to answer covering queries.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+from bisect import bisect_right
+from collections import deque
+
+from error_handling import PetriNetException
+from logger import LOG
+from reachability import pack_marking, unpack_marking
+
+OMEGA = float("inf")
+
+
+def _get_key(state):
+    """
+    Get the pair (OMEGA places, total of finite tokens) of 'state'. If 'a' is
+    covered by 'b', the key of 'a' is not greater than the key of 'b'.
+    """
+    omegas = 0
+    total = 0
+    for value in state:
+        if value == OMEGA:
+            omegas += 1
+        else:
+            total += value
+    return (omegas, total)
+
+
+def covers(state_1, state_2):
+    """ Check if the packed marking 'state_1' covers 'state_2' """
+    for (value_1, value_2) in zip(state_1, state_2):
+        if value_1 < value_2:
+            return False
+    return True
+
+
+class Antichain(object):
+    """
+    Class to keep the maximal markings of a set, sorted by decreasing total
+    of tokens, so only markings with a total large enough are compared.
+    """
+
+    def __init__(self):
+        self._states = []
+        self._totals = []
+
+
+    def add(self, state):
+        """
+        Add 'state' unless it is covered, removing the markings it covers.
+        """
+        if self.covered(state):
+            return False
+        total = -self._total(state)
+        kept = [(other, other_total) for (other, other_total)
+                in zip(self._states, self._totals)
+                if other_total < total or not covers(state, other)]
+        self._states = [other for (other, _) in kept]
+        self._totals = [other_total for (_, other_total) in kept]
+        position = bisect_right(self._totals, total)
+        self._states.insert(position, state)
+        self._totals.insert(position, total)
+        return True
+
+
+    def covered(self, state):
+        """ Check if a marking in the antichain covers 'state' """
+        total = -self._total(state)
+        for position in xrange(bisect_right(self._totals, total)):
+            if covers(self._states[position], state):
+                return True
+        return False
+
+
+    def states(self):
+        """ Get the maximal markings """
+        return list(self._states)
+
+
+    def _total(self, state):
+        (omegas, total) = _get_key(state)
+        if omegas:
+            return OMEGA
+        return total
+
+
+class CoverabilityGraph(object):
+    """
+    Class to represent the Karp-Miller coverability graph of a Petri Net.
+    States are identified by integers in discovery order, the initial marking
+    is the state 0, and every state is a packed marking which can hold OMEGA.
+    """
+
+    def __init__(self, places, transitions):
+        self._places = list(places)
+        self._transitions = list(transitions)
+        self._markings = []
+        self._parents = []
+        self._keys = []
+        self._succesors = []
+        self._index = {}
+        self._maximal = Antichain()
+
+
+    def _add_state(self, state, parent):
+        """ Add the packed marking 'state', discovered from 'parent' """
+        state_id = len(self._markings)
+        self._markings.append(state)
+        self._parents.append(parent)
+        self._keys.append(_get_key(state))
+        self._succesors.append([])
+        self._index[state] = state_id
+        self._maximal.add(state)
+        return state_id
+
+
+    def _accelerate(self, parent, state):
+        """
+        Set to OMEGA the places where 'state' has more tokens than an
+        ancestor it covers, starting from the state 'parent'.
+        """
+        state = list(state)
+        key = _get_key(state)
+        ancestor = parent
+        while ancestor is not None:
+            (omegas, total) = self._keys[ancestor]
+            if omegas < key[0] or (omegas == key[0] and total <= key[1]):
+                marking = self._markings[ancestor]
+                if marking != tuple(state) and covers(state, marking):
+                    for (i, value) in enumerate(marking):
+                        if state[i] > value:
+                            state[i] = OMEGA
+                    key = _get_key(state)
+            ancestor = self._parents[ancestor]
+        return tuple(state)
+
+
+    def num_states(self):
+        """ Get the number of states """
+        return len(self._markings)
+
+
+    def num_edges(self):
+        """ Get the number of edges """
+        return sum([len(succ) for succ in self._succesors])
+
+
+    def marking(self, state_id):
+        """ Get the packed marking of a state """
+        return self._markings[state_id]
+
+
+    def marking_dict(self, state_id):
+        """ Get the marking of a state as a dictionary """
+        return unpack_marking(self._places, self._markings[state_id])
+
+
+    def succesors(self, state_id):
+        """ Get the (transition index, target id) edges of a state """
+        return list(self._succesors[state_id])
+
+
+    def edges(self):
+        """ Get the list of (source id, transition index, target id) edges """
+        return [(source, t_index, target)
+                for (source, succ) in enumerate(self._succesors)
+                for (t_index, target) in succ]
+
+
+    def maximal(self):
+        """ Get the maximal markings, a minimal coverability set """
+        return self._maximal.states()
+
+
+    def covers(self, m):
+        """ Check if the marking dictionary 'm' is coverable """
+        state = tuple([m.get(place, 0) for place in self._places])
+        return self._maximal.covered(state)
+
+
+    def place_bounds(self):
+        """
+        Get the bound of every place as a dictionary, OMEGA for the unbounded
+        places.
+        """
+        bounds = dict([(place, 0) for place in self._places])
+        for state in self._maximal.states():
+            for (place, value) in zip(self._places, state):
+                bounds[place] = max(bounds[place], value)
+        return bounds
+
+
+    def unbounded_places(self):
+        """ Get the list of unbounded places """
+        bounds = self.place_bounds()
+        return [place for place in self._places if bounds[place] == OMEGA]
+
+
+def coverability(net, m_0, stop_unbounded=False, max_states=None):
+    """
+    Build the CoverabilityGraph of 'net' from the marking 'm_0' in breadth
+    first order. If 'stop_unbounded' is True, the construction stops when the
+    first OMEGA is introduced. It fails if the graph has more than
+    'max_states' states.
+    """
+    pre = []
+    post = []
+    for transition in net._transitions:
+        pre.append([(net._place_index[place], value) for (place, value)
+                    in net._preset[transition].iteritems()])
+        post.append([(net._place_index[place], value) for (place, value)
+                     in net._postset[transition].iteritems()])
+    graph = CoverabilityGraph(net._places, net._transitions)
+    graph._add_state(pack_marking(net._places, m_0), None)
+    frontier = deque([0])
+    while frontier:
+        source = frontier.popleft()
+        state = graph.marking(source)
+        for t_index in xrange(len(pre)):
+            enabled = True
+            for (i, value) in pre[t_index]:
+                if state[i] < value:
+                    enabled = False
+                    break
+            if not enabled:
+                continue
+            target = list(state)
+            for (i, value) in pre[t_index]:
+                target[i] -= value
+            for (i, value) in post[t_index]:
+                target[i] += value
+            target = graph._accelerate(source, tuple(target))
+            target_id = graph._index.get(target)
+            new = target_id is None
+            if new:
+                if max_states is not None and graph.num_states() >= max_states:
+                    err_message = ("Coverability graph exceeds {0} "
+                                   "states").format(max_states)
+                    raise PetriNetException(err_message)
+                target_id = graph._add_state(target, source)
+                frontier.append(target_id)
+            graph._succesors[source].append((t_index, target_id))
+            if new and stop_unbounded and OMEGA in target:
+                LOG.info("Unbounded marking found: '{0}'".format(
+                    graph.marking_dict(target_id)))
+                return graph
+    LOG.info("Coverability graph with {0} states and {1} edges".format(
+        graph.num_states(), graph.num_edges()))
+    return graph
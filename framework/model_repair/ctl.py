@@ -27,7 +27,7 @@
 ================================================================================
 
       Version: 0.1
-  Last Update: 27-03-2016
+  Last Update: 18-10-2026
 
   Date        Alias      Description
 --------------------------------------------------------------------------------
@@ -36,15 +36,22 @@
   11-02-2016  ulisesma   Adding the binary operators classes
   27-03-2016  ulisesma   Modifying some LoLA formulae
   27-03-2016  ulisesma   Some classes specified as singleton
+  18-10-2026  ulisesma   Evaluation of formulae with a model checker
+  18-10-2026  ulisesma   Hash consed formulae with cached LoLA output
 
 """
 
 from error_handling import CTLException
 from logger import LOG
-from singleton import Singleton
+from singleton import HashConsed, Singleton
 
 class CTLFormula(object):
-    """ Class to represent a general CTL """
+    """
+    Class to represent a general CTL. Formulae are hash consed, so equal
+    formulae are the same object and they are compared and hashed by
+    identity. Their LoLA representation is cached in '_lola'.
+    """
+    _lola = None
 
     def __init__(self):
         """ Constructor of general CTL formula """
@@ -61,6 +68,26 @@ class CTLFormula(object):
         pass
 
 
+    def evaluate(self, checker):
+        """
+        Compute the set of states satisfying the current CTL formula with the
+        operations of 'checker'.
+        """
+        pass
+
+
+    def __eq__(self, other):
+        return self is other
+
+
+    def __ne__(self, other):
+        return self is not other
+
+
+    def __hash__(self):
+        return id(self)
+
+
 """
 ================================================================================
                               TERMINAL OPERATORS
@@ -93,6 +120,11 @@ class CTLTrue(CTLFormula):
         return CTLFalse()
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        return checker.true()
+
+
 class CTLFalse(CTLFormula):
     __metaclass__ = Singleton
     """ Class to represent the False operator """
@@ -110,11 +142,17 @@ class CTLFalse(CTLFormula):
         return CTLTrue()
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        return checker.false()
+
+
 TRUE = CTLTrue()
 FALSE = CTLFalse()
 
 class CTLAtomicProposition(CTLFormula):
     """ Class to represent the Atomic Proposition operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, place):
         if not isinstance(place, basestring):
@@ -133,8 +171,14 @@ class CTLAtomicProposition(CTLFormula):
         return CTLNegatedAtomicProposition(self._place)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        return checker.atomic(self._place)
+
+
 class CTLNegatedAtomicProposition(CTLFormula):
     """ Class to represent the Negated Atomic Proposition operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, place):
         if not isinstance(place, basestring):
@@ -153,6 +197,11 @@ class CTLNegatedAtomicProposition(CTLFormula):
         return CTLAtomicProposition(self._place)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        return checker.negation(checker.atomic(self._place))
+
+
 """
 ================================================================================
                               UNARY OPERATORS
@@ -168,6 +217,7 @@ This section includes the following CTL unary operators:
 
 class CTLExistNext(CTLFormula):
     """ Class to represent the Exist Next operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, phi):
         if not isinstance(phi, CTLFormula):
@@ -178,7 +228,9 @@ class CTLExistNext(CTLFormula):
 
 
     def print_lola(self):
-        return "EX({0})".format(self._phi.print_lola())
+        if self._lola is None:
+            self._lola = "EX({0})".format(self._phi.print_lola())
+        return self._lola
 
 
     def negate(self):
@@ -186,8 +238,14 @@ class CTLExistNext(CTLFormula):
         return CTLNegatedExistNext(self._phi)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        return checker.exist_next(checker.label(self._phi))
+
+
 class CTLNegatedExistNext(CTLFormula):
     """ Class to represent the Negated Exist Next operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, phi):
         if not isinstance(phi, CTLFormula):
@@ -198,7 +256,9 @@ class CTLNegatedExistNext(CTLFormula):
 
 
     def print_lola(self):
-        return "NOT(EX({0}))".format(self._phi.print_lola())
+        if self._lola is None:
+            self._lola = "NOT(EX({0}))".format(self._phi.print_lola())
+        return self._lola
 
 
     def negate(self):
@@ -206,8 +266,15 @@ class CTLNegatedExistNext(CTLFormula):
         return CTLExistNext(self._phi)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        sat = checker.exist_next(checker.label(self._phi))
+        return checker.negation(sat)
+
+
 class CTLExistGlobally(CTLFormula):
     """ Class to represent the Exist Globally operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, phi):
         if not isinstance(phi, CTLFormula):
@@ -218,7 +285,9 @@ class CTLExistGlobally(CTLFormula):
 
 
     def print_lola(self):
-        return "EG({0})".format(self._phi.print_lola())
+        if self._lola is None:
+            self._lola = "EG({0})".format(self._phi.print_lola())
+        return self._lola
 
 
     def negate(self):
@@ -226,8 +295,14 @@ class CTLExistGlobally(CTLFormula):
         return CTLNegatedExistGlobally(self._phi)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        return checker.exist_globally(checker.label(self._phi))
+
+
 class CTLNegatedExistGlobally(CTLFormula):
     """ Class to represent the Negated Exist Globally operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, phi):
         if not isinstance(phi, CTLFormula):
@@ -238,7 +313,9 @@ class CTLNegatedExistGlobally(CTLFormula):
 
 
     def print_lola(self):
-        return "NOT(EG({0}))".format(self._phi.print_lola())
+        if self._lola is None:
+            self._lola = "NOT(EG({0}))".format(self._phi.print_lola())
+        return self._lola
 
 
     def negate(self):
@@ -246,6 +323,12 @@ class CTLNegatedExistGlobally(CTLFormula):
         return CTLExistGlobally(self._phi)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        sat = checker.exist_globally(checker.label(self._phi))
+        return checker.negation(sat)
+
+
 """
 ================================================================================
                               BINARY OPERATORS
@@ -261,6 +344,7 @@ This section includes the following CTL binary operators:
 
 class CTLAnd(CTLFormula):
     """ Class to represent the And operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, phi_1, phi_2):
         if not isinstance(phi_1, CTLFormula):
@@ -275,9 +359,11 @@ class CTLAnd(CTLFormula):
 
 
     def print_lola(self):
-        lola_phi_1 = self._phi_1.print_lola()
-        lola_phi_2 = self._phi_2.print_lola()
-        return "({0} AND {1})".format(lola_phi_1, lola_phi_2)
+        if self._lola is None:
+            lola_phi_1 = self._phi_1.print_lola()
+            lola_phi_2 = self._phi_2.print_lola()
+            self._lola = "({0} AND {1})".format(lola_phi_1, lola_phi_2)
+        return self._lola
 
 
     def negate(self):
@@ -285,8 +371,16 @@ class CTLAnd(CTLFormula):
         return CTLNegatedAnd(self._phi_1, self._phi_2)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        sat_1 = checker.label(self._phi_1)
+        sat_2 = checker.label(self._phi_2)
+        return checker.conjunction(sat_1, sat_2)
+
+
 class CTLNegatedAnd(CTLFormula):
     """ Class to represent the Negated And operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, phi_1, phi_2):
         if not isinstance(phi_1, CTLFormula):
@@ -301,9 +395,11 @@ class CTLNegatedAnd(CTLFormula):
 
 
     def print_lola(self):
-        lola_phi_1 = self._phi_1.print_lola()
-        lola_phi_2 = self._phi_2.print_lola()
-        return "NOT({0} AND {1})".format(lola_phi_1, lola_phi_2)
+        if self._lola is None:
+            lola_phi_1 = self._phi_1.print_lola()
+            lola_phi_2 = self._phi_2.print_lola()
+            self._lola = "NOT({0} AND {1})".format(lola_phi_1, lola_phi_2)
+        return self._lola
 
 
     def negate(self):
@@ -311,9 +407,17 @@ class CTLNegatedAnd(CTLFormula):
         return CTLAnd(self._phi_1, self._phi_2)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        sat_1 = checker.label(self._phi_1)
+        sat_2 = checker.label(self._phi_2)
+        return checker.negation(checker.conjunction(sat_1, sat_2))
+
+
 
 class CTLExistUntil(CTLFormula):
     """ Class to represent the Exsits Until operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, phi_1, phi_2):
         if not isinstance(phi_1, CTLFormula):
@@ -328,9 +432,11 @@ class CTLExistUntil(CTLFormula):
 
 
     def print_lola(self):
-        lola_phi_1 = self._phi_1.print_lola()
-        lola_phi_2 = self._phi_2.print_lola()
-        return "E({0} U {1})".format(lola_phi_1, lola_phi_2)
+        if self._lola is None:
+            lola_phi_1 = self._phi_1.print_lola()
+            lola_phi_2 = self._phi_2.print_lola()
+            self._lola = "E({0} U {1})".format(lola_phi_1, lola_phi_2)
+        return self._lola
 
 
     def negate(self):
@@ -338,8 +444,16 @@ class CTLExistUntil(CTLFormula):
         return CTLNegatedExistUntil(self._phi_1, self._phi_2)
 
 
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        sat_1 = checker.label(self._phi_1)
+        sat_2 = checker.label(self._phi_2)
+        return checker.exist_until(sat_1, sat_2)
+
+
 class CTLNegatedExistUntil(CTLFormula):
     """ Class to represent the Negated Exsits Until operator """
+    __metaclass__ = HashConsed
 
     def __init__(self, phi_1, phi_2):
         if not isinstance(phi_1, CTLFormula):
@@ -354,11 +468,20 @@ class CTLNegatedExistUntil(CTLFormula):
 
 
     def print_lola(self):
-        lola_phi_1 = self._phi_1.print_lola()
-        lola_phi_2 = self._phi_2.print_lola()
-        return "NOT(E({0} U {1}))".format(lola_phi_1, lola_phi_2)
+        if self._lola is None:
+            lola_phi_1 = self._phi_1.print_lola()
+            lola_phi_2 = self._phi_2.print_lola()
+            self._lola = "NOT(E({0} U {1}))".format(lola_phi_1, lola_phi_2)
+        return self._lola
 
 
     def negate(self):
         """ Negate the current CTL formula """
         return CTLExistUntil(self._phi_1, self._phi_2)
+
+
+    def evaluate(self, checker):
+        """ Compute the states satisfying the current CTL formula """
+        sat_1 = checker.label(self._phi_1)
+        sat_2 = checker.label(self._phi_2)
+        return checker.negation(checker.exist_until(sat_1, sat_2))
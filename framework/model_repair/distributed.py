@@ -0,0 +1,479 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the distributed exploration of reachability sets,
+  with nodes connected by TCP sockets. The markings are partitioned by the
+  hash of parallel.get_owner: every node keeps the visited markings of its
+  shard, expands them and forwards the succesors owned by other nodes in
+  batches, so each marking is only expanded by its owner.
+
+  Termination is detected with the token algorithm of Dijkstra and Safra:
+  every node counts the batches sent minus the batches received and turns
+  black when it receives one. The node 0 sends a white token with count 0
+  around the ring of nodes, every passive node adds its count, blackens the
+  token if it is black and turns white. The exploration is over when the
+  token gets back white to a white node 0 and the counts add up to 0.
+
+  The coordinator (explore_distributed) sends the initial marking to every
+  node, waits for the node 0 to report termination and then collects the
+  shards, merged into the ReachabilityGraph of the sequential exploration.
+  Nodes can be started in other machines with run_node, or as local
+  processes by the coordinator. Messages are pickled, so nodes must only
+  listen on trusted networks.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+import cPickle
+import errno
+import multiprocessing
+import select
+import socket
+import struct
+import time
+import traceback
+from collections import deque
+
+from error_handling import PetriNetException
+from logger import LOG
+from parallel import get_owner, merge_succesors
+from reachability import BATCH_SIZE, pack_marking
+
+DEFAULT_NODES = 4
+LOCAL_HOST = "127.0.0.1"
+CONNECT_TIMEOUT = 30.0
+CONNECT_RETRY = 0.1
+CHUNK_SIZE = 65536
+FRAME_HEADER = struct.Struct("!I")
+
+
+def _frame(message):
+    """ Get the length prefixed bytes of a pickled message """
+    data = cPickle.dumps(message, cPickle.HIGHEST_PROTOCOL)
+    return FRAME_HEADER.pack(len(data)) + data
+
+
+def _send(sock, message):
+    """ Send a message through a blocking socket """
+    sock.sendall(_frame(message))
+
+
+def _listen(address):
+    """ Get a server socket listening on the (host, port) 'address' """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(address)
+    server.listen(socket.SOMAXCONN)
+    return server
+
+
+def _connect(address):
+    """ Connect to the (host, port) 'address', retrying until it listens """
+    deadline = time.time() + CONNECT_TIMEOUT
+    while True:
+        try:
+            sock = socket.create_connection(address)
+        except socket.error:
+            if time.time() > deadline:
+                err_message = "Can not connect to node at '{0}'".format(
+                    address)
+                raise PetriNetException(err_message)
+            time.sleep(CONNECT_RETRY)
+            continue
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+
+class Channel(object):
+    """
+    Class to exchange length prefixed pickled messages through the socket
+    'sock'. Received bytes are kept until a message is complete, and if the
+    channel is not 'blocking', sent messages are buffered until the socket
+    is writable. Messages received with the one waited for are kept in the
+    'backlog'.
+    """
+
+    def __init__(self, sock, blocking=True):
+        self.sock = sock
+        self.sock.setblocking(int(blocking))
+        self.closed = False
+        self.backlog = []
+        self._chunks = []
+        self._size = 0
+        self._needed = None
+        self._output = []
+
+
+    def fileno(self):
+        return self.sock.fileno()
+
+
+    def receive(self):
+        """
+        Read the socket once it is readable, get the list of messages
+        completed. The channel is closed when the other end closes it.
+        """
+        data = self.sock.recv(CHUNK_SIZE)
+        if not data:
+            self.closed = True
+            return []
+        self._chunks.append(data)
+        self._size += len(data)
+        messages = []
+        while True:
+            if self._needed is None:
+                if self._size < FRAME_HEADER.size:
+                    break
+                buffer = "".join(self._chunks)
+                self._chunks = [buffer]
+                self._needed = FRAME_HEADER.size + FRAME_HEADER.unpack(
+                    buffer[:FRAME_HEADER.size])[0]
+            if self._size < self._needed:
+                break
+            buffer = "".join(self._chunks)
+            messages.append(cPickle.loads(
+                buffer[FRAME_HEADER.size:self._needed]))
+            buffer = buffer[self._needed:]
+            self._chunks = [buffer] if buffer else []
+            self._size = len(buffer)
+            self._needed = None
+        return messages
+
+
+    def wait(self):
+        """ Block until a message is received, return it """
+        while True:
+            messages = self.receive()
+            if messages:
+                self.backlog.extend(messages[1:])
+                return messages[0]
+            if self.closed:
+                err_message = "Connection closed by the other end"
+                raise PetriNetException(err_message)
+
+
+    def send(self, message):
+        """ Buffer a message, it is sent by flush """
+        self._output.append(_frame(message))
+
+
+    def pending(self):
+        """ Check if there are buffered bytes to send """
+        return bool(self._output)
+
+
+    def flush(self):
+        """ Send as many buffered bytes as the socket takes """
+        data = "".join(self._output)
+        try:
+            sent = self.sock.send(data)
+        except socket.error as error:
+            if error.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                raise
+            sent = 0
+        self._output = [data[sent:]] if sent < len(data) else []
+
+
+class ExplorationNode(object):
+    """
+    Class to represent the node 'node_id' of a distributed exploration of
+    'net', where the nodes listen on the (host, port) 'addresses'. The node
+    listens on the socket 'server' if it is given, otherwise on its address.
+    """
+
+    def __init__(self, net, node_id, addresses, server=None):
+        self._net = net
+        self._node_id = node_id
+        self._nodes = len(addresses)
+        self._addresses = addresses
+        self._server = server
+        if server is None:
+            self._server = _listen(tuple(addresses[node_id]))
+        self._peers = {}
+        self._coordinator = None
+        self._rows = {}
+        self._queue = deque()
+        self._counter = 0
+        self._black = False
+        self._token = None
+        self._probing = False
+        self._terminated = False
+        self._finished = False
+        self._statistics = {"expanded": 0, "sent": 0, "received": 0,
+                            "probes": 0}
+
+
+    def run(self):
+        """ Explore the shard of the node until the coordinator collects it """
+        self._start()
+        while not self._finished:
+            if self._queue:
+                self._expand()
+            self._pass_token()
+            if not self._finished:
+                self._poll()
+        for channel in self._peers.values():
+            channel.sock.close()
+        self._server.close()
+        LOG.info("Node {0} statistics: {1}".format(self._node_id,
+                                                   self._statistics))
+
+
+    def _start(self):
+        """
+        Connect to the nodes with greater ids and accept the connections of
+        the nodes with lower ids and of the coordinator, which sends the
+        initial marking.
+        """
+        for peer in xrange(self._node_id + 1, self._nodes):
+            sock = _connect(tuple(self._addresses[peer]))
+            _send(sock, ("node", self._node_id))
+            self._peers[peer] = Channel(sock, False)
+        state_0 = None
+        while len(self._peers) < self._nodes - 1 or state_0 is None:
+            (sock, _) = self._server.accept()
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            channel = Channel(sock)
+            message = channel.wait()
+            if message[0] == "node":
+                channel.sock.setblocking(0)
+                self._peers[message[1]] = channel
+            else:
+                state_0 = message[1]
+                self._coordinator = channel
+        if get_owner(state_0, self._nodes) == self._node_id:
+            self._rows[state_0] = None
+            self._queue.append(state_0)
+        for channel in self._peers.values():
+            for message in channel.backlog:
+                self._handle(message)
+            channel.backlog = []
+
+
+    def _expand(self):
+        """
+        Expand a batch of the queue, forwarding the succesors owned by other
+        nodes.
+        """
+        batch = [self._queue.popleft()
+                 for _ in xrange(min(BATCH_SIZE, len(self._queue)))]
+        forward = [set() for _ in xrange(self._nodes)]
+        for state in batch:
+            self._rows[state] = []
+        for (row, t_index, target) in self._net._get_succesors_batch(batch):
+            self._rows[batch[row]].append((t_index, target))
+            owner = get_owner(target, self._nodes)
+            if owner != self._node_id:
+                forward[owner].add(target)
+            elif target not in self._rows:
+                self._rows[target] = None
+                self._queue.append(target)
+        for (owner, targets) in enumerate(forward):
+            if targets:
+                self._peers[owner].send(("states", list(targets)))
+                self._counter += 1
+                self._statistics["sent"] += 1
+        self._statistics["expanded"] += len(batch)
+
+
+    def _pass_token(self):
+        """ Run the termination detection while the node is passive """
+        if self._queue or self._terminated:
+            return
+        if self._nodes == 1:
+            self._report_termination()
+            return
+        following = self._peers[(self._node_id + 1) % self._nodes]
+        if self._node_id:
+            if self._token is not None:
+                (count, black) = self._token
+                following.send(("token", count + self._counter,
+                                black or self._black))
+                self._token = None
+                self._black = False
+            return
+        if self._token is None and not self._probing:
+            self._probing = True
+            self._black = False
+            self._statistics["probes"] += 1
+            following.send(("token", 0, False))
+        elif self._token is not None:
+            (count, black) = self._token
+            if not black and not self._black and count + self._counter == 0:
+                self._report_termination()
+            else:
+                self._token = None
+                self._black = False
+                self._statistics["probes"] += 1
+                following.send(("token", 0, False))
+
+
+    def _report_termination(self):
+        """ Tell the coordinator that the exploration is over """
+        self._terminated = True
+        LOG.info("Termination detected after {0} probes".format(
+            self._statistics["probes"]))
+        _send(self._coordinator.sock, ("done",))
+
+
+    def _poll(self):
+        """
+        Wait for messages, or just check them if the queue is not empty,
+        and send the buffered batches.
+        """
+        readers = [channel for channel in self._peers.values()
+                   if not channel.closed] + [self._coordinator]
+        writers = [channel for channel in self._peers.values()
+                   if channel.pending()]
+        timeout = 0 if self._queue else None
+        (readable, writable, _) = select.select(readers, writers, [],
+                                                timeout)
+        for channel in writable:
+            channel.flush()
+        for channel in readable:
+            for message in channel.receive():
+                self._handle(message)
+            if channel is self._coordinator and channel.closed:
+                err_message = "Node {0} lost the coordinator".format(
+                    self._node_id)
+                raise PetriNetException(err_message)
+
+
+    def _handle(self, message):
+        """ Handle a message of a peer or of the coordinator """
+        if message[0] == "states":
+            self._counter -= 1
+            self._black = True
+            self._statistics["received"] += 1
+            for state in message[1]:
+                if state not in self._rows:
+                    self._rows[state] = None
+                    self._queue.append(state)
+        elif message[0] == "token":
+            self._token = message[1:]
+        elif message[0] == "collect":
+            _send(self._coordinator.sock, ("rows", self._rows.items()))
+            self._finished = True
+
+
+def run_node(net, node_id, addresses, server=None):
+    """
+    Run the node 'node_id' of a distributed exploration of 'net' among the
+    nodes listening on the (host, port) 'addresses', until the coordinator
+    collects its shard. Errors are reported to the coordinator.
+    """
+    node = ExplorationNode(net, node_id, addresses, server)
+    try:
+        node.run()
+    except Exception:
+        LOG.error(traceback.format_exc())
+        if node._coordinator is not None:
+            try:
+                _send(node._coordinator.sock,
+                      ("error", traceback.format_exc()))
+            except socket.error:
+                pass
+
+
+def _wait_nodes(channels, expected, node_ids):
+    """
+    Wait for a message of type 'expected' from every node in 'node_ids',
+    get the list of messages in their order. Any other message, or a node
+    closing its channel before, is an error.
+    """
+    messages = {}
+    while len(messages) < len(node_ids):
+        readers = [channel for (node_id, channel) in enumerate(channels)
+                   if node_id not in messages]
+        (readable, _, _) = select.select(readers, [], [])
+        for channel in readable:
+            node_id = channels.index(channel)
+            for message in channel.receive():
+                if message[0] != expected or node_id not in node_ids:
+                    err_message = "Node {0} failed: {1}".format(
+                        node_id, message[-1])
+                    raise PetriNetException(err_message)
+                messages[node_id] = message
+            if channel.closed and node_id not in messages:
+                err_message = "Node {0} closed the connection".format(
+                    node_id)
+                raise PetriNetException(err_message)
+    return [messages[node_id] for node_id in node_ids]
+
+
+def explore_distributed(net, m_0, addresses=None, nodes=DEFAULT_NODES,
+                        packing=None):
+    """
+    Explore the reachability set of 'net' from the marking 'm_0' with the
+    nodes running run_node on the (host, port) 'addresses', and get its
+    ReachabilityGraph, the same graph built by explore. If 'addresses' is
+    None, 'nodes' local processes are started listening on localhost. The
+    marking table of the graph uses the BitPacking 'packing' if it is given.
+    """
+    processes = []
+    if addresses is None:
+        if nodes < 1:
+            err_message = "Invalid number of nodes: '{0}'".format(nodes)
+            raise PetriNetException(err_message)
+        servers = [_listen((LOCAL_HOST, 0)) for _ in xrange(nodes)]
+        addresses = [server.getsockname() for server in servers]
+        for (node_id, server) in enumerate(servers):
+            process = multiprocessing.Process(
+                target=run_node, args=(net, node_id, addresses, server))
+            process.daemon = True
+            process.start()
+            processes.append(process)
+        for server in servers:
+            server.close()
+    state_0 = pack_marking(net._places, m_0)
+    channels = []
+    try:
+        for address in addresses:
+            sock = _connect(tuple(address))
+            _send(sock, ("start", state_0))
+            channels.append(Channel(sock))
+        _wait_nodes(channels, "done", [0])
+        for channel in channels:
+            _send(channel.sock, ("collect",))
+        rows = {}
+        for message in _wait_nodes(channels, "rows",
+                                   range(len(channels))):
+            rows.update(message[1])
+    finally:
+        for channel in channels:
+            channel.sock.close()
+        for process in processes:
+            process.join(CONNECT_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+    LOG.info("Distributed exploration with {0} nodes".format(
+        len(addresses)))
+    return merge_succesors(net, state_0, rows, packing)
@@ -7,6 +7,25 @@
   files providing a comprehensive class structure that can be translated into a
   Petri Net object or a JSON file for exchange.
 
+  The file is parsed by recursive descent in a single pass over the tokens of
+  the streaming Lexer, with one token of lookahead, following the grammar:
+
+    net         ::= PLACE place_lists MARKING marking_list ; transition+
+    place_lists ::= (capacity place_list ;)+
+    capacity    ::= empty | SAFE : | SAFE number :
+    place_list  ::= nodeident (, nodeident)*
+    marking_list ::= empty | marking (, marking)*
+    marking     ::= nodeident | nodeident : number
+    transition  ::= TRANSITION nodeident fairness CONSUME arc_list ;
+                    PRODUCE arc_list ;
+    fairness    ::= empty | WEAK FAIR | STRONG FAIR
+    arc_list    ::= empty | arc (, arc)*
+    arc         ::= nodeident | nodeident : number
+    nodeident   ::= identifier | number
+
+  Markings and arcs without a number have weight 1, and the weights of a
+  place listed twice are added.
+
 ================================================================================
                               MAINTAINERS
 ================================================================================
@@ -28,7 +47,7 @@
 ================================================================================
 
       Version: 0.1
-  Last Update: 14-08-2016
+  Last Update: 18-10-2026
 
   Date        Alias      Description
 --------------------------------------------------------------------------------
@@ -36,214 +55,221 @@
   13-08-2016  ulisesma   Place Lists and other sub-parsers
   14-08-2016  ulisesma   Marking List and other sub-parsers
   14-08-2016  ulisesma   Transitions and other sub-parsers
+  18-10-2026  ulisesma   Streaming parser building the Petri Net object
 
 """
 
-from sets import Set
-
 from model_repair.error_handling import PetriNetInterpreterException
+from model_repair.interpreter.syntax_analyzer import Identifier, Lexer, Number
 from model_repair.logger import LOG
+from model_repair.petri_net import PetriNet
 
-RESERVED_WORDS = ["PLACE", "MARKING"]
-RESERVED_WORDS = Set(RESERVED_WORDS)
+RESERVED_WORDS = set(["PLACE", "MARKING", "SAFE", "TRANSITION", "CONSUME",
+                      "PRODUCE", "STRONG", "WEAK", "FAIR"])
 
-ERROR_MESSAGE_TEMPLATE = "Invalid object found. Expected '{0}', found '{1}'."
+ERROR_MESSAGE_TEMPLATE = ("Invalid object found in line {2}. Expected '{0}', "
+                          "found '{1}'.")
 
-def _get_object(file_object):
-    #TODO: Implement routines to get the required objects
-    pass
 
+class LolaNet(object):
+    """
+    Class to represent a net read from a LoLA file: the PetriNet 'net', its
+    initial 'marking', the 'capacities' of the places declared SAFE and the
+    'fairness' ("WEAK" or "STRONG") of the fair transitions.
+    """
 
-def _net(file_object):
-    LOG.info("[START] Processing new LoLA Petri net file")
-    reserved = _get_object(file_object)
-    if reserved != "PLACE":
-        err_message = ERROR_MESSAGE_TEMPLATE.format("PLACE", reserved)
-        raise PetriNetInterpreterException(err_message)
+    def __init__(self, net, marking, capacities, fairness):
+        self.net = net
+        self.marking = marking
+        self.capacities = capacities
+        self.fairness = fairness
 
-    place_list = _place_lists(file_object)
 
-    reserved = _get_object(file_object)
-    if reserved != "MARKING":
-        err_message = ERROR_MESSAGE_TEMPLATE.format("MARKING", reserved)
-        raise PetriNetInterpreterException(err_message)
+def load_lola(file_name):
+    """ Get the LolaNet of the LoLA file 'file_name' """
+    with open(file_name, "rb") as file_object:
+        return parse_lola(file_object)
 
-    marking_list = _marking_list(file_object)
 
-    separator = _get_object(file_object)
-    if separator != ";":
-        err_message = ERROR_MESSAGE_TEMPLATE.format(";", separator)
-        raise PetriNetInterpreterException(err_message)
+def parse_lola(file_object):
+    """ Get the LolaNet of the LoLA net in the open file 'file_object' """
+    return _net(Lexer(file_object, RESERVED_WORDS))
+
+
+def _error(lexer, expected, found):
+    """ Raise the exception of an unexpected object """
+    err_message = ERROR_MESSAGE_TEMPLATE.format(expected, found, lexer.line)
+    raise PetriNetInterpreterException(err_message)
 
-    transitions = []
-    x = _transition(file_object)
-    if not x:
-        err_message = ERROR_MESSAGE_TEMPLATE.format("Transition Object", x)
-        raise PetriNetInterpreterException(err_message)
 
-    transitions.append(x)
-    x = _transition(file_object)
-    while x:
-        transitions.append(x)
-        x = _transition(file_object)
+def _get_object(lexer, expected):
+    """ Get the next object, which must be the 'expected' reserved word """
+    reserved = lexer.next()
+    if reserved != expected:
+        _error(lexer, expected, reserved)
+    return reserved
 
+
+def _net(lexer):
+    LOG.info("[START] Processing new LoLA Petri net file")
+    _get_object(lexer, "PLACE")
+    (places, capacities) = _place_lists(lexer)
+    _get_object(lexer, "MARKING")
+    marking = _marking_list(lexer)
+    _get_object(lexer, ";")
+
+    transitions = [_transition(lexer)]
+    while lexer.peek() == "TRANSITION":
+        transitions.append(_transition(lexer))
+    if lexer.peek() is not None:
+        _error(lexer, "TRANSITION", lexer.peek())
+
+    lola_net = _build(places, capacities, marking, transitions)
     LOG.info("[END] Processing new LoLA Petri net file")
-    #TODO: Create a Petri Net object and return
-    pass
+    return lola_net
 
 
-def _place_lists(file_object):
-    LOG.info("[START] Getting Place lists")
-    capacity = _capacity(file_object)
-    place_list = _place_list(file_object)
-    separator = _get_object(file_object)
-    if separator != ";":
-        err_message = ERROR_MESSAGE_TEMPLATE.format(";", separator)
+def _build(places, capacities, marking, transitions):
+    """ Get the LolaNet of the lists read from the file """
+    place_set = set(places)
+    if len(place_set) < len(places):
+        err_message = "Place declared more than once"
         raise PetriNetInterpreterException(err_message)
-    capacity = _capacity(file_object)
-    while capacity:
-        place_list = _place_list(file_object)
-        separator = _get_object(file_object)
-        if separator != ";":
-            err_message = ERROR_MESSAGE_TEMPLATE.format(";", separator)
+    names = [name for (name, _, _, _) in transitions]
+    if len(set(names)) < len(names):
+        err_message = "Transition declared more than once"
+        raise PetriNetInterpreterException(err_message)
+    m_0 = dict.fromkeys(places, 0)
+    _add_weights(m_0, marking, place_set)
+    net = PetriNet()
+    net.add_places(places)
+    net.add_transitions(names)
+    fairness = {}
+    for (function_type, position) in (("I", 2), ("O", 3)):
+        arcs = []
+        for transition in transitions:
+            weights = {}
+            _add_weights(weights, transition[position], place_set)
+            arcs.extend([(place, transition[0], value)
+                         for (place, value) in weights.iteritems()])
+        net.set_arcs(arcs, function_type)
+    for (name, fair, _, _) in transitions:
+        if fair is not None:
+            fairness[name] = fair
+    return LolaNet(net, m_0, capacities, fairness)
+
+
+def _add_weights(weights, pairs, place_set):
+    """ Add the (place, weight) 'pairs' to the 'weights' dictionary """
+    for (place, value) in pairs:
+        if place not in place_set:
+            err_message = "Place '{0}' is not declared".format(place)
             raise PetriNetInterpreterException(err_message)
-        capacity = _capacity(file_object)
+        weights[place] = weights.get(place, 0) + value
+
+
+def _place_lists(lexer):
+    LOG.info("[START] Getting Place lists")
+    places = []
+    capacities = {}
+    while True:
+        capacity = _capacity(lexer)
+        place_list = _place_list(lexer)
+        _get_object(lexer, ";")
+        if capacity is not None:
+            for place in place_list:
+                capacities[place] = capacity
+        places.extend(place_list)
+        if lexer.peek() == "MARKING":
+            break
     LOG.info("[END] Getting Place lists")
-    #TODO: Create a Place lists object and return
-    pass
+    return (places, capacities)
 
 
-def _capacity(file_object):
-    LOG.info("[START] Getting capacity")
-    reserved = _get_object(file_object)
-    if reserved != "SAFE":
-        err_message = ERROR_MESSAGE_TEMPLATE.format("SAFE", reserved)
-        raise PetriNetInterpreterException(err_message)
-    number = _get_object(file_object)
-    if isinstance(number, Number):
-        err_message = ERROR_MESSAGE_TEMPLATE.format("number", number)
-        raise PetriNetInterpreterException(err_message)
-    separator = _get_object(file_object)
-    if reserved != ":":
-        err_message = ERROR_MESSAGE_TEMPLATE.format(":", separator)
-        raise PetriNetInterpreterException(err_message)
-    LOG.info("[END] Getting capacity")
-    #TODO: Create a capacity object and return
-    pass
-
-def _place_list(file_object):
-    LOG.info("[START] Getting Place list")
-    nodeident = _nodeident(file_object)
-    separator = _get_object(file_object)
-    while separator == ",":
-        nodeident = _nodeident(file_object)
-        separator = _get_object(file_object)
-    LOG.info("[END] Getting Place list")
-    #TODO: Create a Place list object and return
-    pass
-
-def _nodeident(file_object):
-    LOG.info("[START] Getting Node identifier")
-    nodeident = _get_object(file_object)
-    if isinstance(nodeident, Number) or isinstance(nodeident, Identifier):
-        LOG.info("[END] Getting Node identifier")
-        return nodeident
-    err_message = ERROR_MESSAGE_TEMPLATE.format("Identifier", nodeident)
-    raise PetriNetInterpreterException(err_message)
+def _capacity(lexer):
+    if lexer.peek() != "SAFE":
+        return None
+    lexer.next()
+    if lexer.peek() == ":":
+        lexer.next()
+        return 1
+    capacity = _number(lexer)
+    _get_object(lexer, ":")
+    return capacity
 
-def _marking_list(file_object):
-    LOG.info("[START] Getting Marking List")
-    marking = _marking(file_object)
-    separator = _get_object(file_object)
-    while separator == ",":
-        marking = _marking(file_object)
-        separator = _get_object(file_object)
-    LOG.info("[END] Getting Marking List")
-    #TODO: Create a Place list object and return
-    pass
-
-
-def _marking(file_object):
-    LOG.info("[START] Getting Marking")
-    nodeident = _nodeident(file_object)
-    separator = _get_object(file_object)
-    if separator == ":":
-        number = _get_object(file_object)
-        if not isinstance(nodeident, Number):
-            err_message = ERROR_MESSAGE_TEMPLATE.format("Number", number)
-            raise PetriNetInterpreterException(err_message)
-    LOG.info("[END] Getting Marking")
-    #TODO: Create a Marking object and return
-    pass
 
+def _place_list(lexer):
+    place_list = [_nodeident(lexer)]
+    while lexer.peek() == ",":
+        lexer.next()
+        place_list.append(_nodeident(lexer))
+    return place_list
 
-def _transition(file_object):
-    LOG.info("[START] Getting Transition")
-    reserved = _get_object(file_object)
-    if reserved != "TRANSITION":
-        err_message = ERROR_MESSAGE_TEMPLATE.format("TRANSITION", reserved)
-        raise PetriNetInterpreterException(err_message)
-    nodeident = _nodeident(file_object)
-    fairness = _fairness(file_object)
-    reserved = _get_object(file_object)
-    if reserved != "CONSUME":
-        err_message = ERROR_MESSAGE_TEMPLATE.format("CONSUME", reserved)
-        raise PetriNetInterpreterException(err_message)
-    arc_list = _arc_list(file_object)
-    separator = _get_object(file_object)
-    if separator != ";":
-        err_message = ERROR_MESSAGE_TEMPLATE.format(";", separator)
-        raise PetriNetInterpreterException(err_message)
-    reserved = _get_object(file_object)
-    if reserved != "PRODUCE":
-        err_message = ERROR_MESSAGE_TEMPLATE.format("PRODUCE", reserved)
-        raise PetriNetInterpreterException(err_message)
-    arc_list = _arc_list(file_object)
-    separator = _get_object(file_object)
-    if separator != ";":
-        err_message = ERROR_MESSAGE_TEMPLATE.format(";", separator)
-        raise PetriNetInterpreterException(err_message)
-    LOG.info("[END] Getting Transition")
-    #TODO: Create a Transition object and return
-    pass
 
+def _nodeident(lexer):
+    nodeident = lexer.next()
+    if isinstance(nodeident, Number) or isinstance(nodeident, Identifier):
+        return str(nodeident)
+    _error(lexer, "Identifier", nodeident)
 
-def _fairness(file_object):
-    LOG.info("[START] Getting Fairness")
-    reserved = _get_object(file_object)
-    if reserved != "STRONG" and reserved != "WEAK":
-        err_message = ERROR_MESSAGE_TEMPLATE.format("STRONG' or 'WEAK", reserved)
-        raise PetriNetInterpreterException(err_message)
-    reserved = _get_object(file_object)
-    if reserved != "FAIR":
-        err_message = ERROR_MESSAGE_TEMPLATE.format("FAIR", reserved)
-        raise PetriNetInterpreterException(err_message)
-    LOG.info("[END] Getting Fairness")
-    #TODO: Create a Fairness object and return
-    pass
-
-
-def _arc_list(file_object):
-    LOG.info("[START] Getting Arc List")
-    arc = _arc(file_object)
-    separator = _get_object(file_object)
-    while separator == ",":
-        arc = _arc(file_object)
-        separator = _get_object(file_object)
-    LOG.info("[END] Getting Arc List")
-    #TODO: Create a Arc List object and return
-    pass
-
-
-def _arc(file_object):
-    LOG.info("[START] Getting Arc")
-    nodeident = _nodeident(file_object)
-    separator = _get_object(file_object)
-    if separator == ":":
-        number = _get_object(file_object)
-        if not isinstance(nodeident, Number):
-            err_message = ERROR_MESSAGE_TEMPLATE.format("Number", number)
-            raise PetriNetInterpreterException(err_message)
-    LOG.info("[END] Getting Arc")
-    #TODO: Create a Arc object and return
-    pass
+
+def _number(lexer):
+    number = lexer.next()
+    if not isinstance(number, Number):
+        _error(lexer, "Number", number)
+    return int(number)
+
+
+def _marking_list(lexer):
+    LOG.info("[START] Getting Marking List")
+    marking_list = []
+    if lexer.peek() != ";":
+        marking_list.append(_marking(lexer))
+        while lexer.peek() == ",":
+            lexer.next()
+            marking_list.append(_marking(lexer))
+    LOG.info("[END] Getting Marking List")
+    return marking_list
+
+
+def _marking(lexer):
+    nodeident = _nodeident(lexer)
+    if lexer.peek() == ":":
+        lexer.next()
+        return (nodeident, _number(lexer))
+    return (nodeident, 1)
+
+
+def _transition(lexer):
+    _get_object(lexer, "TRANSITION")
+    nodeident = _nodeident(lexer)
+    fairness = _fairness(lexer)
+    _get_object(lexer, "CONSUME")
+    consume = _arc_list(lexer)
+    _get_object(lexer, ";")
+    _get_object(lexer, "PRODUCE")
+    produce = _arc_list(lexer)
+    _get_object(lexer, ";")
+    return (nodeident, fairness, consume, produce)
+
+
+def _fairness(lexer):
+    if lexer.peek() != "STRONG" and lexer.peek() != "WEAK":
+        return None
+    fairness = lexer.next()
+    _get_object(lexer, "FAIR")
+    return fairness
+
+
+def _arc_list(lexer):
+    arc_list = []
+    if lexer.peek() != ";":
+        arc_list.append(_arc(lexer))
+        while lexer.peek() == ",":
+            lexer.next()
+            arc_list.append(_arc(lexer))
+    return arc_list
+
+
+def _arc(lexer):
+    return _marking(lexer)
@@ -4,7 +4,9 @@
 ================================================================================
 
   This Module include the lexicographical analyzer that will recognize the
-  different symbols we can have in Petri Nets and CTL LoLA files.
+  different symbols we can have in Petri Nets and CTL LoLA files. The Lexer
+  class reads a file as a stream of tokens in a single pass, with one token
+  of lookahead, so large files are never loaded at once.
 
 ================================================================================
                               MAINTAINERS
@@ -27,13 +29,14 @@
 ================================================================================
 
       Version: 0.1
-  Last Update: 24-08-2016
+  Last Update: 18-10-2026
 
   Date        Alias      Description
 --------------------------------------------------------------------------------
   22-08-2016  ulisesma   Initial file creation
   24-08-2016  ulisesma   Get object function to get a valid string using the
                          DFA model
+  18-10-2026  ulisesma   Streaming lexer with comments and token lookahead
 
 
 
@@ -41,6 +44,10 @@
 Enumerator class for States and Input Classes
 --------------------------------------------------------------------------------
 """
+import re
+
+from model_repair.error_handling import PetriNetInterpreterException
+
 class StateEnum(object):
     q_err = -1
     q_0 = 0
@@ -119,3 +126,95 @@ def get_object(input_str):
     if state == SE.q_err:
         out_str = out_str[:-1]
     return out_str
+
+
+"""
+--------------------------------------------------------------------------------
+Streaming lexer
+--------------------------------------------------------------------------------
+"""
+
+CHUNK_SIZE = 65536
+SEPARATORS = ",:;"
+TOKEN_PATTERN = re.compile(r"(?:\s+|\{[^}]*\})*([,:;]|[^\s,:;(){}]+)?")
+NUMBER_PATTERN = re.compile(r"[0-9]+$")
+LEXER_ERROR_TEMPLATE = "{0} in line {1}."
+
+
+class Identifier(str):
+    """ Class to represent an identifier token """
+    pass
+
+
+class Number(long):
+    """ Class to represent a number token """
+    pass
+
+
+class Lexer(object):
+    """
+    Class to get the tokens of the open file 'file_object' in a single pass,
+    reading it in chunks. White space and comments between braces are
+    skipped. Tokens are the separators and the 'reserved' words as strings,
+    and Identifier and Number objects; None is the end of the file.
+    """
+
+    def __init__(self, file_object, reserved=()):
+        self._file = file_object
+        self._reserved = set(reserved)
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+        self._token = None
+        self._peeked = False
+        self.line = 1
+
+
+    def peek(self):
+        """ Get the next token without consuming it """
+        if not self._peeked:
+            self._token = self._scan()
+            self._peeked = True
+        return self._token
+
+
+    def next(self):
+        """ Get the next token """
+        token = self.peek()
+        self._peeked = False
+        return token
+
+
+    def _fill(self):
+        """ Read the next chunk, dropping the consumed part of the buffer """
+        data = self._file.read(CHUNK_SIZE)
+        self._buffer = self._buffer[self._position:] + data
+        self._position = 0
+        self._eof = not data
+
+
+    def _scan(self):
+        """ Scan the next token of the buffer, reading chunks when needed """
+        while True:
+            match = TOKEN_PATTERN.match(self._buffer, self._position)
+            end = match.end()
+            text = match.group(1)
+            if not self._eof and (end == len(self._buffer) or text is None):
+                self._fill()
+                continue
+            self.line += self._buffer.count("\n", self._position, end)
+            self._position = end
+            if text is None:
+                if end == len(self._buffer):
+                    return None
+                character = self._buffer[end]
+                message = "Invalid character '{0}'".format(character)
+                if character == "{":
+                    message = "Comment not closed"
+                err_message = LEXER_ERROR_TEMPLATE.format(message, self.line)
+                raise PetriNetInterpreterException(err_message)
+            if text in SEPARATORS or text in self._reserved:
+                return text
+            if NUMBER_PATTERN.match(text):
+                return Number(text)
+            return Identifier(text)
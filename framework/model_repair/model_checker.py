@@ -0,0 +1,498 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the native CTL model checker. It labels the states of
+  the explicit reachability graph of a Petri Net with the subformulas of a
+  CTL formula following the standard bottom-up labeling algorithm.
+
+  Satisfaction sets are stored as bitsets (Python integers where bit 'i'
+  stands for the state with id 'i'). Paths ending in a deadlock are taken as
+  maximal paths, so a deadlock marking satisfying phi also satisfies EG(phi).
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+  18-10-2026  ulisesma   Labels cached by formula node
+  18-10-2026  ulisesma   Checking over the ReachabilityGraph object
+  18-10-2026  ulisesma   Witnesses of existential formulae
+  18-10-2026  ulisesma   Results with witness and counterexample paths
+  18-10-2026  ulisesma   Labels kept after graph updates outside their scope
+
+"""
+
+from collections import deque
+
+import ctl
+from error_handling import CTLException
+from logger import LOG
+from witness import CheckResult
+
+
+def to_bitset(members, size):
+    """ Build the bitset of 'size' states including the ids in 'members' """
+    chars = ["0"] * size
+    for i in members:
+        chars[i] = "1"
+    chars.reverse()
+    return int("".join(chars) or "0", 2)
+
+
+def from_bitset(bitset):
+    """ Get the sorted list of state ids included in 'bitset' """
+    members = []
+    bits = bin(bitset)[:1:-1]
+    i = bits.find("1")
+    while i != -1:
+        members.append(i)
+        i = bits.find("1", i + 1)
+    return members
+
+
+class ModelChecker(object):
+    """ Class to perform native CTL model checking over a Petri Net """
+
+    def __init__(self, net, m_0=None, graph=None):
+        """
+        Build the reachability graph of 'net' from the marking 'm_0', or use
+        the ReachabilityGraph 'graph' if it is given. The initial marking is
+        the state with id 0.
+        """
+        if graph is None:
+            graph = net.reachability_graph(m_0)
+        self._graph = graph
+        self._place_index = net._place_index
+        self._size = graph.num_states()
+        self._all = (1 << self._size) - 1
+        self._labels = {}
+        self._fixpoints = {}
+        self._stale = {}
+        self._stale_fixpoints = {}
+        self._scope = 0
+        self._evaluating = []
+        LOG.info("Native model checker ready with {0} states".format(
+            self._size))
+
+
+    def check(self, formula):
+        """
+        Check if the initial marking satisfies the CTL 'formula'.
+        """
+        result = bool(self.label(formula) & 1)
+        LOG.info("Native model checking result: \"{0}\"".format(result))
+        return result
+
+
+    def label(self, formula):
+        """
+        Get the bitset of states satisfying 'formula'. Labels are cached by
+        formula node, as formulae are hash consed shared subformulas are only
+        computed once. The labels kept by update are only computed again in
+        the states of its scope.
+        """
+        if formula not in self._labels:
+            self._evaluating.append(formula)
+            try:
+                sat = formula.evaluate(self)
+            finally:
+                self._evaluating.pop()
+            if formula in self._stale:
+                sat = ((self._stale.pop(formula) & ~self._scope) |
+                       (sat & self._scope))
+            self._labels[formula] = sat
+        return self._labels[formula]
+
+
+    def update(self, graph, changed, ids=None):
+        """
+        Use 'graph', a new version of the graph of the checker where only the
+        'changed' states (new ids) are new or have different succesors. The
+        labels of the states not reaching a changed state are kept, the rest
+        are computed again when a formula is checked. If states were dropped
+        'ids' maps every previous state id to its new id or -1. Returns the
+        number of states to label again.
+        """
+        scope = self._scope if self._stale else 0
+        self._stale.update(self._labels)
+        self._stale_fixpoints.update(self._fixpoints)
+        if ids is not None:
+            size = graph.num_states()
+            for cache in (self._stale, self._stale_fixpoints):
+                for (formula, sat) in cache.items():
+                    cache[formula] = to_bitset([ids[i] for i in from_bitset(
+                        sat) if ids[i] >= 0], size)
+            scope = to_bitset([ids[i] for i in from_bitset(scope)
+                               if ids[i] >= 0], size)
+        self._graph = graph
+        self._size = graph.num_states()
+        self._all = (1 << self._size) - 1
+        self._labels = {}
+        self._fixpoints = {}
+        self._scope = scope | self._backward_closure(changed, self._all)
+        relabeled = bin(self._scope).count("1")
+        LOG.info("Native model checker updated, {0} of {1} states to label "
+                 "again".format(relabeled, self._size))
+        return relabeled
+
+
+    def _get_scope(self):
+        """
+        Get the bitset of the states where the formula being labeled must be
+        computed, or None if it is computed in every state, and its previous
+        fixpoint, valid outside of the scope.
+        """
+        if self._evaluating and self._evaluating[-1] in self._stale:
+            formula = self._evaluating[-1]
+            previous = self._stale_fixpoints.get(formula)
+            return (self._scope, previous)
+        return (None, None)
+
+
+    def _set_fixpoint(self, sat):
+        """ Keep 'sat' as the fixpoint of the formula being labeled """
+        if self._evaluating:
+            formula = self._evaluating[-1]
+            self._stale_fixpoints.pop(formula, None)
+            self._fixpoints[formula] = sat
+
+
+    def true(self):
+        """ Bitset of the states satisfying TRUE """
+        return self._all
+
+
+    def false(self):
+        """ Bitset of the states satisfying FALSE """
+        return 0
+
+
+    def atomic(self, place):
+        """ Bitset of the states with at least one token in 'place' """
+        if place not in self._place_index:
+            err_message = "Invalid place in formula: '{0}'".format(place)
+            raise CTLException(err_message)
+        tokens = self._graph.tokens(self._place_index[place])
+        (scope, _) = self._get_scope()
+        if scope is not None:
+            return to_bitset([state_id for state_id in from_bitset(scope)
+                              if tokens[state_id] > 0], self._size)
+        return to_bitset([state_id for (state_id, value)
+                          in enumerate(tokens) if value > 0], self._size)
+
+
+    def negation(self, sat):
+        """ Bitset of the states not in 'sat' """
+        return self._all & ~sat
+
+
+    def conjunction(self, sat_1, sat_2):
+        """ Bitset of the states both in 'sat_1' and 'sat_2' """
+        return sat_1 & sat_2
+
+
+    def exist_next(self, sat):
+        """ Bitset of the states with a succesor in 'sat' """
+        (scope, _) = self._get_scope()
+        if scope is not None:
+            inside = set(from_bitset(sat))
+            return to_bitset([state_id for state_id in from_bitset(scope)
+                              if not inside.isdisjoint(
+                                  self._graph.succesor_ids(state_id))],
+                             self._size)
+        members = set()
+        for target in from_bitset(sat):
+            members.update(self._graph.predecessor_ids(target))
+        return to_bitset(members, self._size)
+
+
+    def exist_until(self, sat_1, sat_2):
+        """
+        Bitset of the states with a path through 'sat_1' states reaching a
+        'sat_2' state.
+        """
+        (scope, previous) = self._get_scope()
+        if scope is None or previous is None:
+            sat = self._backward_closure(from_bitset(sat_2), sat_1)
+        else:
+            boundary = previous & ~scope
+            inside = set(from_bitset(boundary))
+            seeds = [state_id for state_id in from_bitset(scope)
+                     if sat_2 >> state_id & 1 or
+                     (sat_1 >> state_id & 1 and not inside.isdisjoint(
+                         self._graph.succesor_ids(state_id)))]
+            sat = boundary | self._backward_closure(seeds, sat_1 & scope)
+        self._set_fixpoint(sat)
+        return sat
+
+
+    def exist_globally(self, sat):
+        """
+        Bitset of the states with a maximal path through 'sat' states. These
+        are the 'sat' states reaching, inside 'sat', a non trivial strongly
+        connected component of 'sat' states or a deadlock. When only the
+        states of a scope are computed, the states with a succesor in the
+        previous fixpoint outside of the scope are also seeds.
+        """
+        (scope, previous) = self._get_scope()
+        boundary = 0
+        if scope is not None and previous is not None:
+            boundary = previous & ~scope
+            sat = sat & scope
+        inside = set(from_bitset(boundary))
+        seeds = []
+        for component in self._components(sat):
+            if len(component) > 1:
+                seeds.extend(component)
+                continue
+            state_id = component[0]
+            succ = self._graph.succesor_ids(state_id)
+            if (not succ or state_id in succ or
+                    not inside.isdisjoint(succ)):
+                seeds.append(state_id)
+        sat = boundary | self._backward_closure(seeds, sat)
+        self._set_fixpoint(sat)
+        return sat
+
+
+    def result(self, formula, shortest=False):
+        """
+        Get the CheckResult of 'formula' in the initial marking, with the
+        path of its witness if it holds or of the witness of its negation
+        (a counterexample) otherwise. If the witness has several branches
+        only the first one is in the path. With 'shortest' True the paths
+        of the until operators are the shortest ones.
+        """
+        value = self.check(formula)
+        shown = formula
+        if not value:
+            shown = formula.negate()
+        (_, edges, _, complete) = self.witness(shown, 0, shortest)
+        following = {}
+        for (source, t_index, target) in edges:
+            following.setdefault(source, []).append((t_index, target))
+        transitions = self._graph.get_transitions()
+        names = []
+        markings = [self._graph.marking_dict(0)]
+        visited = set([0])
+        current = 0
+        while following.get(current):
+            (t_index, target) = following[current].pop(0)
+            names.append(transitions[t_index])
+            markings.append(self._graph.marking_dict(target))
+            if target in visited:
+                break
+            visited.add(target)
+            current = target
+        if any(following.values()):
+            complete = False
+        return CheckResult(value, formula, names, markings, complete)
+
+
+    def witness(self, formula, state_id=0, shortest=True):
+        """
+        Get the part of the graph showing that the state 'state_id' satisfies
+        'formula', as a tuple (states, edges, deadlocks, complete). The
+        'edges' are the (source, transition index, target) steps of the
+        paths required by the existential operators, 'deadlocks' are the
+        states where a maximal path of EG ends and 'complete' is False if
+        the formula has universal operators, which have no path witness.
+        The paths of the until operators are the shortest ones if
+        'shortest' is True.
+        """
+        if not self.label(formula) >> state_id & 1:
+            err_message = "State {0} does not satisfy the formula".format(
+                state_id)
+            raise CTLException(err_message)
+        result = (set(), set(), set(), [True])
+        self._witness(formula, state_id, result, set(), shortest)
+        (states, edges, deadlocks, complete) = result
+        return (states, sorted(edges), deadlocks, complete[0])
+
+
+    def _witness(self, formula, state_id, result, done, shortest):
+        """
+        Add to 'result' the witness of 'formula' in the state 'state_id'.
+        The pairs (formula, state) already visited are kept in 'done'.
+        """
+        if (formula, state_id) in done:
+            return
+        done.add((formula, state_id))
+        (states, edges, deadlocks, complete) = result
+        states.add(state_id)
+        if isinstance(formula, ctl.CTLAnd):
+            self._witness(formula._phi_1, state_id, result, done, shortest)
+            self._witness(formula._phi_2, state_id, result, done, shortest)
+        elif isinstance(formula, ctl.CTLNegatedAnd):
+            for phi in (formula._phi_1.negate(), formula._phi_2.negate()):
+                if self.label(phi) >> state_id & 1:
+                    self._witness(phi, state_id, result, done, shortest)
+                    break
+        elif isinstance(formula, ctl.CTLExistNext):
+            sat = self.label(formula._phi)
+            for (t_index, target) in self._graph.succesors(state_id):
+                if sat >> target & 1:
+                    edges.add((state_id, t_index, target))
+                    self._witness(formula._phi, target, result, done,
+                                  shortest)
+                    break
+        elif isinstance(formula, ctl.CTLExistUntil):
+            path = self._until_path(state_id, self.label(formula._phi_1),
+                                    self.label(formula._phi_2), shortest)
+            for (source, t_index, target) in path:
+                edges.add((source, t_index, target))
+                self._witness(formula._phi_1, source, result, done, shortest)
+            end = path[-1][2] if path else state_id
+            self._witness(formula._phi_2, end, result, done, shortest)
+        elif isinstance(formula, ctl.CTLExistGlobally):
+            sat = self.label(formula)
+            visited = set()
+            current = state_id
+            while current not in visited:
+                visited.add(current)
+                self._witness(formula._phi, current, result, done, shortest)
+                following = None
+                for (t_index, target) in self._graph.succesors(current):
+                    if sat >> target & 1:
+                        following = (t_index, target)
+                        break
+                if following is None:
+                    deadlocks.add(current)
+                    break
+                edges.add((current, following[0], following[1]))
+                states.add(following[1])
+                current = following[1]
+        elif isinstance(formula, (ctl.CTLNegatedExistNext,
+                                  ctl.CTLNegatedExistUntil,
+                                  ctl.CTLNegatedExistGlobally)):
+            complete[0] = False
+
+
+    def _until_path(self, state_id, sat_1, sat_2, shortest):
+        """
+        Get a path of (source, transition index, target) steps from
+        'state_id' through 'sat_1' states to a 'sat_2' state. From the
+        initial state the path to the first 'sat_2' state, following the
+        parents kept by the graph, is used if it stays in 'sat_1'. Otherwise
+        the path is searched in breadth first order if 'shortest' is True,
+        or in depth first order.
+        """
+        if state_id == 0 and sat_2:
+            path = self._graph.path_to((sat_2 & -sat_2).bit_length() - 1)
+            if all([sat_1 >> source & 1 for (source, _, _) in path]):
+                return path
+        parents = {state_id: None}
+        frontier = deque([state_id])
+        while frontier:
+            if shortest:
+                current = frontier.popleft()
+            else:
+                current = frontier.pop()
+            if sat_2 >> current & 1:
+                path = []
+                while parents[current] is not None:
+                    (source, t_index) = parents[current]
+                    path.append((source, t_index, current))
+                    current = source
+                path.reverse()
+                return path
+            if not sat_1 >> current & 1:
+                continue
+            for (t_index, target) in self._graph.succesors(current):
+                if target not in parents:
+                    parents[target] = (current, t_index)
+                    frontier.append(target)
+        return []
+
+
+    def _backward_closure(self, seeds, sat):
+        """
+        Bitset of the states reaching a state in 'seeds' with a path through
+        'sat' states.
+        """
+        inside = set(from_bitset(sat))
+        visited = set(seeds)
+        frontier = deque(seeds)
+        while frontier:
+            target = frontier.popleft()
+            for source in self._graph.predecessor_ids(target):
+                if source not in visited and source in inside:
+                    visited.add(source)
+                    frontier.append(source)
+        return to_bitset(visited, self._size)
+
+
+    def _components(self, sat):
+        """
+        Get the strongly connected components of the graph restricted to the
+        'sat' states, using an iterative version of Tarjan's algorithm.
+        """
+        members = from_bitset(sat)
+        inside = set(members)
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in members:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._graph.succesor_ids(root)))]
+            while work:
+                (state_id, succ) = work[-1]
+                pushed = False
+                for target in succ:
+                    if target not in inside:
+                        continue
+                    if target not in index:
+                        index[target] = low[target] = len(index)
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target,
+                                     iter(self._graph.succesor_ids(target))))
+                        pushed = True
+                        break
+                    if target in on_stack:
+                        low[state_id] = min(low[state_id], index[target])
+                if pushed:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[state_id])
+                if low[state_id] == index[state_id]:
+                    component = []
+                    while True:
+                        target = stack.pop()
+                        on_stack.discard(target)
+                        component.append(target)
+                        if target == state_id:
+                            break
+                    components.append(component)
+        return components
@@ -0,0 +1,268 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the file formats of the Petri Net models. Both keep
+  the P and T sets as lists of names and every flow function (I and O) as
+  sparse arc lists by transition: the arcs of the transition 'j' are the
+  positions from 'offsets[j]' to 'offsets[j + 1]' of the lists of place
+  indexes and values. Loading a model only needs list slicing and indexing,
+  so no key is parsed.
+
+    * JSON: an object with "version" 2, the "P" and "T" lists and the "I"
+      and "O" arc lists as objects with "offsets", "places" and "values".
+      Files without "version" are in the first format, with the I and O
+      functions stored as dictionaries from the string of a (place,
+      transition) pair to its value, and they are still read.
+    * Binary: a fixed size header, the names encoded in UTF-8 and ended by
+      a zero byte, and the arc lists as little endian 32 bits integer
+      arrays, so the file can be mapped in memory and the arrays read
+      without parsing.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+  18-10-2026  ulisesma   Arc lists checked on load, byte string names dumped
+                         as they are
+  18-10-2026  ulisesma   Unknown names in first format arcs reported
+
+"""
+
+import ast
+import json
+import mmap
+import struct
+import sys
+from array import array
+from itertools import izip
+
+from error_handling import PetriNetException
+from logger import LOG
+
+FORMATS = ["json", "binary"]
+JSON_VERSION = 2
+BINARY_MAGIC = "PNBF"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sIIIIIQ")
+BINARY_ALIGNMENT = 8
+ARRAY_TYPECODE = "i"
+
+
+def get_arcs(net, flow_sets):
+    """
+    Get the arc lists (offsets, places, values) of the per transition
+    'flow_sets' (the preset or the postset) of 'net', with the places of
+    every transition in the order of the P set.
+    """
+    offsets = [0]
+    places = []
+    values = []
+    for transition in net._transitions:
+        arcs = sorted([(net._place_index[place], value) for (place, value)
+                       in flow_sets[transition].iteritems()])
+        places.extend([place for (place, _) in arcs])
+        values.extend([value for (_, value) in arcs])
+        offsets.append(len(places))
+    return (offsets, places, values)
+
+
+def build_flow(places, transitions, arcs):
+    """
+    Get the sparse flow function and the per transition flow sets of the
+    arc lists 'arcs', given the lists of 'places' and 'transitions' names.
+    """
+    (offsets, place_indexes, values) = arcs
+    names = map(places.__getitem__, place_indexes)
+    flow_sets = {}
+    owners = []
+    for (j, transition) in enumerate(transitions):
+        (start, end) = (offsets[j], offsets[j + 1])
+        flow_sets[transition] = dict(izip(names[start:end],
+                                          values[start:end]))
+        owners.extend([transition] * (end - start))
+    flow = dict(izip(izip(names, owners), values))
+    return (flow, flow_sets)
+
+
+def _check_arcs(places, transitions, arcs):
+    """ Raise an exception if the arc lists 'arcs' are not consistent """
+    (offsets, place_indexes, values) = arcs
+    valid = (len(offsets) == len(transitions) + 1 and offsets[0] == 0 and
+             offsets[-1] == len(place_indexes) == len(values))
+    if valid and len(place_indexes):
+        valid = (min(place_indexes) >= 0 and
+                 max(place_indexes) < len(places) and min(values) > 0 and
+                 all([offsets[j] <= offsets[j + 1]
+                      for j in xrange(len(transitions))]))
+    if not valid:
+        err_message = "Invalid arc lists in model file"
+        raise PetriNetException(err_message)
+
+
+def dump_json(net, out_file):
+    """ Dump 'net' into the open file 'out_file' in the JSON format """
+    out_dict = {}
+    out_dict["version"] = JSON_VERSION
+    out_dict["P"] = net._places
+    out_dict["T"] = net._transitions
+    for (function_type, flow_sets) in (("I", net._preset),
+                                       ("O", net._postset)):
+        (offsets, places, values) = get_arcs(net, flow_sets)
+        out_dict[function_type] = {"offsets": offsets, "places": places,
+                                   "values": values}
+    json.dump(out_dict, out_file, separators=(",", ":"))
+
+
+def dump_binary(net, out_file):
+    """ Dump 'net' into the open file 'out_file' in the binary format """
+    names = "".join([(name.encode("utf-8") if isinstance(name, unicode)
+                      else name) + "\0" for name
+                     in list(net._places) + list(net._transitions)])
+    names += "\0" * (-len(names) % BINARY_ALIGNMENT)
+    input_arcs = get_arcs(net, net._preset)
+    output_arcs = get_arcs(net, net._postset)
+    out_file.write(BINARY_HEADER.pack(
+        BINARY_MAGIC, BINARY_VERSION, len(net._places),
+        len(net._transitions), len(input_arcs[1]), len(output_arcs[1]),
+        len(names)))
+    out_file.write(names)
+    for arcs in (input_arcs, output_arcs):
+        for values in arcs:
+            values = array(ARRAY_TYPECODE, values)
+            if sys.byteorder == "big":
+                values.byteswap()
+            out_file.write(values.tostring())
+
+
+def load_model(file_name):
+    """
+    Load the model in the file 'file_name', in any of the formats. Returns
+    a tuple (places, transitions, input arcs, output arcs), where the arc
+    lists are checked.
+    """
+    with open(file_name, "rb") as in_file:
+        magic = in_file.read(len(BINARY_MAGIC))
+        in_file.seek(0)
+        if magic == BINARY_MAGIC:
+            model = _load_binary(in_file)
+        else:
+            model = _load_json(json.load(in_file))
+    (places, transitions, input_arcs, output_arcs) = model
+    _check_arcs(places, transitions, input_arcs)
+    _check_arcs(places, transitions, output_arcs)
+    return model
+
+
+def _load_json(in_dict):
+    """ Get the model tuple of a JSON object in any of the formats """
+    if "version" not in in_dict:
+        LOG.info("Reading model in the first JSON format")
+        return _read_first_format(in_dict)
+    if in_dict["version"] != JSON_VERSION:
+        err_message = "Unsupported model file version: '{0}'".format(
+            in_dict["version"])
+        raise PetriNetException(err_message)
+    arcs = [(in_dict[function_type]["offsets"],
+             in_dict[function_type]["places"],
+             in_dict[function_type]["values"])
+            for function_type in ("I", "O")]
+    return (in_dict["P"], in_dict["T"], arcs[0], arcs[1])
+
+
+def _read_first_format(in_dict):
+    """
+    Get the model tuple of a JSON object in the first format, where the
+    keys of the I and O functions are strings of (place, transition) pairs.
+    """
+    places = in_dict["P"]
+    transitions = in_dict["T"]
+    place_index = dict((place, i) for (i, place) in enumerate(places))
+    arcs = []
+    for function_type in ("I", "O"):
+        per_transition = [[] for transition in transitions]
+        transition_index = dict((transition, j) for (j, transition)
+                                in enumerate(transitions))
+        for (key_str, value) in in_dict[function_type].iteritems():
+            if not value:
+                continue
+            (place, transition) = [name.decode("utf-8") if isinstance(
+                name, str) else name for name in ast.literal_eval(key_str)]
+            try:
+                per_transition[transition_index[transition]].append(
+                    (place_index[place], value))
+            except KeyError:
+                err_message = ("Unknown place or transition in arc: "
+                               "'{0}'".format(key_str))
+                raise PetriNetException(err_message)
+        offsets = [0]
+        place_indexes = []
+        values = []
+        for pairs in per_transition:
+            pairs.sort()
+            place_indexes.extend([place for (place, _) in pairs])
+            values.extend([value for (_, value) in pairs])
+            offsets.append(len(place_indexes))
+        arcs.append((offsets, place_indexes, values))
+    return (places, transitions, arcs[0], arcs[1])
+
+
+def _load_binary(in_file):
+    """ Get the model tuple of the open binary file 'in_file' """
+    mapped = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        if len(mapped) < BINARY_HEADER.size:
+            err_message = "Truncated binary model file"
+            raise PetriNetException(err_message)
+        (_, version, num_places, num_transitions, num_input, num_output,
+         names_size) = BINARY_HEADER.unpack(mapped[:BINARY_HEADER.size])
+        if version != BINARY_VERSION:
+            err_message = "Unsupported model file version: '{0}'".format(
+                version)
+            raise PetriNetException(err_message)
+        position = BINARY_HEADER.size
+        names = mapped[position:position + names_size].split("\0")
+        names = [name.decode("utf-8") for name
+                 in names[:num_places + num_transitions]]
+        position += names_size
+        arcs = []
+        for size in (num_input, num_output):
+            lists = []
+            for length in (num_transitions + 1, size, size):
+                values = array(ARRAY_TYPECODE)
+                end = position + length * values.itemsize
+                if end > len(mapped):
+                    err_message = "Truncated binary model file"
+                    raise PetriNetException(err_message)
+                values.fromstring(mapped[position:end])
+                if sys.byteorder == "big":
+                    values.byteswap()
+                lists.append(values)
+                position = end
+            arcs.append(tuple(lists))
+    finally:
+        mapped.close()
+    return (names[:num_places], names[num_places:], arcs[0], arcs[1])
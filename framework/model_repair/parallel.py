@@ -0,0 +1,397 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the parallel exploration of reachability sets. The
+  markings are partitioned by a hash of their tokens among a pool of worker
+  processes, each worker keeps the markings of its partition, expands them
+  and keeps their edges.
+
+  The exploration goes by rounds, one per breadth first level: every worker
+  expands the markings found in the last round, keeping the succesors it
+  owns and sending the others in one batch per owner, directly to the queue
+  of the owner. The owners answer with the ids of the markings, and with a
+  flag telling if they have markings to expand. While exploring, states get
+  striped ids: the local id of the state in its partition times the number
+  of workers, plus the owner.
+
+  At the end the main process only gets the sizes of the partitions and
+  sends back their offsets, so every worker moves its edges to the final
+  ids and the partitions are concatenated. The merged graph is renumbered
+  in breadth first order from the initial marking, following the succesors
+  of every state in transition order, so it is the same graph, with the
+  same state ids and parents, built by the sequential exploration.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+  18-10-2026  ulisesma   Batches exchanged between workers and partitions
+                         concatenated by offset
+  18-10-2026  ulisesma   Merged graph numbered as the sequential one
+
+"""
+
+import multiprocessing
+import select
+import traceback
+import zlib
+from array import array
+
+from error_handling import PetriNetException
+from logger import LOG
+from reachability import BATCH_SIZE, MARKING_TYPECODES, WORD_TYPECODE
+from reachability import ReachabilityGraph, pack_marking
+
+DEFAULT_WORKERS = multiprocessing.cpu_count()
+
+
+def get_owner(state, workers):
+    """ Get the worker owning the packed marking 'state' """
+    return (zlib.crc32(array("l", state).tostring()) & 0xffffffff) % workers
+
+
+class ExplorationWorker(object):
+    """
+    Class to represent the worker 'worker' of a parallel exploration of
+    'net', getting the messages of the other workers in its queue of
+    'inboxes'. The marking table of the partition uses the BitPacking
+    'packing' if it is given.
+    """
+
+    def __init__(self, net, worker, inboxes, packing=None):
+        self._net = net
+        self._worker = worker
+        self._workers = len(inboxes)
+        self._inboxes = inboxes
+        self._packing = packing
+        self._index = {}
+        self._table = array(WORD_TYPECODE)
+        self._size = 0
+        self._offsets = array("l", [0])
+        self._targets = array("l")
+        self._labels = array("i")
+        self._frontier = []
+        self._stash = {}
+        self._statistics = {"rounds": 0, "sent": 0, "received": 0}
+
+
+    def explore(self, state_0):
+        """
+        Explore the partition of the worker from the packed marking
+        'state_0', a round per breadth first level, until no worker has
+        markings to expand.
+        """
+        if get_owner(state_0, self._workers) == self._worker:
+            self._intern(state_0)
+        active = True
+        while active:
+            self._statistics["rounds"] += 1
+            pending = self._expand()
+            active = self._exchange(pending)
+        LOG.info("Worker {0}: {1} states, statistics: {2}".format(
+            self._worker, self._size, self._statistics))
+
+
+    def _intern(self, state):
+        """
+        Get the striped id of the packed marking 'state' of the partition,
+        adding it for the next round if it is new.
+        """
+        local_id = self._index.get(state)
+        if local_id is None:
+            local_id = self._size
+            row = state
+            if self._packing is not None:
+                row = self._packing.encode(state)
+                if row is None:
+                    err_message = ("Marking exceeds packing bounds: "
+                                   "'{0}'".format(state))
+                    raise PetriNetException(err_message)
+            self._index[state] = local_id
+            self._table.extend(row)
+            self._size += 1
+            self._frontier.append(state)
+        return local_id * self._workers + self._worker
+
+
+    def _expand(self):
+        """
+        Expand the markings found in the last round. Returns, for every
+        worker, the batch of markings it owns and the edges waiting for
+        their ids, as a (states, edges) pair where 'edges' are (edge
+        position, batch position) pairs.
+        """
+        frontier = self._frontier
+        self._frontier = []
+        pending = [(array("l"), [], {}) for _ in xrange(self._workers)]
+        for start in xrange(0, len(frontier), BATCH_SIZE):
+            batch = frontier[start:start + BATCH_SIZE]
+            succ = self._net._get_succesors_batch(batch)
+            position = 0
+            for row in xrange(len(batch)):
+                while position < len(succ) and succ[position][0] == row:
+                    (_, t_index, target) = succ[position]
+                    position += 1
+                    owner = get_owner(target, self._workers)
+                    self._labels.append(t_index)
+                    if owner == self._worker:
+                        self._targets.append(self._intern(target))
+                        continue
+                    (states, edges, positions) = pending[owner]
+                    if target not in positions:
+                        positions[target] = len(positions)
+                        states.extend(target)
+                    edges.append((len(self._targets), positions[target]))
+                    self._targets.append(-1)
+                self._offsets.append(len(self._targets))
+        return [(states, edges) for (states, edges, _) in pending]
+
+
+    def _exchange(self, pending):
+        """
+        Send the 'pending' batches (see _expand) to their owners, add the
+        batches of the other workers and set the ids of the pending edges.
+        Returns True if any worker has markings to expand.
+        """
+        if self._workers == 1:
+            return bool(self._frontier)
+        current = self._statistics["rounds"]
+        width = len(self._net._places)
+        for (owner, (states, _)) in enumerate(pending):
+            if owner != self._worker:
+                self._inboxes[owner].put(("states", current, self._worker,
+                                          states.tostring()))
+                self._statistics["sent"] += len(states) // width
+        replies = []
+        for (_, _, sender, states) in self._receive("states"):
+            tokens = array("l")
+            tokens.fromstring(states)
+            ids = array("l", [self._intern(tuple(tokens[start:
+                                                         start + width]))
+                              for start in xrange(0, len(tokens), width)])
+            replies.append((sender, ids))
+            self._statistics["received"] += len(ids)
+        active = bool(self._frontier)
+        for (sender, ids) in replies:
+            self._inboxes[sender].put(("ids", current, self._worker,
+                                       ids.tostring(), active))
+        for (_, _, owner, data, owner_active) in self._receive("ids"):
+            ids = array("l")
+            ids.fromstring(data)
+            for (edge, position) in pending[owner][1]:
+                self._targets[edge] = ids[position]
+            active = active or owner_active
+        return active
+
+
+    def _receive(self, message_type):
+        """
+        Get the messages of type 'message_type' of the current round sent by
+        every other worker. Messages of the next round are kept for later.
+        """
+        key = (message_type, self._statistics["rounds"])
+        messages = self._stash.pop(key, [])
+        inbox = self._inboxes[self._worker]
+        while len(messages) < self._workers - 1:
+            message = inbox.get()
+            if message[:2] == key:
+                messages.append(message)
+            else:
+                self._stash.setdefault(message[:2], []).append(message)
+        return messages
+
+
+    def size(self):
+        """ Get the number of states and of edges of the partition """
+        return (self._size, len(self._targets))
+
+
+    def partition(self, state_offsets, edge_offset):
+        """
+        Get the tables of the partition with the final state ids, given the
+        first state id of every partition and the first edge position of
+        this one. Returns the strings of the arrays (markings, offsets,
+        targets, labels) of a ReachabilityGraph.
+        """
+        workers = self._workers
+        targets = array("i", [state_offsets[target % workers] +
+                              target // workers for target in self._targets])
+        offsets = array("l", [offset + edge_offset
+                              for offset in self._offsets[1:]])
+        return (self._table.tostring(), offsets.tostring(),
+                targets.tostring(), self._labels.tostring())
+
+
+def _run_worker(net, worker, inboxes, connection, state_0, packing):
+    """
+    Run the worker 'worker' of a parallel exploration of 'net' from the
+    packed marking 'state_0', reporting to the main process through
+    'connection'. It sends the size of its partition, gets the offsets of
+    the final ids and sends its tables (see ExplorationWorker.partition).
+    """
+    try:
+        explorer = ExplorationWorker(net, worker, inboxes, packing)
+        explorer.explore(state_0)
+        connection.send(("size", explorer.size()))
+        (state_offsets, edge_offset) = connection.recv()
+        connection.send(("partition", explorer.partition(state_offsets,
+                                                         edge_offset)))
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+def _receive(connection, expected):
+    """ Receive a message of type 'expected' from a worker """
+    (message_type, data) = connection.recv()
+    if message_type != expected:
+        err_message = "Parallel exploration worker failed: {0}".format(data)
+        raise PetriNetException(err_message)
+    return data
+
+
+def _collect(connections, expected):
+    """
+    Receive a message of type 'expected' from every worker, as soon as it
+    is sent. Returns the list of their data.
+    """
+    data = [None] * len(connections)
+    waiting = dict((connection.fileno(), worker)
+                   for (worker, connection) in enumerate(connections))
+    while waiting:
+        (readable, _, _) = select.select(waiting.keys(), [], [])
+        for file_descriptor in readable:
+            worker = waiting.pop(file_descriptor)
+            data[worker] = _receive(connections[worker], expected)
+    return data
+
+
+def explore_parallel(net, m_0, workers=DEFAULT_WORKERS, packing=None):
+    """
+    Explore the reachability set of 'net' from the marking 'm_0' with
+    'workers' processes and get its ReachabilityGraph. It is the graph built
+    by explore, with the same state ids, edges and parents. The marking
+    table of the graph uses the BitPacking 'packing' if it is given.
+    """
+    if workers < 1:
+        err_message = "Invalid number of workers: '{0}'".format(workers)
+        raise PetriNetException(err_message)
+    state_0 = pack_marking(net._places, m_0)
+    inboxes = [multiprocessing.Queue() for _ in xrange(workers)]
+    connections = []
+    processes = []
+    for worker in xrange(workers):
+        (parent_end, child_end) = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_run_worker,
+            args=(net, worker, inboxes, child_end, state_0, packing))
+        process.daemon = True
+        process.start()
+        child_end.close()
+        connections.append(parent_end)
+        processes.append(process)
+    try:
+        sizes = _collect(connections, "size")
+        owner = get_owner(state_0, workers)
+        order = [owner] + [worker for worker in xrange(workers)
+                           if worker != owner]
+        state_offsets = [0] * workers
+        edge_offsets = [0] * workers
+        (states, edges) = (0, 0)
+        for worker in order:
+            state_offsets[worker] = states
+            edge_offsets[worker] = edges
+            states += sizes[worker][0]
+            edges += sizes[worker][1]
+        for worker in xrange(workers):
+            connections[worker].send((state_offsets, edge_offsets[worker]))
+        partitions = _collect(connections, "partition")
+    except Exception:
+        for process in processes:
+            process.terminate()
+        raise
+    finally:
+        for connection in connections:
+            connection.close()
+        for process in processes:
+            process.join()
+    graph = merge_partitions(net, [partitions[worker] for worker in order],
+                             packing)
+    LOG.info("Parallel exploration with {0} workers: {1} states and {2} "
+             "edges".format(workers, graph.num_states(), graph.num_edges()))
+    return graph
+
+
+def merge_partitions(net, partitions, packing=None):
+    """
+    Build the ReachabilityGraph of 'net' concatenating the tables of the
+    'partitions' (see ExplorationWorker.partition) in order, the first one
+    holding the initial marking, and renumbering the states in breadth first
+    order as explore does. The marking table is moved to the smallest
+    integer type fitting it, unless it holds the words of the BitPacking
+    'packing'.
+    """
+    graph = ReachabilityGraph(net._places, net._transitions, packing)
+    table = array(WORD_TYPECODE)
+    for (markings, offsets, targets, labels) in partitions:
+        table.fromstring(markings)
+        graph._offsets.fromstring(offsets)
+        graph._targets.fromstring(targets)
+        graph._labels.fromstring(labels)
+    if packing is None:
+        for typecode in MARKING_TYPECODES:
+            try:
+                table = array(typecode, table)
+            except OverflowError:
+                continue
+            break
+    graph._markings = table
+    graph._size = len(graph._offsets) - 1
+    graph._sort_breadth_first()
+    return graph
+
+
+def merge_succesors(net, state_0, rows, packing=None):
+    """
+    Build the ReachabilityGraph of the succesors 'rows', a dictionary from
+    every marking to its list of (transition index, marking) succesors,
+    numbering the states in breadth first order from 'state_0'. The
+    dictionary is emptied.
+    """
+    graph = ReachabilityGraph(net._places, net._transitions, packing)
+    graph._intern(state_0)
+    expanded = 0
+    while expanded < graph.num_states():
+        succ = rows.pop(graph.marking(expanded))
+        graph._add_succesors([(t_index, graph._intern(target)[0])
+                              for (t_index, target) in succ])
+        expanded += 1
+    graph.release_index()
+    LOG.info("Explored {0} states and {1} edges".format(graph.num_states(),
+                                                          graph.num_edges()))
+    return graph
@@ -30,7 +30,7 @@
 ================================================================================
 
       Version: 0.1
-  Last Update: 27-03-2016
+  Last Update: 18-10-2026
 
   Date        Alias      Description
 --------------------------------------------------------------------------------
@@ -42,18 +42,77 @@
   03-02-2016  ulisesma   Function to export to LoLA model
   06-02-2016  ulisesma   Removing unecesary import
   27-03-2016  ulisesma   Adding model checking capabilities with LoLA
+  18-10-2026  ulisesma   Reachability set computed by the indexed exploration
+                         engine
+  18-10-2026  ulisesma   Precompiled flow matrices and batched succesors
+  18-10-2026  ulisesma   Sparse storage of I and O with preset and postset
+                         per transition
+  18-10-2026  ulisesma   Place and transition indexes and bulk builder
+                         functions
+  18-10-2026  ulisesma   Native model checking backend
+  18-10-2026  ulisesma   Model checking of a batch of formulae
+  18-10-2026  ulisesma   Persistent cache of LoLA results
+  18-10-2026  ulisesma   Parallel LoLA runs with unique temporal files
+  18-10-2026  ulisesma   Asynchronous model checking with LoLA
+  18-10-2026  ulisesma   Streaming reachability and early termination
+  18-10-2026  ulisesma   Reachability graph object
+  18-10-2026  ulisesma   Partial order reduction in reachability and native
+                         model checking
+  18-10-2026  ulisesma   Symmetry reduction of replicated subnets
+  18-10-2026  ulisesma   Symbolic model checking backend with BDDs
+  18-10-2026  ulisesma   Coverability graph and place bounds
+  18-10-2026  ulisesma   Structural analysis and bit packed markings
+  18-10-2026  ulisesma   Model repair search and net copies
+  18-10-2026  ulisesma   Change journal and incremental verification sessions
+  18-10-2026  ulisesma   Check results with witness and counterexample paths
+  18-10-2026  ulisesma   Versioned JSON format with arc lists and binary format
+  18-10-2026  ulisesma   Reachability graphs in on-disk state stores
+  18-10-2026  ulisesma   Parallel exploration partitioned among processes
+  18-10-2026  ulisesma   Distributed exploration over TCP nodes
+  18-10-2026  ulisesma   LoLA kept as the default model checking backend
+  18-10-2026  ulisesma   Place bound of the symbolic backend computed or given
+  18-10-2026  ulisesma   Dense flow matrices chosen by the density of arcs
+  18-10-2026  ulisesma   Flow matrices compiled from the arc lists of loaded
+                         models, I and O functions built on first use
+  18-10-2026  ulisesma   Parallel graphs numbered by partition
 
 """
 
-import json
-import re
 import os
+import tempfile
+import time
+from itertools import izip
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-from runner import run
+from runner import run, Future, RunnerPool
+from reachability import explore, iter_expansions, pack_marking
+from reachability import unpack_marking, BitPacking
+from model_checker import ModelChecker
+from reduction import FormulaScanner
+from symmetry import Symmetry, detect_symmetry
+from symbolic import SymbolicChecker, SymbolicStateSpace
+from coverability import OMEGA, coverability
+from repair import ModelRepair
+from session import VerificationSession
+from state_store import StoredGraph, explore_to_store
+from parallel import explore_parallel
+from distributed import DEFAULT_NODES, explore_distributed
+from witness import CheckResult, has_lola_path, lola_path
+import structural
+import model_io
+from result_cache import get_key, get_result_cache
 from error_handling import PetriNetException
 from logger import LOG
 
-IO_KEY_PATTERN = "\('(.*)', '(.*)'\)"
+DENSE_MATRIX_LIMIT = 1 << 22
+DENSE_MIN_DENSITY = 0.25
+BACKENDS = ["native", "lola", "symbolic"]
+LOLA_VERSION = []
+NEGATIVE_RESULT = "lola: result: no"
 MARKING_PAIR = "{0}: {1}"
 LOLA_TEMPLATE = """
 PLACE
@@ -72,17 +131,58 @@ TRANSITION {0}
 
 def check_result(lola_output):
     for line in lola_output.splitlines():
-        if line == "lola: result: no":
+        if line == NEGATIVE_RESULT:
             return False
     return True
 
+def get_lola_version():
+    """
+    Get the version reported by the LoLA tool, it is run only the first time.
+    """
+    if not LOLA_VERSION:
+        (_, stdout, stderr) = run(["lola", "--version"])
+        LOLA_VERSION.append((stdout + stderr).strip())
+    return LOLA_VERSION[0]
+
 class PetriNet(object):
     """ Class to represent a general Petri Net system. """
     def __init__(self):
         self._places = []
         self._transitions = []
-        self._input = {}
-        self._output = {}
+        self._place_index = {}
+        self._transition_index = {}
+        self._flow_functions = ({}, {}, {}, {})
+        self._arcs = None
+        self._flow_matrices = None
+        self._consumers = None
+        self._journal = []
+
+
+    _input = property(lambda self: self._get_flow_functions()[0],
+                      doc="Sparse I function of (place, transition) pairs")
+    _output = property(lambda self: self._get_flow_functions()[1],
+                       doc="Sparse O function of (place, transition) pairs")
+    _preset = property(lambda self: self._get_flow_functions()[2],
+                       doc="Input places and values of every transition")
+    _postset = property(lambda self: self._get_flow_functions()[3],
+                        doc="Output places and values of every transition")
+
+
+    def _get_flow_functions(self):
+        """
+        Get the (I, O, preset, postset) tuple of the net. The functions of a
+        model loaded from a file are built from its arc lists on first use,
+        and the arc lists are dropped since the functions may change.
+        """
+        if self._arcs is not None:
+            (input_arcs, output_arcs) = self._arcs
+            (input_flow, preset) = model_io.build_flow(
+                self._places, self._transitions, input_arcs)
+            (output_flow, postset) = model_io.build_flow(
+                self._places, self._transitions, output_arcs)
+            self._flow_functions = (input_flow, output_flow, preset, postset)
+            self._arcs = None
+        return self._flow_functions
 
 
     def add_place(self, place):
@@ -93,16 +193,41 @@ class PetriNet(object):
         if not isinstance(place, basestring):
             err_message = "Place provided is not an string"
             raise PetriNetException(err_message)
-        if place not in self._places:
-            self._places.append(place)
-            for transition in self._transitions:
-                self.change_input_flow(place, transition, 0)
-                self.change_output_flow(place, transition, 0)
+        if place not in self._place_index:
+            self._append_place(place)
             LOG.info("Place '{0}' added to P set".format(place))
         else:
             LOG.info("Place '{0}' already in P set".format(place))
 
 
+    def _append_place(self, place):
+        """ Append 'place' to the P set and to the place index """
+        self._place_index[place] = len(self._places)
+        self._places.append(place)
+        self._flow_matrices = None
+        self._journal.append(("P", place))
+
+
+    def add_places(self, places):
+        """
+        Function to add all the places in the iterable 'places' to P set if not
+        already in it. All the places are validated before any of them is
+        added, if one of them is not an string this function will raise an
+        exception.
+        """
+        places = list(places)
+        for place in places:
+            if not isinstance(place, basestring):
+                err_message = "Place provided is not an string"
+                raise PetriNetException(err_message)
+        added = 0
+        for place in places:
+            if place not in self._place_index:
+                self._append_place(place)
+                added += 1
+        LOG.info("{0} places added to P set".format(added))
+
+
     def add_transition(self, transition):
         """
         Function to add transition to T set if not already in it. If
@@ -111,16 +236,45 @@ class PetriNet(object):
         if not isinstance(transition, basestring):
             err_message = "Transition provided is not an string"
             raise PetriNetException(err_message)
-        if transition not in self._transitions:
-            self._transitions.append(transition)
-            for place in self._places:
-                self.change_input_flow(place, transition, 0)
-                self.change_output_flow(place, transition, 0)
+        if transition not in self._transition_index:
+            self._append_transition(transition)
             LOG.info("Transition '{0}' added to T set".format(transition))
         else:
             LOG.info("Transition '{0}' already in T set".format(transition))
 
 
+    def _append_transition(self, transition):
+        """ Append 'transition' to the T set and to the transition index """
+        # The flow functions are built before T grows past the arc lists
+        (_, _, preset, postset) = self._get_flow_functions()
+        preset[transition] = {}
+        postset[transition] = {}
+        self._transition_index[transition] = len(self._transitions)
+        self._transitions.append(transition)
+        self._flow_matrices = None
+        self._journal.append(("T", transition))
+
+
+    def add_transitions(self, transitions):
+        """
+        Function to add all the transitions in the iterable 'transitions' to T
+        set if not already in it. All the transitions are validated before any
+        of them is added, if one of them is not an string this function will
+        raise an exception.
+        """
+        transitions = list(transitions)
+        for transition in transitions:
+            if not isinstance(transition, basestring):
+                err_message = "Transition provided is not an string"
+                raise PetriNetException(err_message)
+        added = 0
+        for transition in transitions:
+            if transition not in self._transition_index:
+                self._append_transition(transition)
+                added += 1
+        LOG.info("{0} transitions added to T set".format(added))
+
+
     def change_input_flow(self, place, transition, value):
         """
         Change the value of the input function for 'place' and 'transition'
@@ -129,17 +283,8 @@ class PetriNet(object):
         Raise an exception if 'place' is not in P, 'transition' is not in T, or
         'value' is not an integer value equal or greatter than 0.
         """
-        if place not in self._places:
-            err_message = "Place is not in P"
-            raise PetriNetException(err_message)
-        if transition not in self._transitions:
-            err_message = "Transition is not in T"
-            raise PetriNetException(err_message)
-        if not isinstance(value, int) or value < 0:
-            err_message = "The value is not a integer greater or equal than 0"
-            raise PetriNetException(err_message)
-        key_pair = (place, transition)
-        self._input[key_pair] = value
+        self._check_flow(place, transition, value)
+        self._update_flow(self._input, self._preset, place, transition, value)
         msg = "Value updated in I. I({0}, {1}) = {2}".format(place, transition,
                                                              value)
         LOG.info(msg)
@@ -153,97 +298,170 @@ class PetriNet(object):
         Raise an exception if 'place' is not in P, 'transition' is not in T, or
         'value' is not an integer value equal or greatter than 0.
         """
-        if place not in self._places:
+        self._check_flow(place, transition, value)
+        self._update_flow(self._output, self._postset, place, transition,
+                          value)
+        msg = "Value updated in O. O({0}, {1}) = {2}".format(place, transition,
+                                                             value)
+        LOG.info(msg)
+
+
+    def _check_flow(self, place, transition, value):
+        """
+        Raise an exception if 'place' is not in P, 'transition' is not in T, or
+        'value' is not an integer value equal or greatter than 0.
+        """
+        if place not in self._place_index:
             err_message = "Place is not in P"
             raise PetriNetException(err_message)
-        if transition not in self._transitions:
+        if transition not in self._transition_index:
             err_message = "Transition is not in T"
             raise PetriNetException(err_message)
         if not isinstance(value, int) or value < 0:
             err_message = "The value is not a integer greater or equal than 0"
             raise PetriNetException(err_message)
-        key_pair = (place, transition)
-        self._output[key_pair] = value
-        msg = "Value updated in O. O({0}, {1}) = {2}".format(place, transition,
-                                                             value)
-        LOG.info(msg)
 
 
-    def _get_io_dict(self, function_type):
+    def set_arcs(self, arcs, function_type):
         """
-        Read the proper I or O function and dump into a Python dictionary. It
-        converts all the pair keys into strings to avoid problems dumping into a
-        JSON file.
+        Set the values of the I or O function (according to 'function_type')
+        for every (place, transition, value) triple in the iterable 'arcs'.
+        All the triples are validated before any value is changed, with the
+        same rules of 'change_input_flow' and 'change_output_flow'.
         """
-        out_dict = {}
         if function_type == "I":
-            used_dict = self._input
+            flow_function = self._input
+            flow_sets = self._preset
         elif function_type == "O":
-            used_dict = self._output
+            flow_function = self._output
+            flow_sets = self._postset
         else:
             err_message = "Invalid function type: '{0}'".format(function_type)
             raise PetriNetException(err_message)
-        for key in used_dict.keys():
-            key_str = "{0}".format(key)
-            out_dict[key_str] = used_dict[key]
-        return out_dict
+        arcs = list(arcs)
+        for (place, transition, value) in arcs:
+            self._check_flow(place, transition, value)
+        for (place, transition, value) in arcs:
+            self._update_flow(flow_function, flow_sets, place, transition,
+                              value)
+        msg = "{0} values updated in {1}".format(len(arcs), function_type)
+        LOG.info(msg)
 
 
-    def save_file(self, file_name):
+    def _update_flow(self, flow_function, flow_sets, place, transition, value):
         """
-        Dump the Petri Net model into a JSON file with name 'file_name'.
+        Store 'value' for the pair 'place' and 'transition' in the sparse
+        'flow_function' and in the per transition 'flow_sets'. Pairs with
+        value 0 are not stored. Changed values are recorded in the journal.
         """
-        msg = "Dumping Petri Net into file '{0}'".format(file_name)
-        LOG.info(msg)
-        out_dict = {}
-        out_dict["P"] = self._places
-        out_dict["T"] = self._transitions
-        out_dict["I"] = self._get_io_dict("I")
-        out_dict["O"] = self._get_io_dict("O")
-        with open(file_name, "w+") as out_file:
-          json.dump(out_dict, out_file)
-        msg = "Dumping completed"
-        LOG.info(msg)
+        key_pair = (place, transition)
+        old_value = flow_function.get(key_pair, 0)
+        if old_value != value:
+            function_type = "I" if flow_function is self._input else "O"
+            self._journal.append((function_type, place, transition,
+                                  old_value, value))
+        if value:
+            flow_function[key_pair] = value
+            flow_sets[transition][place] = value
+        else:
+            flow_function.pop(key_pair, None)
+            flow_sets[transition].pop(place, None)
+        self._flow_matrices = None
 
 
-    def _read_io_dict(self, function_type, used_dict):
+    def get_input_flow(self, place, transition):
         """
-        Read the proper dict from a loaded file and writes the proper I or O
-        function according to the key. It converts the key string into a
-        basestring place-transition pair.
+        Get the value of the input function I(place, transition). Pairs
+        without an arc have value 0.
         """
-        in_dict = {}
-        for key_str in used_dict.keys():
-            key = re.findall(IO_KEY_PATTERN, key_str)[0]
-            p = str(key[0])
-            t = str(key[1])
-            in_dict[(p, t)] = used_dict[key_str]
-        if function_type == "I":
-            self._input = in_dict
-        elif function_type == "O":
-            self._output = in_dict
-        else:
-            err_message = "Invalid function type: '{0}'".format(function_type)
+        return self._input.get((place, transition), 0)
+
+
+    def get_output_flow(self, place, transition):
+        """
+        Get the value of the output function O(place, transition). Pairs
+        without an arc have value 0.
+        """
+        return self._output.get((place, transition), 0)
+
+
+    def get_journal(self, start=0):
+        """
+        Get the changes of the net from the position 'start' of its journal.
+        Every change is a tuple ("P", place) or ("T", transition) for added
+        places and transitions, ("I", place, transition, old, new) or ("O",
+        place, transition, old, new) for flow values, or ("L", file_name)
+        when the net is loaded from a file.
+        """
+        return self._journal[start:]
+
+
+    def journal_size(self):
+        """ Get the number of changes recorded in the journal """
+        return len(self._journal)
+
+
+    def save_file(self, file_name, file_format="json"):
+        """
+        Dump the Petri Net model into a file with name 'file_name'. The
+        'file_format' is "json" or "binary" (see model_io).
+        """
+        if file_format not in model_io.FORMATS:
+            err_message = "Invalid file format: '{0}'".format(file_format)
             raise PetriNetException(err_message)
-        return in_dict
+        msg = "Dumping Petri Net into file '{0}'".format(file_name)
+        LOG.info(msg)
+        with open(file_name, "wb") as out_file:
+            if file_format == "json":
+                model_io.dump_json(self, out_file)
+            else:
+                model_io.dump_binary(self, out_file)
+        msg = "Dumping completed"
+        LOG.info(msg)
 
 
     def load_file(self, file_name):
         """
-        Load a Petri Net model dumped into a JSON file with name 'file_name'.
+        Load a Petri Net model dumped into a file with name 'file_name', in
+        any of the JSON formats or in the binary format. The arc lists of the
+        file are kept as they are loaded, the flow matrices are compiled from
+        them and the I and O functions are only built when they are used.
         """
         msg = "Loading Petri Net from file '{0}'".format(file_name)
         LOG.info(msg)
-        with open(file_name) as in_file:
-            in_dict = json.load(in_file)
-        self._places = in_dict["P"]
-        self._transitions = in_dict["T"]
-        self._input = self._read_io_dict("I", in_dict["I"])
-        self._output = self._read_io_dict("O", in_dict["O"])
+        (places, transitions, input_arcs,
+         output_arcs) = model_io.load_model(file_name)
+        self._arcs = (input_arcs, output_arcs)
+        self._places = list(places)
+        self._transitions = list(transitions)
+        self._place_index = dict((place, i)
+                                 for (i, place) in enumerate(self._places))
+        self._transition_index = dict((transition, i) for (i, transition)
+                                      in enumerate(self._transitions))
+        self._flow_matrices = None
+        self._journal.append(("L", file_name))
         msg = "Loading completed"
         LOG.info(msg)
 
 
+    def copy(self, removed=()):
+        """
+        Get a copy of the model without the transitions in 'removed'.
+        """
+        removed = set(removed)
+        net = PetriNet()
+        net.add_places(self._places)
+        net.add_transitions([transition for transition in self._transitions
+                             if transition not in removed])
+        net.set_arcs([(place, transition, value) for ((place, transition),
+                      value) in self._input.iteritems()
+                      if transition not in removed], "I")
+        net.set_arcs([(place, transition, value) for ((place, transition),
+                      value) in self._output.iteritems()
+                      if transition not in removed], "O")
+        return net
+
+
     def _fix_marking(self, m):
         """
         Fix 'm' to include the places not including on it with m(place) = 0.
@@ -251,61 +469,463 @@ class PetriNet(object):
         fail with a Petri Net Exception.
         """
         for place in m.keys():
-            if place not in self._places:
+            if place not in self._place_index:
                 err_message = "Invalid place in m: '{0}'".format(place)
                 raise PetriNetException(err_message)
         for place in self._places:
-            if place not in m.keys():
+            if place not in m:
                 m[place] = 0
         return m
 
 
-    def _get_succesors(self, m):
+    def _get_flow_matrices(self):
         """
-        Get succesor markings of m.
+        Compile the I and O functions into the pre, post and incidence
+        matrices of the net, with one row per transition and one column per
+        place. Every row is kept as a sparse list of (place index, value)
+        pairs, unless _use_dense_matrices chooses NumPy arrays. The
+        lists of transitions consuming from each place, and of transitions
+        without input places, are kept in '_consumers'. The result is cached
+        until the net is modified.
+        """
+        if self._flow_matrices is not None:
+            return self._flow_matrices
+        pre = []
+        post = []
+        incidence = []
+        consumers = [[] for place in self._places]
+        free = []
+        arcs = 0
+        for (pre_row, post_row) in self._get_flow_rows():
+            delta = dict(post_row)
+            for (i, value) in pre_row:
+                delta[i] = delta.get(i, 0) - value
+            for (i, _) in pre_row:
+                consumers[i].append(len(pre))
+            if not pre_row:
+                free.append(len(pre))
+            arcs += len(pre_row) + len(post_row)
+            pre.append(pre_row)
+            post.append(post_row)
+            incidence.append(sorted([(i, value) for (i, value)
+                                     in delta.iteritems() if value]))
+        if self._use_dense_matrices(arcs):
+            pre = self._get_dense_matrix(pre)
+            post = self._get_dense_matrix(post)
+            incidence = post - pre
+        self._flow_matrices = (pre, post, incidence)
+        self._consumers = (consumers, free)
+        LOG.info("Flow matrices compiled")
+        return self._flow_matrices
+
+
+    def _get_flow_rows(self):
+        """
+        Iterate the (pre row, post row) pairs of every transition, where each
+        row is a sorted list of (place index, value) pairs. The rows are read
+        from the arc lists of a loaded model when they are still kept.
+        """
+        if self._arcs is not None:
+            rows = []
+            for (offsets, places, values) in self._arcs:
+                rows.append([sorted(izip(places[offsets[j]:offsets[j + 1]],
+                                         values[offsets[j]:offsets[j + 1]]))
+                             for j in xrange(len(self._transitions))])
+            return izip(rows[0], rows[1])
+        place_index = self._place_index
+        return ((sorted([(place_index[place], value) for (place, value)
+                         in self._preset[transition].iteritems()]),
+                 sorted([(place_index[place], value) for (place, value)
+                         in self._postset[transition].iteritems()]))
+                for transition in self._transitions)
+
+
+    def _use_dense_matrices(self, arcs):
+        """
+        Check if the flow matrices of a net with 'arcs' input and output arcs
+        are compiled as dense NumPy arrays. The dense matrices are only faster
+        when NumPy is available, the net has at most DENSE_MATRIX_LIMIT
+        place-transition pairs and at least DENSE_MIN_DENSITY of them are
+        arcs, sparse rows are used otherwise.
+        """
+        size = len(self._transitions) * len(self._places)
+        if numpy is None or not size or size > DENSE_MATRIX_LIMIT:
+            return False
+        return arcs >= DENSE_MIN_DENSITY * size
+
+
+    def _get_dense_matrix(self, rows):
         """
+        Build a dense NumPy matrix (transitions x places) from sparse rows of
+        (place index, value) pairs.
+        """
+        shape = (len(self._transitions), len(self._places))
+        matrix = numpy.zeros(shape, dtype=numpy.int64)
+        for (t_index, row) in enumerate(rows):
+            for (i, value) in row:
+                matrix[t_index, i] = value
+        return matrix
+
+
+    def _get_succesors_batch(self, states):
+        """
+        Get the succesors of a batch of packed markings. Returns a list of
+        (state position, transition index, succesor) triples sorted by state
+        position and transition index, where each succesor is a packed
+        marking.
+        """
+        (pre, _, incidence) = self._get_flow_matrices()
         succ = []
-        for transition in self._transitions:
-            m_1 = {}
-            compatible = True
-            for place in self._places:
-                key_pair = (place, transition)
-                if m[place] < self._input[key_pair]:
-                    compatible = False
-                    break
-                i_flow = self._input[key_pair]
-                o_flow = self._output[key_pair]
-                m_1[place] = m[place] - i_flow + o_flow
-            if compatible != False:
-                succ.append(m_1)
+        if not states:
+            return succ
+        if not isinstance(pre, list):
+            size = max(1, len(self._transitions) * len(self._places))
+            chunk = max(1, DENSE_MATRIX_LIMIT // size)
+            for start in xrange(0, len(states), chunk):
+                batch = states[start:start + chunk]
+                markings = numpy.array(batch, dtype=numpy.int64)
+                markings = markings.reshape((len(batch), len(self._places)))
+                enabled = (markings[:, None, :] >= pre[None, :, :]).all(axis=2)
+                (rows, columns) = numpy.nonzero(enabled)
+                targets = (markings[rows] + incidence[columns]).tolist()
+                for (row, column, target) in zip(rows.tolist(),
+                                                 columns.tolist(), targets):
+                    succ.append((start + row, column, tuple(target)))
+            return succ
+        (consumers, free) = self._consumers
+        for (row, state) in enumerate(states):
+            candidates = set(free)
+            for (i, tokens) in enumerate(state):
+                if tokens:
+                    candidates.update(consumers[i])
+            for t_index in sorted(candidates):
+                enabled = True
+                for (i, value) in pre[t_index]:
+                    if state[i] < value:
+                        enabled = False
+                        break
+                if not enabled:
+                    continue
+                target = list(state)
+                for (i, value) in incidence[t_index]:
+                    target[i] += value
+                succ.append((row, t_index, tuple(target)))
         return succ
 
 
-    def reachability_set(self, m_0):
+    def _get_succesors(self, m):
+        """
+        Get succesor markings of m.
+        """
+        state = pack_marking(self._places, m)
+        return [unpack_marking(self._places, target)
+                for (_, _, target) in self._get_succesors_batch([state])]
+
+
+    def reachability_set(self, m_0, indexed=False, reduction=None,
+                         symmetry=None, workers=1):
+        """
+        Get the reachability set of the model for marking 'm'. By default the
+        result is a dictionary from each marking (as string) to the list of
+        its successor markings. If 'indexed' is True, it returns the pair
+        (states, edges) computed by the exploration engine instead, where
+        each state is a packed marking in the order of the P set and edges
+        are (source id, transition index, target id) triples. With
+        'reduction' "stubborn" only a deadlock preserving subset of the
+        markings is explored, and with a 'symmetry' only a representative of
+        every orbit is explored. With more than one worker, the markings are
+        explored by 'workers' processes (see reachability_graph).
+        """
+        m_0 = self._fix_marking(m_0)
+        graph = self.reachability_graph(m_0, reduction, symmetry=symmetry,
+                                        workers=workers)
+        if indexed:
+            return (graph.states(), graph.edges())
+        markings = [m_0]
+        for state_id in xrange(1, graph.num_states()):
+            markings.append(graph.marking_dict(state_id))
+        keys = [str(m) for m in markings]
+        reach_graph = {}
+        for key in keys:
+            reach_graph[key] = []
+        for (source, _, target) in graph.edges():
+            reach_graph[keys[source]].append(markings[target])
+        return reach_graph
+
+
+    def reachability_graph(self, m_0, reduction=None, visible=None,
+                           symmetry=None, bit_packed=False, workers=1):
         """
-        Get the reachability set of the model for marking 'm'.
+        Get the ReachabilityGraph of the model for marking 'm_0', with the
+        transition that produces every edge. With 'reduction' "stubborn" the
+        graph is reduced with stubborn sets, preserving deadlocks and, if the
+        'visible' places are given, the CTL formulae over them without the
+        next operator. The reduction ratio is in the graph statistics. With
+        a 'symmetry' (see get_symmetry) the states are the representatives of
+        the orbits of markings, and the graph statistics include the number
+        of orbits and of markings. If 'bit_packed' is True and every place
+        has a structural bound, the markings are stored with the bits needed
+        by those bounds. If 'workers' is more than one, the markings are
+        partitioned among that many processes exploring them in parallel,
+        giving the same graph (see parallel); reductions are not available
+        in this mode.
         """
         m_0 = self._fix_marking(m_0)
         msg = "Getting reachability set from '{0}'".format(m_0)
         LOG.info(msg)
-        reach_graph = {str(m_0): []}
-        open_set = [m_0]
-        closed_set = []
-        while len(open_set):
-            m = open_set.pop(0)
-            if m in closed_set:
-                continue
-            m_key = str(m)
-            msg = "Adding new marking to reachability set: '{0}'".format(m)
-            LOG.info(msg)
-            reach_graph[m_key] = self._get_succesors(m)
-            open_set.extend(reach_graph[m_key])
-            closed_set.append(m)
+        packing = None
+        if bit_packed:
+            packing = self._get_bit_packing(m_0)
+        if workers > 1:
+            if reduction is not None or symmetry is not None:
+                err_message = "Reductions need a single worker"
+                raise PetriNetException(err_message)
+            graph = explore_parallel(self, m_0, workers, packing)
+        else:
+            graph = explore(self, m_0, reduction, visible, symmetry, packing)
         msg = "Reachability set calculated from: '{0}'".format(m_0)
         LOG.info(msg)
-        msg = "Reachability set size is: '{0}'".format(len(reach_graph))
+        msg = "Reachability set size is: '{0}'".format(graph.num_states())
         LOG.info(msg)
-        return reach_graph
+        return graph
+
+
+    def distributed_reachability_graph(self, m_0, addresses=None,
+                                       nodes=DEFAULT_NODES,
+                                       bit_packed=False):
+        """
+        Get the ReachabilityGraph of the model for marking 'm_0' exploring it
+        with the nodes listening on the (host, port) 'addresses', started
+        with distributed.run_node over this model. If 'addresses' is None,
+        'nodes' local processes are used. Every node expands the markings of
+        its shard, and the shards are merged into the graph given by
+        reachability_graph.
+        """
+        m_0 = self._fix_marking(m_0)
+        msg = "Getting distributed reachability set from '{0}'".format(m_0)
+        LOG.info(msg)
+        packing = None
+        if bit_packed:
+            packing = self._get_bit_packing(m_0)
+        graph = explore_distributed(self, m_0, addresses, nodes, packing)
+        msg = "Reachability set size is: '{0}'".format(graph.num_states())
+        LOG.info(msg)
+        return graph
+
+
+    def stored_reachability_graph(self, m_0, directory, bloom_bits=0,
+                                  max_states=None):
+        """
+        Get the ReachabilityGraph of the model for marking 'm_0' exploring
+        it into an on-disk state store in 'directory', for state spaces
+        larger than the memory. If 'bloom_bits' is not 0, a Bloom filter of
+        that size avoids most index lookups of new markings. The graph can
+        be opened again with open_reachability_graph.
+        """
+        m_0 = self._fix_marking(m_0)
+        msg = "Storing reachability set from '{0}' in '{1}'".format(
+            m_0, directory)
+        LOG.info(msg)
+        graph = explore_to_store(self, m_0, directory, bloom_bits, max_states)
+        msg = "Reachability set size is: '{0}'".format(graph.num_states())
+        LOG.info(msg)
+        return graph
+
+
+    def open_reachability_graph(self, directory):
+        """
+        Open the ReachabilityGraph stored in 'directory' by
+        stored_reachability_graph, without exploring the model again.
+        """
+        graph = StoredGraph(directory)
+        if (graph.get_places() != self._places or
+                graph.get_transitions() != self._transitions):
+            graph.close()
+            err_message = "State store in '{0}' is of another net".format(
+                directory)
+            raise PetriNetException(err_message)
+        return graph
+
+
+    def _get_bit_packing(self, m_0):
+        """
+        Get the BitPacking given by the structural bounds from 'm_0', or None
+        if a place is not structurally bounded.
+        """
+        bounds = self.structural_bounds(m_0)
+        if None in bounds.values():
+            LOG.info("Places without structural bound, bit packing not used")
+            return None
+        return BitPacking([bounds[place] for place in self._places])
+
+
+    def p_invariants(self):
+        """
+        Get the minimal support P-invariants of the model, as dictionaries
+        from place to weight. The weighted tokens of every invariant are the
+        same in all the reachable markings.
+        """
+        return structural.p_invariants(self)
+
+
+    def t_invariants(self):
+        """
+        Get the minimal support T-invariants of the model, as dictionaries
+        from transition to firings. Firing them reproduces the marking.
+        """
+        return structural.t_invariants(self)
+
+
+    def minimal_siphons(self):
+        """ Get the minimal siphons of the model as lists of places """
+        return structural.minimal_siphons(self)
+
+
+    def minimal_traps(self):
+        """ Get the minimal traps of the model as lists of places """
+        return structural.minimal_traps(self)
+
+
+    def structural_bounds(self, m_0):
+        """
+        Get the bound of every place from marking 'm_0' given by the
+        P-invariants, as a dictionary. Places not covered by an invariant
+        have bound None.
+        """
+        m_0 = self._fix_marking(m_0)
+        bounds = structural.structural_bounds(self, m_0)
+        LOG.info("Structural bounds: '{0}'".format(bounds))
+        return bounds
+
+
+    def repair(self, m_0, formula, max_cost=3, max_repairs=1, costs=None):
+        """
+        Search the cheapest edits of the model and of 'm_0' making the CTL
+        'formula' hold: arc weight changes, transition removals and initial
+        marking changes, with the 'costs' of the ModelRepair class and a
+        total cost of at most 'max_cost'. Returns up to 'max_repairs' Repair
+        objects of minimal cost, whose apply method builds the repaired
+        model and marking.
+        """
+        search = ModelRepair(self, m_0, formula, max_cost, costs)
+        repairs = search.search(max_repairs)
+        LOG.info("Repairs found: {0}".format(repairs))
+        return repairs
+
+
+    def verification_session(self, m_0):
+        """
+        Get a VerificationSession of the model from the marking 'm_0', which
+        keeps its reachability graph and labels up to date with the changes
+        of the net.
+        """
+        return VerificationSession(self, m_0)
+
+
+    def get_symmetry(self, groups=None):
+        """
+        Get the Symmetry of the model for the declared 'groups' of
+        interchangeable copies, where each copy is a pair (places,
+        transitions) of lists in corresponding order. If no groups are given
+        they are detected from the isomorphic connected components.
+        """
+        if groups is None:
+            return detect_symmetry(self)
+        return Symmetry(self, groups)
+
+
+    def coverability_graph(self, m_0, max_states=None):
+        """
+        Get the Karp-Miller CoverabilityGraph of the model for marking 'm_0',
+        which is finite even if the net is unbounded. Places growing without
+        limit hold OMEGA. It fails if the graph exceeds 'max_states' states.
+        """
+        m_0 = self._fix_marking(m_0)
+        LOG.info("Getting coverability graph from '{0}'".format(m_0))
+        return coverability(self, m_0, max_states=max_states)
+
+
+    def place_bounds(self, m_0, max_states=None):
+        """
+        Get the bound of every place from marking 'm_0' as a dictionary,
+        OMEGA for the unbounded places.
+        """
+        bounds = self.coverability_graph(m_0, max_states).place_bounds()
+        LOG.info("Place bounds: '{0}'".format(bounds))
+        return bounds
+
+
+    def is_bounded(self, m_0, max_states=None):
+        """
+        Check if every place is bounded from marking 'm_0'. The coverability
+        graph is only built until the first OMEGA appears.
+        """
+        m_0 = self._fix_marking(m_0)
+        graph = coverability(self, m_0, True, max_states)
+        result = not graph.unbounded_places()
+        LOG.info("Model bounded: \"{0}\"".format(result))
+        return result
+
+
+    def symbolic_state_space(self, m_0, bound=None, ordering="structural"):
+        """
+        Get the SymbolicStateSpace of the model for marking 'm_0', with the
+        reachable markings as a BDD where every place holds at most 'bound'
+        tokens. The variable 'ordering' is "structural" or "net".
+        """
+        space = SymbolicStateSpace(self, m_0, bound, ordering)
+        LOG.info("Symbolic state space: {0}".format(space.statistics()))
+        return space
+
+
+    def iter_reachable(self, m_0, order="bfs", edges=False, max_states=None,
+                       max_depth=None):
+        """
+        Generator of the reachable markings from 'm_0', yielded as soon as
+        they are explored in "bfs" or "dfs" 'order'. If 'edges' is True it
+        yields (marking, transition, succesor) triples instead. The
+        exploration can be limited to 'max_states' markings and 'max_depth'
+        transitions from 'm_0', and it stops when the caller stops iterating.
+        """
+        m_0 = self._fix_marking(m_0)
+        for (state, succ) in iter_expansions(self, m_0, order, max_states,
+                                             max_depth):
+            m = unpack_marking(self._places, state)
+            if not edges:
+                yield m
+                continue
+            for (t_index, target) in succ or []:
+                m_1 = unpack_marking(self._places, target)
+                yield (m, self._transitions[t_index], m_1)
+
+
+    def find_marking(self, m_0, predicate, order="bfs", max_states=None,
+                     max_depth=None):
+        """
+        Get the first reachable marking from 'm_0' for which 'predicate'
+        returns True, or None if there is no such marking within the limits.
+        """
+        for m in self.iter_reachable(m_0, order, False, max_states, max_depth):
+            if predicate(m):
+                LOG.info("Marking found: '{0}'".format(m))
+                return m
+        return None
+
+
+    def find_deadlock(self, m_0, order="bfs", max_states=None,
+                      max_depth=None):
+        """
+        Get the first reachable marking from 'm_0' without succesors, or None
+        if there is no such marking within the limits.
+        """
+        m_0 = self._fix_marking(m_0)
+        for (state, succ) in iter_expansions(self, m_0, order, max_states,
+                                             max_depth):
+            if succ == []:
+                m = unpack_marking(self._places, state)
+                LOG.info("Deadlock found: '{0}'".format(m))
+                return m
+        return None
 
 
     def _get_place_list(self):
@@ -339,17 +959,12 @@ class PetriNet(object):
         return out_string
 
 
-    def _get_lola_flow(self, flow_function, transition):
+    def _get_lola_flow(self, flow_sets, transition):
         """ Get the Input or Output flow of a transition """
-        initial_element = True
-        for place in self._places:
-            value = flow_function[(place, transition)]
-            if initial_element:
-                out_string = MARKING_PAIR.format(place, value)
-            else:
-                out_string += ", " + MARKING_PAIR.format(place, value)
-            initial_element = False
-        return out_string
+        arcs = flow_sets[transition]
+        places = sorted(arcs.keys(), key=self._place_index.get)
+        pairs = [MARKING_PAIR.format(place, arcs[place]) for place in places]
+        return ", ".join(pairs)
 
 
     def _get_transition_list(self):
@@ -358,8 +973,8 @@ class PetriNet(object):
         """
         out_string = ""
         for transition in self._transitions:
-            consumers = self._get_lola_flow(self._input, transition)
-            producers = self._get_lola_flow(self._output, transition)
+            consumers = self._get_lola_flow(self._preset, transition)
+            producers = self._get_lola_flow(self._postset, transition)
             out_string += TRANSITION_TEMPLATE.format(transition, consumers, producers)
         return out_string
 
@@ -383,38 +998,274 @@ class PetriNet(object):
         return lola_file
 
 
-    def _create_lola_file(self, m_0):
+    def _create_lola_file(self, lola_model):
         """
-        Create a LoLA file of the model.
+        Create a LoLA file with the model exported in 'lola_model'. Every file
+        gets a unique name, so concurrent checks do not overwrite each other.
         """
         LOG.info("Creating LoLA temporal file")
-        lola_file_name = "__tmp_lola_model_.lola"
-        file_object = open(lola_file_name, "wb")
-        file_object.write(self.export_lola(m_0));
+        (file_descriptor, lola_file_name) = tempfile.mkstemp(
+            prefix="__tmp_lola_model_", suffix=".lola")
+        file_object = os.fdopen(file_descriptor, "wb")
+        file_object.write(lola_model);
         file_object.close()
-        LOG.info("LoLA temporal file created")
+        LOG.info("LoLA temporal file created: '{0}'".format(lola_file_name))
         return lola_file_name
 
 
-    def _run_lola(self, lola_file_name, formula):
+    def _get_lola_command(self, lola_file_name, formula, path=False):
         """
-        Run LoLA for a certain file and formula
+        Get the command to run LoLA for a certain file and formula, printing
+        the witness path if 'path' is True.
         """
-        LOG.info("Running LoLA in temporal file for formula:")
+        LOG.info("LoLA command in temporal file for formula:")
         LOG.info("'{0}'".format(formula))
         command = ["lola", lola_file_name, "--formula={0}".format(formula)]
-        (ret, _, stderr) = run(command)
-        return check_result(stderr)
+        if path:
+            command.append("--path")
+        return command
+
+
+    def _lola_checking(self, m_0, formulas, use_cache, workers=1,
+                       timeout=None, witness=False):
+        """
+        Check every formula in 'formulas' with LoLA for the marking 'm_0',
+        running at most 'workers' LoLA processes at once, each one limited to
+        'timeout' seconds. If 'use_cache' is True, the results are looked up
+        first in the persistent result cache and the LoLA file is only
+        created if some formula is not there. With 'witness' True LoLA
+        prints the path of every result, and as the cache keeps no paths it
+        is only updated. Returns a list with a (CheckResult, seconds) pair
+        per formula, where the result is None if LoLA timed out and the
+        seconds are counted until the result was available.
+        """
+        start = time.time()
+        lola_model = self.export_lola(m_0)
+        lola_formulas = [formula.print_lola() for formula in formulas]
+        results = [None] * len(lola_formulas)
+        if use_cache:
+            cache = get_result_cache()
+            version = get_lola_version()
+            keys = [get_key(lola_model, lola_formula, version)
+                    for lola_formula in lola_formulas]
+            for (i, key) in enumerate(keys):
+                result = None
+                if not witness:
+                    result = cache.get(key)
+                if result is not None:
+                    results[i] = (CheckResult(result, formulas[i]),
+                                  time.time() - start)
+        pending = [i for (i, result) in enumerate(results) if result is None]
+        if not pending:
+            return results
+        lola_file_name = self._create_lola_file(lola_model)
+        try:
+            commands = [self._get_lola_command(lola_file_name,
+                                               lola_formulas[i], witness)
+                        for i in pending]
+            pool = RunnerPool(workers, timeout)
+            for (j, (ret, stdout, stderr)) in pool.run_many(commands):
+                i = pending[j]
+                result = None
+                if ret is not None:
+                    result = self._get_lola_result(m_0, formulas[i], stdout,
+                                                   stderr, witness)
+                    if use_cache:
+                        cache.put(keys[i], bool(result))
+                LOG.info("Model Checking result: \"{0}\"".format(result))
+                results[i] = (result, time.time() - start)
+        finally:
+            os.remove(lola_file_name)
+            LOG.info("Removing LoLA temporal file")
+        return results
+
+
+    def _get_lola_result(self, m_0, formula, stdout, stderr, witness):
+        """
+        Get the CheckResult of 'formula' from the output of LoLA, with the
+        path it printed if 'witness' is True.
+        """
+        value = check_result(stderr)
+        if not witness or not has_lola_path(stderr):
+            return CheckResult(value, formula)
+        path = lola_path(self, m_0, stdout)
+        if path is None:
+            return CheckResult(value, formula)
+        return CheckResult(value, formula, path[0], path[1], True)
+
+
+    def _get_model_checker(self, m_0, formulas, reduction):
+        """
+        Get the native ModelChecker for the marking 'm_0'. With 'reduction'
+        "stubborn" the graph is reduced keeping the places of 'formulas'
+        visible, unless a formula uses the next operator.
+        """
+        if reduction is None:
+            return ModelChecker(self, m_0)
+        scanner = FormulaScanner()
+        for formula in formulas:
+            scanner.scan(formula)
+        if scanner.uses_next:
+            LOG.info("Next operator in formulae, reduction not applied")
+            return ModelChecker(self, m_0)
+        graph = self.reachability_graph(m_0, reduction, scanner.places)
+        return ModelChecker(self, graph=graph)
 
 
-    def model_checking(self, m_0, formula):
+    def model_checking(self, m_0, formula, backend="lola", use_cache=True,
+                       reduction=None, witness=False, shortest=False,
+                       bound=None):
         """
         Perform model checking of the petri net for a certain marking and
-        formula using lola.
+        formula. The 'backend' can be "native", to label the reachability
+        graph in process, "symbolic", to compute the fixpoints over BDDs (see
+        symbolic_state_space), or "lola" (the default) to run the external
+        LoLA tool. LoLA results are kept in a persistent cache unless
+        'use_cache' is False.
+        The native backend reduces the graph with stubborn sets if
+        'reduction' is "stubborn". The symbolic backend encodes at most
+        'bound' tokens per place; by default the bound is computed from the
+        P-invariants or the coverability graph (see _get_symbolic_bound).
+
+        Returns a CheckResult, which is None if LoLA timed out. If 'witness'
+        is True, the native and LoLA results carry the witness path (or the
+        counterexample path if the formula does not hold); native paths use
+        shortest until paths if 'shortest' is True.
         """
-        lola_file_name = self._create_lola_file(m_0)
-        result = self._run_lola(lola_file_name, formula.print_lola())
-        LOG.info("Model Checking result: \"{0}\"".format(result))
-        os.remove(lola_file_name)
-        LOG.info("Removing LoLA temporal file")
-        return result
+        if backend not in BACKENDS:
+            err_message = "Invalid model checking backend: '{0}'".format(
+                backend)
+            raise PetriNetException(err_message)
+        if backend == "native":
+            checker = self._get_model_checker(m_0, [formula], reduction)
+            return self._get_native_result(checker, formula, witness,
+                                           shortest)
+        if backend == "symbolic":
+            checker = SymbolicChecker(self, m_0,
+                                      self._get_symbolic_bound(m_0, bound))
+            return CheckResult(checker.check(formula), formula)
+        return self._lola_checking(m_0, [formula], use_cache,
+                                   witness=witness)[0][0]
+
+
+    def _get_symbolic_bound(self, m_0, bound=None):
+        """
+        Get the place bound for the symbolic backend from 'm_0': 'bound' if
+        it is given, otherwise the largest structural bound or, if a place is
+        not covered by a P-invariant, the largest place bound given by the
+        coverability graph. Raise an exception if the model is unbounded.
+        """
+        if bound is not None:
+            return bound
+        bounds = self.structural_bounds(m_0)
+        if None in bounds.values():
+            bounds = self.place_bounds(m_0)
+            if OMEGA in bounds.values():
+                err_message = "Unbounded model, symbolic backend needs a bound"
+                raise PetriNetException(err_message)
+        return max([1] + bounds.values())
+
+
+    def _get_native_result(self, checker, formula, witness, shortest):
+        """ Get the CheckResult of 'formula' from a native 'checker' """
+        if witness:
+            return checker.result(formula, shortest)
+        return CheckResult(checker.check(formula), formula)
+
+
+    def model_checking_many(self, m_0, formulas, backend="lola",
+                            use_cache=True, workers=1, timeout=None,
+                            reduction=None, witness=False, shortest=False,
+                            bound=None):
+        """
+        Perform model checking of the petri net for a certain marking and
+        every formula in 'formulas'. The model is built only once (the
+        reachability graph for the "native" backend, the BDD of the reachable
+        markings for the "symbolic" backend, the LoLA file for the default
+        "lola" backend) and, with the native and symbolic backends, subformulas
+        shared by several formulas are labeled only once. LoLA results are
+        kept in a persistent cache unless 'use_cache' is False, and up to
+        'workers' LoLA processes run in parallel, each one limited to
+        'timeout' seconds. Returns a list with a (CheckResult, seconds) pair
+        per formula; LoLA results are None when the process timed out. The
+        native backend reduces the graph with stubborn sets if 'reduction' is
+        "stubborn". The 'witness', 'shortest' and 'bound' options are the
+        ones of model_checking.
+        """
+        if backend not in BACKENDS:
+            err_message = "Invalid model checking backend: '{0}'".format(
+                backend)
+            raise PetriNetException(err_message)
+        formulas = list(formulas)
+        LOG.info("Model checking {0} formulas".format(len(formulas)))
+        results = []
+        if backend in ["native", "symbolic"]:
+            if backend == "native":
+                checker = self._get_model_checker(m_0, formulas, reduction)
+            else:
+                checker = SymbolicChecker(
+                    self, m_0, self._get_symbolic_bound(m_0, bound))
+            for formula in formulas:
+                start = time.time()
+                if backend == "native":
+                    result = self._get_native_result(checker, formula,
+                                                     witness, shortest)
+                else:
+                    result = CheckResult(checker.check(formula), formula)
+                results.append((result, time.time() - start))
+            return results
+        return self._lola_checking(m_0, formulas, use_cache, workers, timeout,
+                                   witness)
+
+
+    def model_checking_async(self, m_0, formula, runner, use_cache=True,
+                             timeout=None):
+        """
+        Perform model checking of the petri net for a certain marking and
+        formula with LoLA, without blocking, in the AsyncRunner 'runner'.
+        Returns a Future with the CheckResult, available once the runner
+        event loop completes the LoLA process (or right away if the result is
+        in the persistent cache). The result is None if LoLA timed out. LoLA
+        output is scanned as it is streamed instead of being buffered.
+        """
+        future = Future()
+        lola_model = self.export_lola(m_0)
+        lola_formula = formula.print_lola()
+        if use_cache:
+            cache = get_result_cache()
+            key = get_key(lola_model, lola_formula, get_lola_version())
+            result = cache.get(key)
+            if result is not None:
+                future.set_result(CheckResult(result, formula))
+                return future
+        lola_file_name = self._create_lola_file(lola_model)
+        state = {"partial": "", "result": True}
+
+        def on_output(stream, data):
+            if stream != "stderr":
+                return
+            lines = (state["partial"] + data).split("\n")
+            state["partial"] = lines.pop()
+            for line in lines:
+                if line.rstrip("\r") == NEGATIVE_RESULT:
+                    state["result"] = False
+
+        def on_done(job):
+            os.remove(lola_file_name)
+            LOG.info("Removing LoLA temporal file")
+            if job.exception() is not None:
+                future.set_exception(job.exception())
+                return
+            on_output("stderr", "\n")
+            result = None
+            if job.result()[0] is not None:
+                result = CheckResult(state["result"], formula)
+                if use_cache:
+                    cache.put(key, state["result"])
+            LOG.info("Model Checking result: \"{0}\"".format(result))
+            future.set_result(result)
+
+        command = self._get_lola_command(lola_file_name, lola_formula)
+        job = runner.submit(command, on_output, timeout)
+        job.add_done_callback(on_done)
+        return future
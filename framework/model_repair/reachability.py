@@ -0,0 +1,815 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the state space exploration engine used by the Petri
+  Net models. Markings are encoded as fixed-width tuples following the order
+  of the P set, visited markings are indexed in a hash table and the frontier
+  is kept in a double ended queue, so every marking is expanded only once.
+
+  The result of the exploration is a ReachabilityGraph, which keeps the
+  markings packed in a single array (one fixed-width row per state id) and
+  the labeled edges in compressed sparse row (CSR) arrays.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+  18-10-2026  ulisesma   Indexed exploration of tuple encoded markings with a
+                         visited index and a deque frontier
+  18-10-2026  ulisesma   Frontier expanded in batches with the flow matrices
+  18-10-2026  ulisesma   Streaming exploration with limits
+  18-10-2026  ulisesma   Labeled reachability graph with compact storage
+  18-10-2026  ulisesma   Partial order reduction with stubborn sets
+  18-10-2026  ulisesma   Symmetry reduction with orbit representatives
+  18-10-2026  ulisesma   Bit packed marking table for bounded places
+  18-10-2026  ulisesma   Exploration reusing the graph of a previous net
+  18-10-2026  ulisesma   Firing of single transitions from their flows
+  18-10-2026  ulisesma   Parent of every state kept for witness paths
+  18-10-2026  ulisesma   Graphs updated in place after flow changes
+  18-10-2026  ulisesma   Breadth first renumbering of merged graphs
+
+"""
+
+from array import array
+from collections import deque
+
+from error_handling import PetriNetException
+from logger import LOG
+from reduction import REDUCTIONS, StubbornSets
+
+BATCH_SIZE = 512
+ORDERS = ["bfs", "dfs"]
+MARKING_TYPECODES = ["B", "H", "i", "l"]
+WORD_TYPECODE = "l"
+WORD_BITS = 8 * array(WORD_TYPECODE).itemsize - 1
+
+
+def pack_marking(places, m):
+    """
+    Encode the marking dictionary 'm' as a tuple following the order of
+    'places'. The marking must include every place.
+    """
+    return tuple([m[place] for place in places])
+
+
+def unpack_marking(places, state):
+    """
+    Decode the packed marking 'state' into a marking dictionary.
+    """
+    return dict(zip(places, state))
+
+
+class BitPacking(object):
+    """
+    Class to encode packed markings as rows of words, where every place gets
+    the bits needed by its bound (no bits for places bounded by 0). Safe
+    places take a single bit.
+    """
+
+    def __init__(self, bounds):
+        self._fields = []
+        word = 0
+        shift = 0
+        for bound in bounds:
+            bits = bound.bit_length()
+            if shift + bits > WORD_BITS:
+                word += 1
+                shift = 0
+            self._fields.append((word, shift, (1 << bits) - 1, bound))
+            shift += bits
+        self.width = word + 1
+
+
+    def encode(self, state):
+        """
+        Get the row of words of the packed marking 'state', or None if a
+        place exceeds its bound.
+        """
+        row = [0] * self.width
+        for ((word, shift, _, bound), value) in zip(self._fields, state):
+            if value > bound:
+                return None
+            row[word] |= value << shift
+        return row
+
+
+    def decode(self, row):
+        """ Get the packed marking of a row of words """
+        return tuple([(row[word] >> shift) & mask
+                      for (word, shift, mask, _) in self._fields])
+
+
+    def column(self, words, place_index):
+        """
+        Get the tokens of the place 'place_index' from the 'words' holding
+        it in every row.
+        """
+        (_, shift, mask, _) = self._fields[place_index]
+        return [(value >> shift) & mask for value in words]
+
+
+    def word(self, place_index):
+        """ Get the position in the row of the word holding a place """
+        return self._fields[place_index][0]
+
+
+class ReachabilityGraph(object):
+    """
+    Class to represent the reachability graph of a Petri Net. States are
+    identified by integers, the initial marking is the state 0. The packed
+    markings are interned in an array with one row of '_width' tokens per
+    state, using the smallest integer type fitting every token count. The
+    succesors of state 'i' are the positions from '_offsets[i]' to
+    '_offsets[i + 1]' of the '_targets' and '_labels' (transition indexes)
+    arrays. Reverse edges and the marking index are computed on demand. The
+    parent of every state, the first state with an edge to it, is kept in
+    '_parents', so in breadth first graphs it gives shortest paths from the
+    initial marking.
+
+    If a BitPacking 'packing' is given, the rows of the marking table are
+    its words instead of the tokens of every place.
+    """
+
+    def __init__(self, places, transitions, packing=None):
+        self._places = list(places)
+        self._transitions = list(transitions)
+        self._packing = packing
+        if packing is None:
+            self._width = len(self._places)
+            self._markings = array(MARKING_TYPECODES[0])
+        else:
+            self._width = packing.width
+            self._markings = array(WORD_TYPECODE)
+        self._size = 0
+        self._offsets = array("l", [0])
+        self._targets = array("i")
+        self._labels = array("i")
+        self._parents = array("i")
+        self._reverse = None
+        self._index = None
+        self._statistics = {}
+
+
+    def _intern(self, state):
+        """
+        Get the id of the packed marking 'state', adding it to the marking
+        table if it is not there. Returns an (id, new) pair.
+        """
+        if self._index is None:
+            self._build_index()
+        row = state
+        if self._packing is not None:
+            row = self._packing.encode(state)
+            if row is None:
+                err_message = "Marking exceeds packing bounds: '{0}'".format(
+                    state)
+                raise PetriNetException(err_message)
+        try:
+            key = array(self._markings.typecode, row).tostring()
+        except OverflowError:
+            self._widen(max(row))
+            key = array(self._markings.typecode, row).tostring()
+        state_id = self._index.get(key)
+        if state_id is not None:
+            return (state_id, False)
+        state_id = self._size
+        self._index[key] = state_id
+        self._markings.extend(row)
+        self._parents.append(-1)
+        self._size += 1
+        return (state_id, True)
+
+
+    def _widen(self, value):
+        """
+        Move the marking table to the smallest integer type fitting 'value'.
+        """
+        typecode = self._markings.typecode
+        position = MARKING_TYPECODES.index(typecode)
+        for typecode in MARKING_TYPECODES[position + 1:]:
+            try:
+                array(typecode, [value])
+            except OverflowError:
+                continue
+            break
+        LOG.info("Marking table widened to type '{0}'".format(typecode))
+        self._markings = array(typecode, self._markings)
+        self._index = None
+        self._build_index()
+
+
+    def _build_index(self):
+        """ Build the index from packed marking to state id """
+        self._index = {}
+        row_size = self._width * self._markings.itemsize
+        table = self._markings.tostring()
+        for state_id in xrange(self._size):
+            start = state_id * row_size
+            self._index[table[start:start + row_size]] = state_id
+
+
+    def _add_succesors(self, succ):
+        """
+        Add the (transition index, target id) edges of the next state without
+        succesors. States must get their succesors in id order.
+        """
+        source = len(self._offsets) - 1
+        for (t_index, target) in succ:
+            self._labels.append(t_index)
+            self._targets.append(target)
+            if self._parents[target] < 0 and target:
+                self._parents[target] = source
+        self._offsets.append(len(self._targets))
+        self._reverse = None
+
+
+    def _replace_succesors(self, rows):
+        """
+        Replace the edges of the states in 'rows', a dictionary from state id
+        to its new list of (transition index, target id) edges. Only states
+        which already have succesors can be replaced.
+        """
+        offsets = array("l", [0])
+        targets = array("i")
+        labels = array("i")
+        position = 0
+        shift = 0
+        for state_id in sorted(rows):
+            start = self._offsets[position]
+            end = self._offsets[state_id]
+            targets.extend(self._targets[start:end])
+            labels.extend(self._labels[start:end])
+            offsets.extend([offset + shift for offset
+                            in self._offsets[position + 1:state_id + 1]])
+            for (t_index, target) in rows[state_id]:
+                labels.append(t_index)
+                targets.append(target)
+                if self._parents[target] < 0 and target:
+                    self._parents[target] = state_id
+            shift += len(rows[state_id]) - (self._offsets[state_id + 1] -
+                                            self._offsets[state_id])
+            offsets.append(len(targets))
+            position = state_id + 1
+        targets.extend(self._targets[self._offsets[position]:])
+        labels.extend(self._labels[self._offsets[position]:])
+        offsets.extend([offset + shift for offset
+                        in self._offsets[position + 1:]])
+        self._offsets = offsets
+        self._targets = targets
+        self._labels = labels
+        self._reverse = None
+
+
+    def _drop_unreachable(self):
+        """
+        Set the parents of the states in breadth first order from the state 0
+        and drop the states which are no longer reachable from it. Returns
+        the list mapping every previous state id to its new id, or to -1 if
+        the state was dropped, or None if every state is still reachable.
+        """
+        parents = array("i", [-1]) * self._size
+        visited = bytearray(self._size)
+        visited[0] = 1
+        reached = 1
+        frontier = deque([0])
+        while frontier:
+            source = frontier.popleft()
+            for target in self.succesor_ids(source):
+                if not visited[target]:
+                    visited[target] = 1
+                    parents[target] = source
+                    reached += 1
+                    frontier.append(target)
+        if reached == self._size:
+            self._parents = parents
+            return None
+        ids = array("i", [-1]) * self._size
+        kept = [state_id for state_id in xrange(self._size)
+                if visited[state_id]]
+        for (new_id, state_id) in enumerate(kept):
+            ids[state_id] = new_id
+        self._renumber(kept, ids)
+        self._parents = array("i", [ids[parents[state_id]] if state_id else -1
+                                    for state_id in kept])
+        LOG.info("{0} unreachable states dropped".format(
+            len(ids) - self._size))
+        return ids
+
+
+    def _sort_breadth_first(self):
+        """
+        Renumber the states in the order in which a breadth first exploration
+        from the state 0 discovers them, following the succesors of every
+        state in order, and set their parents. It gives the numbering of
+        explore for graphs built in another order. Every state must be
+        reachable from the state 0.
+        """
+        ids = array("i", [-1]) * self._size
+        ids[0] = 0
+        order = array("i", [0])
+        parents = array("i", [-1])
+        expanded = 0
+        while expanded < len(order):
+            source = order[expanded]
+            for target in self.succesor_ids(source):
+                if ids[target] < 0:
+                    ids[target] = len(order)
+                    order.append(target)
+                    parents.append(expanded)
+            expanded += 1
+        if len(order) != self._size:
+            err_message = "{0} states unreachable from the state 0".format(
+                self._size - len(order))
+            raise PetriNetException(err_message)
+        self._renumber(order, ids)
+        self._parents = parents
+
+
+    def _renumber(self, kept, ids):
+        """
+        Keep the states 'kept', in that order, moving the edges to the new
+        ids given by 'ids' for every previous state id. Parents are left to
+        the caller.
+        """
+        markings = array(self._markings.typecode)
+        offsets = array("l", [0])
+        targets = array("i")
+        labels = array("i")
+        for state_id in kept:
+            start = self._offsets[state_id]
+            end = self._offsets[state_id + 1]
+            markings.extend(self._markings[state_id * self._width:
+                                           (state_id + 1) * self._width])
+            targets.extend([ids[target]
+                            for target in self._targets[start:end]])
+            labels.extend(self._labels[start:end])
+            offsets.append(len(targets))
+        self._markings = markings
+        self._offsets = offsets
+        self._targets = targets
+        self._labels = labels
+        self._size = len(kept)
+        self._index = None
+        self._reverse = None
+
+
+    def release_index(self):
+        """ Drop the marking index, it will be rebuilt if it is needed """
+        self._index = None
+
+
+    def num_states(self):
+        """ Get the number of states """
+        return self._size
+
+
+    def num_edges(self):
+        """ Get the number of edges """
+        return len(self._targets)
+
+
+    def get_places(self):
+        """ Get the places in the order used by the packed markings """
+        return self._places
+
+
+    def get_transitions(self):
+        """ Get the transitions in the order used by the edge labels """
+        return self._transitions
+
+
+    def get_statistics(self):
+        """
+        Get the statistics of the exploration that built the graph, like the
+        reduction ratio if a reduction was used.
+        """
+        return self._statistics
+
+
+    def marking(self, state_id):
+        """ Get the packed marking of a state """
+        start = state_id * self._width
+        row = self._markings[start:start + self._width]
+        if self._packing is not None:
+            return self._packing.decode(row)
+        return tuple(row)
+
+
+    def marking_dict(self, state_id):
+        """ Get the marking of a state as a dictionary """
+        return unpack_marking(self._places, self.marking(state_id))
+
+
+    def tokens(self, place_index):
+        """ Get the tokens of a place in every state, ordered by state id """
+        if self._packing is not None:
+            words = self._markings[
+                self._packing.word(place_index)::self._width]
+            return self._packing.column(words, place_index)
+        return self._markings[place_index::self._width]
+
+
+    def state_id(self, state):
+        """ Get the id of a packed marking, or None if it is not a state """
+        if self._index is None:
+            self._build_index()
+        row = state
+        if self._packing is not None:
+            row = self._packing.encode(state)
+            if row is None:
+                return None
+        try:
+            key = array(self._markings.typecode, row).tostring()
+        except OverflowError:
+            return None
+        return self._index.get(key)
+
+
+    def succesors(self, state_id):
+        """ Get the (transition index, target id) edges of a state """
+        start = self._offsets[state_id]
+        end = self._offsets[state_id + 1]
+        return zip(self._labels[start:end], self._targets[start:end])
+
+
+    def succesor_ids(self, state_id):
+        """ Get the target ids of the edges of a state """
+        return self._targets[self._offsets[state_id]:
+                             self._offsets[state_id + 1]]
+
+
+    def path_to(self, state_id):
+        """
+        Get the path of (source, transition index, target) steps from the
+        state 0 to 'state_id', following the parents of the states.
+        """
+        path = []
+        while state_id:
+            source = self._parents[state_id]
+            for (t_index, target) in self.succesors(source):
+                if target == state_id:
+                    path.append((source, t_index, target))
+                    break
+            state_id = source
+        path.reverse()
+        return path
+
+
+    def predecessors(self, state_id):
+        """ Get the (transition index, source id) edges reaching a state """
+        (offsets, sources, labels) = self._get_reverse()
+        start = offsets[state_id]
+        end = offsets[state_id + 1]
+        return zip(labels[start:end], sources[start:end])
+
+
+    def predecessor_ids(self, state_id):
+        """ Get the source ids of the edges reaching a state """
+        (offsets, sources, _) = self._get_reverse()
+        return sources[offsets[state_id]:offsets[state_id + 1]]
+
+
+    def _get_reverse(self):
+        """
+        Get the reverse edges in CSR form, computing them the first time.
+        """
+        if self._reverse is not None:
+            return self._reverse
+        counts = array("l", [0] * (self._size + 1))
+        for target in self._targets:
+            counts[target + 1] += 1
+        for state_id in xrange(self._size):
+            counts[state_id + 1] += counts[state_id]
+        offsets = array("l", counts)
+        sources = array("i", [0] * len(self._targets))
+        labels = array("i", [0] * len(self._targets))
+        for source in xrange(self._size):
+            for position in xrange(self._offsets[source],
+                                   self._offsets[source + 1]):
+                target = self._targets[position]
+                sources[counts[target]] = source
+                labels[counts[target]] = self._labels[position]
+                counts[target] += 1
+        self._reverse = (offsets, sources, labels)
+        return self._reverse
+
+
+    def deadlocks(self):
+        """ Get the ids of the states without succesors """
+        return [state_id for state_id in xrange(self._size)
+                if self._offsets[state_id] == self._offsets[state_id + 1]]
+
+
+    def states(self):
+        """ Get the list of packed markings ordered by state id """
+        return [self.marking(state_id) for state_id in xrange(self._size)]
+
+
+    def edges(self):
+        """ Get the list of (source id, transition index, target id) edges """
+        edges = []
+        for source in xrange(self._size):
+            for (t_index, target) in self.succesors(source):
+                edges.append((source, t_index, target))
+        return edges
+
+
+def explore(net, m_0, reduction=None, visible=None, symmetry=None,
+            packing=None):
+    """
+    Explore the reachability set of 'net' from the marking 'm_0' in breadth
+    first order and get its ReachabilityGraph. State ids follow the order in
+    which the markings are discovered, the initial marking has id 0. The
+    frontier is expanded in batches of at most BATCH_SIZE markings.
+
+    With 'reduction' "stubborn" only the transitions of a stubborn set are
+    fired in every marking, preserving the deadlocks. If the 'visible' places
+    are given, the reduced graph also preserves the CTL formulae over them
+    without the next operator.
+
+    With a 'symmetry' only the canonical representative of every orbit of
+    markings is explored, and the number of orbits and of markings they
+    stand for are kept in the graph statistics. The marking table of the
+    graph uses the BitPacking 'packing' if it is given.
+    """
+    if reduction not in REDUCTIONS:
+        err_message = "Invalid reduction: '{0}'".format(reduction)
+        raise PetriNetException(err_message)
+    stubborn = None
+    if reduction == "stubborn":
+        stubborn = StubbornSets(net, visible)
+    graph = ReachabilityGraph(net._places, net._transitions, packing)
+    state_0 = pack_marking(net._places, m_0)
+    if symmetry is not None:
+        state_0 = symmetry.canonical(state_0)
+    graph._intern(state_0)
+    expanded = 0
+    while expanded < graph.num_states():
+        batch = range(expanded, min(graph.num_states(), expanded + BATCH_SIZE))
+        states = [graph.marking(source) for source in batch]
+        succ = net._get_succesors_batch(states)
+        position = 0
+        for row in xrange(len(batch)):
+            row_succ = []
+            while position < len(succ) and succ[position][0] == row:
+                (_, t_index, target_state) = succ[position]
+                if symmetry is not None:
+                    target_state = symmetry.canonical(target_state)
+                row_succ.append((t_index, target_state))
+                position += 1
+            if stubborn is None:
+                edges = [(t_index, graph._intern(target_state)[0])
+                         for (t_index, target_state) in row_succ]
+            else:
+                edges = _reduce_succesors(graph, stubborn, states[row],
+                                          row_succ)
+            graph._add_succesors(edges)
+        expanded = batch[-1] + 1
+    graph.release_index()
+    LOG.info("Explored {0} states and {1} edges".format(graph.num_states(),
+                                                          graph.num_edges()))
+    if stubborn is not None:
+        graph._statistics.update(stubborn.statistics())
+        LOG.info("Reduction ratio: {0:.3f}".format(
+            graph._statistics["ratio"]))
+    if symmetry is not None:
+        markings = 0
+        for state_id in xrange(graph.num_states()):
+            markings += symmetry.orbit_size(graph.marking(state_id))
+        graph._statistics["orbits"] = graph.num_states()
+        graph._statistics["markings"] = markings
+        LOG.info("Explored {0} orbits standing for {1} markings".format(
+            graph.num_states(), markings))
+    return graph
+
+
+def _reduce_succesors(graph, stubborn, state, succ):
+    """
+    Get the edges of the packed marking 'state' firing only the enabled
+    transitions of its stubborn set, given the (transition index, target
+    state) pairs in 'succ'. When CTL is preserved, the marking is fully
+    expanded if the reduced succesor was already discovered.
+    """
+    targets = dict(succ)
+    reduced = stubborn.reduce(state, [t_index for (t_index, _) in succ])
+    edges = []
+    for t_index in reduced:
+        (target, new) = graph._intern(targets[t_index])
+        edges.append((t_index, target))
+        if not new and stubborn.preserves_ctl() and len(reduced) < len(succ):
+            reduced = []
+            break
+    if not reduced:
+        edges = [(t_index, graph._intern(target_state)[0])
+                 for (t_index, target_state) in succ]
+    stubborn.count(len(succ), len(edges))
+    return edges
+
+
+def transition_flows(net):
+    """
+    Get, for every transition of 'net', the list of (place index, consumed,
+    produced) triples of the places it uses.
+    """
+    flows = []
+    for transition in net._transitions:
+        preset = net._preset[transition]
+        postset = net._postset[transition]
+        flows.append([(net._place_index[place],
+                       preset.get(place, 0), postset.get(place, 0))
+                      for place in set(preset) | set(postset)])
+    return flows
+
+
+def fire(flow, state):
+    """
+    Get the packed marking reached firing the transition with 'flow' (see
+    transition_flows) from 'state', or None if it is not enabled.
+    """
+    target = list(state)
+    for (i, consumed, produced) in flow:
+        if target[i] < consumed:
+            return None
+        target[i] += produced - consumed
+    return tuple(target)
+
+
+def reexplore(net, m_0, base=None, changed=(), removed=(), max_states=None):
+    """
+    Explore the reachability set of 'net' from the marking 'm_0' like
+    explore, reusing the ReachabilityGraph 'base' of a previous version of
+    the same net where only the flow of the 'changed' transition indexes
+    was different. The edges of the unchanged transitions from a marking in
+    'base' are taken from it, and only the changed ones are fired. The
+    'removed' transition indexes are never fired. It fails if the graph
+    exceeds 'max_states' states. The number of markings reused is in the
+    graph statistics.
+    """
+    removed = set(removed)
+    changed = set(changed) | removed
+    flows = transition_flows(net)
+    graph = ReachabilityGraph(net._places, net._transitions)
+    graph._intern(pack_marking(net._places, m_0))
+    reused = 0
+    expanded = 0
+    while expanded < graph.num_states():
+        state = graph.marking(expanded)
+        base_id = None
+        if base is not None:
+            base_id = base.state_id(state)
+        if base_id is None:
+            succ = [(t_index, target) for (_, t_index, target)
+                    in net._get_succesors_batch([state])
+                    if t_index not in removed]
+        else:
+            reused += 1
+            succ = [(t_index, base.marking(target)) for (t_index, target)
+                    in base.succesors(base_id) if t_index not in changed]
+            for t_index in changed - removed:
+                target = fire(flows[t_index], state)
+                if target is not None:
+                    succ.append((t_index, target))
+            succ.sort()
+        edges = [(t_index, graph._intern(target)[0])
+                 for (t_index, target) in succ]
+        if max_states is not None and graph.num_states() > max_states:
+            err_message = "Reachability graph exceeds {0} states".format(
+                max_states)
+            raise PetriNetException(err_message)
+        graph._add_succesors(edges)
+        expanded += 1
+    graph.release_index()
+    graph._statistics["reused"] = reused
+    LOG.info("Explored {0} states, {1} reused".format(graph.num_states(),
+                                                        reused))
+    return graph
+
+
+def update_graph(net, graph, candidates, changed):
+    """
+    Update in place the ReachabilityGraph 'graph' of a previous version of
+    'net' where only the flow of the 'changed' transition indexes was
+    different. The changed transitions are only fired in the 'candidates'
+    state ids, which must include every state enabling one of them in any
+    of both versions, and only the markings they newly reach are explored.
+    Returns a tuple (dirty, new, ids) with the ids of the states whose
+    succesors changed and of the new states, and the list mapping every
+    previous state id to its current id, -1 for the states no longer
+    reachable, or None if no state was dropped.
+    """
+    flows = transition_flows(net)
+    changed = set(changed)
+    size = graph.num_states()
+    rows = {}
+    dropped = False
+    for state_id in candidates:
+        state = graph.marking(state_id)
+        edges = graph.succesors(state_id)
+        previous = [(t_index, graph.marking(target)) for (t_index, target)
+                    in edges if t_index in changed]
+        fired = []
+        for t_index in sorted(changed):
+            target = fire(flows[t_index], state)
+            if target is not None:
+                fired.append((t_index, target))
+        if fired == previous:
+            continue
+        succ = [(t_index, target) for (t_index, target) in edges
+                if t_index not in changed]
+        succ.extend([(t_index, graph._intern(target)[0])
+                     for (t_index, target) in fired])
+        succ.sort()
+        kept = set([target for (_, target) in succ])
+        for (_, target) in edges:
+            if target not in kept and graph._parents[target] == state_id:
+                dropped = True
+        rows[state_id] = succ
+    graph._replace_succesors(rows)
+    expanded = size
+    while expanded < graph.num_states():
+        batch = range(expanded, min(graph.num_states(), expanded + BATCH_SIZE))
+        succ = net._get_succesors_batch([graph.marking(source)
+                                         for source in batch])
+        edges = [[] for _ in batch]
+        for (row, t_index, target) in succ:
+            edges[row].append((t_index, graph._intern(target)[0]))
+        for row_edges in edges:
+            graph._add_succesors(row_edges)
+        expanded = batch[-1] + 1
+    dirty = sorted(rows)
+    new = range(size, graph.num_states())
+    ids = None
+    if dropped:
+        ids = graph._drop_unreachable()
+    if ids is not None:
+        dirty = [ids[state_id] for state_id in dirty if ids[state_id] >= 0]
+        new = [ids[state_id] for state_id in new if ids[state_id] >= 0]
+    LOG.info("Graph updated: {0} states changed, {1} new".format(
+        len(dirty), len(new)))
+    return (dirty, new, ids)
+
+
+def iter_expansions(net, m_0, order="bfs", max_states=None, max_depth=None):
+    """
+    Explore the reachability set of 'net' from the marking 'm_0' yielding,
+    for every reached packed marking, a pair (state, succ) as soon as it is
+    expanded, where 'succ' is the list of (transition index, target state)
+    pairs. The 'order' is "bfs" or "dfs". Markings at depth 'max_depth' are
+    yielded with 'succ' None as they are not expanded, and the exploration
+    stops after 'max_states' markings. Only the visited set is kept, so the
+    caller can stop the exploration at any time.
+    """
+    if order not in ORDERS:
+        err_message = "Invalid exploration order: '{0}'".format(order)
+        raise PetriNetException(err_message)
+    state_0 = pack_marking(net._places, m_0)
+    visited = set([state_0])
+    frontier = deque([(state_0, 0)])
+    count = 0
+    while frontier:
+        if max_states is not None and count >= max_states:
+            LOG.info("Exploration stopped after {0} states".format(count))
+            return
+        if order == "bfs":
+            (state, depth) = frontier.popleft()
+        else:
+            (state, depth) = frontier.pop()
+        count += 1
+        if max_depth is not None and depth >= max_depth:
+            yield (state, None)
+            continue
+        succ = [(t_index, target) for (_, t_index, target)
+                in net._get_succesors_batch([state])]
+        new_states = []
+        for (_, target) in succ:
+            if target not in visited:
+                visited.add(target)
+                new_states.append((target, depth + 1))
+        if order == "dfs":
+            new_states.reverse()
+        frontier.extend(new_states)
+        yield (state, succ)
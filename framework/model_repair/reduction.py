@@ -0,0 +1,219 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the partial order reduction used by the exploration
+  engine. In every marking only the enabled transitions of a stubborn set,
+  computed from the preset and postset of the transitions, are fired.
+
+  Without visible places the reduction preserves the deadlocks of the net.
+  With the places mentioned by a formula as visible places, a marking is
+  only reduced to a single invisible transition, and it is fully expanded if
+  that transition leads to an already discovered marking (cycle proviso), so
+  the reduced graph preserves the CTL formulae without the next operator.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+from logger import LOG
+
+REDUCTIONS = [None, "stubborn"]
+
+
+class FormulaScanner(object):
+    """
+    Class to collect the places used by CTL formulae and check if they use
+    the next operator. It is given to the formulae as a model checker.
+    """
+
+    def __init__(self):
+        self.places = set()
+        self.uses_next = False
+        self._seen = set()
+
+
+    def scan(self, formula):
+        """ Scan 'formula' and its subformulas """
+        self.label(formula)
+
+
+    def label(self, formula):
+        if formula not in self._seen:
+            self._seen.add(formula)
+            formula.evaluate(self)
+
+
+    def true(self):
+        pass
+
+
+    def false(self):
+        pass
+
+
+    def atomic(self, place):
+        self.places.add(place)
+
+
+    def negation(self, sat):
+        pass
+
+
+    def conjunction(self, sat_1, sat_2):
+        pass
+
+
+    def exist_next(self, sat):
+        self.uses_next = True
+
+
+    def exist_until(self, sat_1, sat_2):
+        pass
+
+
+    def exist_globally(self, sat):
+        pass
+
+
+class StubbornSets(object):
+    """
+    Class to compute the stubborn sets of the markings of a Petri Net. If
+    'visible' places are given, the transitions changing their tokens are
+    visible and the conditions to preserve CTL without next are applied.
+    """
+
+    def __init__(self, net, visible=None):
+        place_index = net._place_index
+        size = len(net._transitions)
+        self._pre = []
+        self._producers = [[] for place in net._places]
+        consumers = [[] for place in net._places]
+        for (t_index, transition) in enumerate(net._transitions):
+            preset = net._preset[transition]
+            postset = net._postset[transition]
+            self._pre.append([(place_index[place], value)
+                              for (place, value) in preset.iteritems()])
+            for (place, value) in postset.iteritems():
+                if value > preset.get(place, 0):
+                    self._producers[place_index[place]].append(t_index)
+            for place in preset:
+                consumers[place_index[place]].append(t_index)
+        self._conflicts = []
+        for t_index in xrange(size):
+            conflicts = set()
+            for (i, _) in self._pre[t_index]:
+                conflicts.update(consumers[i])
+            self._conflicts.append(conflicts)
+        self._preserve_ctl = visible is not None
+        self._visible = set()
+        if self._preserve_ctl:
+            for (t_index, transition) in enumerate(net._transitions):
+                preset = net._preset[transition]
+                postset = net._postset[transition]
+                for place in visible:
+                    if preset.get(place, 0) != postset.get(place, 0):
+                        self._visible.add(t_index)
+        self.enabled = 0
+        self.fired = 0
+        LOG.info("Stubborn sets ready, {0} visible transitions".format(
+            len(self._visible)))
+
+
+    def reduce(self, state, enabled):
+        """
+        Get the enabled transitions of a stubborn set of the packed marking
+        'state', given the list of its 'enabled' transitions. It returns all
+        of them if the marking can not be reduced.
+        """
+        enabled_set = set(enabled)
+        best = enabled
+        for seed in enabled:
+            if seed in self._visible:
+                continue
+            stubborn = self._closure(state, enabled_set, seed)
+            reduced = [t_index for t_index in enabled if t_index in stubborn]
+            if self._preserve_ctl:
+                if len(reduced) == 1:
+                    best = reduced
+                    break
+            elif len(reduced) < len(best):
+                best = reduced
+                if len(best) == 1:
+                    break
+        return best
+
+
+    def count(self, enabled, fired):
+        """ Count the enabled and fired transitions of an expanded marking """
+        self.enabled += enabled
+        self.fired += fired
+
+
+    def preserves_ctl(self):
+        """ Check if the visibility and cycle conditions must be applied """
+        return self._preserve_ctl
+
+
+    def statistics(self):
+        """
+        Get the enabled and fired transitions counted so far and their ratio.
+        """
+        ratio = 1.0
+        if self.enabled:
+            ratio = float(self.fired) / self.enabled
+        return {"enabled": self.enabled, "fired": self.fired, "ratio": ratio}
+
+
+    def _closure(self, state, enabled, seed):
+        """
+        Get the stubborn set including 'seed'. Every enabled transition adds
+        the transitions sharing an input place with it; every disabled one
+        adds the producers of the input place with less tokens than required
+        and fewer producers.
+        """
+        stubborn = set([seed])
+        work = [seed]
+        while work:
+            t_index = work.pop()
+            if t_index in enabled:
+                added = self._conflicts[t_index]
+            else:
+                added = None
+                for (i, value) in self._pre[t_index]:
+                    if state[i] < value:
+                        producers = self._producers[i]
+                        if added is None or len(producers) < len(added):
+                            added = producers
+                added = added or []
+            for other in added:
+                if other not in stubborn:
+                    stubborn.add(other)
+                    work.append(other)
+        return stubborn
@@ -0,0 +1,368 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the model repair engine. Given a Petri Net, an
+  initial marking and a CTL specification, it searches the cheapest sets of
+  edits making the specification hold. The edits are:
+
+    * Changing by one the weight of an arc of the I or O functions.
+    * Removing a transition.
+    * Changing by one the tokens of a place in the initial marking.
+
+  The candidates are explored in order of cost. When a candidate does not
+  satisfy the specification, the witness of the negated specification (the
+  counterexample) is extracted and only the edits able to break it extend
+  the candidate: edits over the transitions fired by the counterexample,
+  input edits enabling a transition in its deadlocks and initial marking
+  edits. Every candidate is checked exploring its state space from the
+  graph of the original net, so only the markings and transitions affected
+  by the edits are computed again.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+import heapq
+import time
+
+from coverability import coverability, OMEGA
+from error_handling import PetriNetException
+from logger import LOG
+from model_checker import ModelChecker
+from reachability import pack_marking, reexplore
+
+COSTS = {"arc": 1, "remove": 2, "marking": 1}
+MAX_STATES = 100000
+PROBE_FACTOR = 4
+
+
+class Repair(object):
+    """
+    Class to represent a repair of a Petri Net, a list of edits with its
+    total cost. Every edit is a tuple ("I", place, transition, old, new),
+    ("O", place, transition, old, new), ("R", transition) or
+    ("M", place, old, new).
+    """
+
+    def __init__(self, cost, edits):
+        self.cost = cost
+        self.edits = edits
+
+
+    def apply(self, net, m_0):
+        """
+        Get the pair (net, marking) repaired from 'net' and 'm_0'. Removed
+        transitions are deleted from the T set of the new net.
+        """
+        removed = set([edit[1] for edit in self.edits if edit[0] == "R"])
+        repaired = net.copy(removed)
+        m_0 = net._fix_marking(dict(m_0))
+        for edit in self.edits:
+            if edit[0] == "I" and edit[2] not in removed:
+                repaired.change_input_flow(edit[1], edit[2], edit[4])
+            elif edit[0] == "O" and edit[2] not in removed:
+                repaired.change_output_flow(edit[1], edit[2], edit[4])
+            elif edit[0] == "M":
+                m_0[edit[1]] = edit[3]
+        return (repaired, m_0)
+
+
+    def __repr__(self):
+        return "Repair(cost={0}, edits={1})".format(self.cost, self.edits)
+
+
+class ModelRepair(object):
+    """
+    Class to search the minimal cost repairs of a Petri Net for a CTL
+    specification. The 'costs' dictionary gives the cost of an "arc" weight
+    unit, a "remove" and a "marking" token unit. Candidates cost at most
+    'max_cost' and their state spaces at most 'max_states' markings.
+    """
+
+    def __init__(self, net, m_0, spec, max_cost=3, costs=None,
+                 max_states=MAX_STATES):
+        self._net = net
+        self._m_0 = net._fix_marking(dict(m_0))
+        self._spec = spec
+        self._negated = spec.negate()
+        self._max_cost = max_cost
+        self._costs = dict(COSTS)
+        self._costs.update(costs or {})
+        self._max_states = max_states
+        self._base = reexplore(net, self._m_0, max_states=max_states)
+        self._base_checker = ModelChecker(net, graph=self._base)
+        self._results = {}
+        self._statistics = {"candidates": 0, "checked": 0, "pruned": 0,
+                            "reused_states": 0, "explored_states": 0,
+                            "marking_only": 0, "too_large": 0,
+                            "repairs": 0, "seconds": 0.0}
+
+
+    def search(self, max_repairs=1):
+        """
+        Get up to 'max_repairs' repairs of minimal cost, as a list of Repair
+        objects. It is empty if no repair costs at most 'max_cost'; if the
+        specification already holds, it has a single repair without edits.
+        """
+        start = time.time()
+        repairs = []
+        best = None
+        queue = [(0, ())]
+        seen = set([()])
+        while queue:
+            (cost, candidate) = heapq.heappop(queue)
+            if best is not None and cost > best:
+                break
+            if any([set(repair) <= set(candidate) for repair in repairs]):
+                continue
+            self._statistics["candidates"] += 1
+            (holds, counterexample) = self._check(candidate)
+            if holds:
+                repairs.append(candidate)
+                best = cost
+                if len(repairs) >= max_repairs:
+                    break
+                continue
+            if counterexample is None:
+                continue
+            for step in self._get_steps(candidate, counterexample):
+                extended = self._extend(candidate, step)
+                if extended in seen:
+                    continue
+                seen.add(extended)
+                extended_cost = self._get_cost(extended)
+                if extended_cost <= self._max_cost:
+                    heapq.heappush(queue, (extended_cost, extended))
+        self._statistics["repairs"] = len(repairs)
+        self._statistics["seconds"] = time.time() - start
+        LOG.info("Repair search statistics: {0}".format(self._statistics))
+        return [Repair(self._get_cost(candidate),
+                       self._get_edits(candidate)) for candidate in repairs]
+
+
+    def statistics(self):
+        """
+        Get the statistics of the search: candidates popped and checked,
+        transitions pruned because a counterexample does not fire them,
+        markings reused from and explored out of the original state space,
+        candidates checked over the original graph, candidates over
+        'max_states', repairs found and seconds spent.
+        """
+        return dict(self._statistics)
+
+
+    def _extend(self, candidate, step):
+        """
+        Get the candidate, a sorted tuple of (key, value) pairs, with the
+        value of 'step' replacing the one of its key.
+        """
+        edits = dict(candidate)
+        (key, value) = step
+        edits[key] = value
+        if value == self._original(key):
+            del edits[key]
+        if key[0] == "R":
+            for other in edits.keys():
+                if other[0] in ("I", "O") and other[2] == key[1]:
+                    del edits[other]
+        return tuple(sorted(edits.iteritems()))
+
+
+    def _get_steps(self, candidate, counterexample):
+        """
+        Get the (key, value) edits able to break the 'counterexample' of
+        'candidate'. Removed transitions get no more edits.
+        """
+        (net, m_0, removed) = self._apply(candidate)
+        (graph, fired, deadlocks) = counterexample
+        steps = []
+        for (t_index, transition) in enumerate(net._transitions):
+            if transition in removed:
+                continue
+            if t_index not in fired:
+                self._statistics["pruned"] += 1
+                continue
+            steps.append((("R", transition), True))
+            for place in net._places:
+                for (name, flow) in (("I", net.get_input_flow),
+                                     ("O", net.get_output_flow)):
+                    value = flow(place, transition)
+                    steps.append(((name, place, transition), value + 1))
+                    if value > 0:
+                        steps.append(((name, place, transition), value - 1))
+        for state_id in deadlocks:
+            state = graph.marking(state_id)
+            for (t_index, transition) in enumerate(net._transitions):
+                if t_index in fired or transition in removed:
+                    continue
+                for (place, value) in net._preset[transition].iteritems():
+                    if state[net._place_index[place]] < value:
+                        steps.append((("I", place, transition), value - 1))
+        for place in net._places:
+            steps.append((("M", place), m_0[place] + 1))
+            if m_0[place] > 0:
+                steps.append((("M", place), m_0[place] - 1))
+        return steps
+
+
+    def _original(self, key):
+        """ Get the value of an edit key in the original net """
+        if key[0] == "I":
+            return self._net.get_input_flow(key[1], key[2])
+        if key[0] == "O":
+            return self._net.get_output_flow(key[1], key[2])
+        if key[0] == "M":
+            return self._m_0[key[1]]
+        return False
+
+
+    def _get_cost(self, candidate):
+        """ Get the cost of a candidate """
+        cost = 0
+        for (key, value) in candidate:
+            if key[0] == "R":
+                cost += self._costs["remove"]
+            elif key[0] == "M":
+                cost += self._costs["marking"] * abs(
+                    value - self._original(key))
+            else:
+                cost += self._costs["arc"] * abs(value - self._original(key))
+        return cost
+
+
+    def _get_edits(self, candidate):
+        """ Get the list of edits of a candidate """
+        edits = []
+        for (key, value) in candidate:
+            if key[0] == "R":
+                edits.append(key)
+            else:
+                edits.append(key + (self._original(key), value))
+        return edits
+
+
+    def _apply(self, candidate):
+        """
+        Get the tuple (net, marking, removed transitions) of a candidate.
+        The net keeps every transition, the removed ones are never fired.
+        """
+        net = self._net
+        structural = [key for (key, _) in candidate if key[0] != "M"]
+        if structural:
+            net = self._net.copy()
+        m_0 = dict(self._m_0)
+        removed = set()
+        for (key, value) in candidate:
+            if key[0] == "I":
+                net.change_input_flow(key[1], key[2], value)
+            elif key[0] == "O":
+                net.change_output_flow(key[1], key[2], value)
+            elif key[0] == "R":
+                removed.add(key[1])
+            else:
+                m_0[key[1]] = value
+        return (net, m_0, removed)
+
+
+    def _explore(self, net, m_0, changed, removed):
+        """
+        Get the graph of a candidate from the original one, or None if it
+        exceeds 'max_states'. Graphs much larger than the original one are
+        first checked for boundedness with the coverability graph, so the
+        unbounded candidates are discarded early.
+        """
+        probe = PROBE_FACTOR * self._base.num_states()
+        if probe < self._max_states:
+            try:
+                return reexplore(net, m_0, self._base, changed, removed,
+                                 probe)
+            except PetriNetException:
+                pass
+            net_removed = net.copy([net._transitions[t_index]
+                                    for t_index in removed])
+            try:
+                bounded = coverability(net_removed, m_0, True,
+                                       self._max_states)
+            except PetriNetException:
+                return None
+            if OMEGA in bounded.place_bounds().values():
+                return None
+        try:
+            return reexplore(net, m_0, self._base, changed, removed,
+                             self._max_states)
+        except PetriNetException:
+            return None
+
+
+    def _check(self, candidate):
+        """
+        Check the specification in a candidate. Returns the pair (holds,
+        counterexample), where the counterexample is a tuple (graph, fired
+        transition indexes, deadlock states) from the witness of the negated
+        specification, or None if the candidate could not be checked.
+        """
+        if candidate in self._results:
+            return self._results[candidate]
+        (net, m_0, removed) = self._apply(candidate)
+        changed = set()
+        for (key, _) in candidate:
+            if key[0] in ("I", "O", "R"):
+                changed.add(net._transition_index[key[-1]])
+        state = pack_marking(net._places, m_0)
+        state_id = self._base.state_id(state)
+        if not changed and state_id is not None:
+            self._statistics["marking_only"] += 1
+            checker = self._base_checker
+            graph = self._base
+        else:
+            self._statistics["checked"] += 1
+            removed_indexes = [net._transition_index[transition]
+                               for transition in removed]
+            graph = self._explore(net, m_0, changed, removed_indexes)
+            if graph is None:
+                self._statistics["too_large"] += 1
+                self._results[candidate] = (False, None)
+                return self._results[candidate]
+            reused = graph.get_statistics()["reused"]
+            self._statistics["reused_states"] += reused
+            self._statistics["explored_states"] += graph.num_states() - reused
+            checker = ModelChecker(net, graph=graph)
+            state_id = 0
+        if checker.label(self._spec) >> state_id & 1:
+            result = (True, None)
+        else:
+            (_, edges, deadlocks, complete) = checker.witness(self._negated,
+                                                              state_id)
+            fired = set([t_index for (_, t_index, _) in edges])
+            if not complete:
+                fired = set(xrange(len(net._transitions)))
+            result = (False, (graph, fired, deadlocks))
+        self._results[candidate] = result
+        return result
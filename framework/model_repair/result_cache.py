@@ -0,0 +1,186 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the persistent cache of model checking results. The
+  results are stored in a SQLite database keyed by a fingerprint of the LoLA
+  model, the formula and the version of the model checker, so they survive
+  between runs. When the stored entries exceed the maximum size, the least
+  recently used ones are evicted.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+  18-10-2026  ulisesma   Cache file in the user cache directory
+
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+from logger import LOG
+
+CACHE_FILE_NAME = "model_repair_cache.db"
+CACHE_FILE_VARIABLE = "MODEL_REPAIR_CACHE"
+MAX_CACHE_SIZE = 16 * 1024 * 1024
+ENTRY_OVERHEAD = 64
+SHARED_CACHE = []
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+)"""
+
+
+def get_key(model, formula, version):
+    """
+    Get the fingerprint of a LoLA 'model', a 'formula' in LoLA format and the
+    'version' of the model checker.
+    """
+    digest = hashlib.sha1()
+    for text in (model, formula, version):
+        text = text.encode("utf-8") if isinstance(text, unicode) else text
+        digest.update("{0}:".format(len(text)))
+        digest.update(text)
+    return digest.hexdigest()
+
+
+def get_cache_file_name():
+    """
+    Get the file of the shared result cache: the value of the environment
+    variable CACHE_FILE_VARIABLE if it is set, otherwise CACHE_FILE_NAME in
+    the "model_repair" folder of the user cache directory.
+    """
+    file_name = os.environ.get(CACHE_FILE_VARIABLE)
+    if file_name:
+        return file_name
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_dir, "model_repair", CACHE_FILE_NAME)
+
+
+def get_result_cache():
+    """
+    Get the result cache shared by the whole process, opening it in the file
+    given by get_cache_file_name the first time.
+    """
+    if not SHARED_CACHE:
+        SHARED_CACHE.append(ResultCache(get_cache_file_name()))
+    return SHARED_CACHE[0]
+
+
+def set_result_cache(file_name):
+    """ Use the result cache in 'file_name' as the shared one """
+    del SHARED_CACHE[:]
+    SHARED_CACHE.append(ResultCache(file_name))
+    return SHARED_CACHE[0]
+
+
+class ResultCache(object):
+    """ Class to store model checking results on disk """
+
+    def __init__(self, file_name=CACHE_FILE_NAME, max_size=MAX_CACHE_SIZE):
+        self._file_name = file_name
+        self._max_size = max_size
+        directory = os.path.dirname(file_name)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._connection = sqlite3.connect(file_name, timeout=30)
+        self._connection.execute(CREATE_TABLE)
+        self._connection.commit()
+        LOG.info("Result cache opened from '{0}'".format(file_name))
+
+
+    def get(self, key):
+        """
+        Get the result stored for 'key', or None if it is not in the cache.
+        """
+        row = self._connection.execute(
+            "SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            LOG.info("Result cache miss for '{0}'".format(key))
+            return None
+        self._connection.execute(
+            "UPDATE results SET last_access = ? WHERE key = ?",
+            (time.time(), key))
+        self._connection.commit()
+        LOG.info("Result cache hit for '{0}'".format(key))
+        return bool(row[0])
+
+
+    def put(self, key, result):
+        """
+        Store 'result' for 'key' and evict the least recently used entries if
+        the cache exceeds its maximum size.
+        """
+        size = len(key) + ENTRY_OVERHEAD
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (key, int(bool(result)), size, time.time()))
+        self._connection.commit()
+        self._evict()
+
+
+    def size(self):
+        """ Get the size in bytes of the stored entries """
+        row = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        return row[0]
+
+
+    def clear(self):
+        """ Remove all the stored entries """
+        self._connection.execute("DELETE FROM results")
+        self._connection.commit()
+        LOG.info("Result cache cleared")
+
+
+    def _evict(self):
+        """
+        Remove the least recently used entries until the cache fits in its
+        maximum size.
+        """
+        excess = self.size() - self._max_size
+        if excess <= 0:
+            return
+        rows = self._connection.execute(
+            "SELECT key, size FROM results ORDER BY last_access")
+        evicted = []
+        for (key, size) in rows:
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?",
+                                     evicted)
+        self._connection.commit()
+        LOG.info("{0} entries evicted from result cache".format(len(evicted)))
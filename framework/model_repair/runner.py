@@ -4,6 +4,8 @@
 ================================================================================
 
   This module perform calls to the command line to run external programs.
+  They can be run one by one, in a pool of workers, or asynchronously in a
+  single thread with the AsyncRunner event loop.
 
 ================================================================================
                               MAINTAINERS
@@ -26,25 +28,400 @@
 ================================================================================
 
       Version: 0.1
-  Last Update: 27-03-2016
+  Last Update: 18-10-2026
 
   Date        Alias      Description
 --------------------------------------------------------------------------------
   27-03-2016  ulisesma   Runner module to perform command line calls
+  18-10-2026  ulisesma   Pool of workers to run several commands at once
+  18-10-2026  ulisesma   Asynchronous runner with streamed output, avoiding
+                         the wait before communicate deadlock
+  18-10-2026  ulisesma   Failed job starts set as future exceptions, and no
+                         busy waiting for exiting processes
 
 """
 
+import errno
+import fcntl
+import os
+import Queue
+import select
+import signal
 import subprocess
+import threading
+import time
 
 from logger import LOG
 
+DEFAULT_WORKERS = 4
+CHUNK_SIZE = 65536
+EXIT_POLL_INTERVAL = 0.05
+
 def run(command):
     cmd_string = " ".join(command)
     LOG.info("Runnin command \"{0}\"".format(cmd_string))
     process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    ret = process.wait()
     stdout, stderr = process.communicate()
+    ret = process.returncode
     LOG.info("RC: \"{0}\"".format(ret))
     LOG.info("STDOUT: \"{0}\"".format(stdout))
     LOG.info("STDERR: \"{0}\"".format(stderr))
     return (ret, stdout, stderr)
+
+
+class RunnerPool(object):
+    """
+    Class to run several command line calls in parallel with a bounded number
+    of workers. Every call can be limited to 'timeout' seconds, and all the
+    pending and running calls can be cancelled.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, timeout=None):
+        self._workers = max(1, workers)
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._running = {}
+        self._killed = set()
+        self._cancelled = threading.Event()
+
+
+    def run_many(self, commands):
+        """
+        Run all the 'commands' and yield an (index, (ret, stdout, stderr))
+        pair for each one as soon as it completes, where 'index' is the
+        position of the command. The return code 'ret' is None if the call
+        timed out or was cancelled.
+        """
+        commands = list(commands)
+        jobs = Queue.Queue()
+        for job in enumerate(commands):
+            jobs.put(job)
+        results = Queue.Queue()
+        self._cancelled.clear()
+        self._killed.clear()
+        workers = []
+        for _ in xrange(min(self._workers, len(commands))):
+            worker = threading.Thread(target=self._work, args=(jobs, results))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+        try:
+            for _ in xrange(len(commands)):
+                yield results.get()
+        finally:
+            self.cancel()
+            for worker in workers:
+                worker.join()
+
+
+    def cancel(self):
+        """
+        Cancel the pending calls and kill the running ones.
+        """
+        self._cancelled.set()
+        with self._lock:
+            running = self._running.items()
+        for (index, process) in running:
+            self._kill(index, process)
+
+
+    def _work(self, jobs, results):
+        """ Run jobs from the 'jobs' queue until it is empty """
+        while True:
+            try:
+                (index, command) = jobs.get_nowait()
+            except Queue.Empty:
+                return
+            if self._cancelled.is_set():
+                LOG.info("Command {0} cancelled".format(index))
+                results.put((index, (None, "", "")))
+                continue
+            results.put((index, self._run(index, command)))
+
+
+    def _run(self, index, command):
+        """ Run a single command enforcing the timeout """
+        cmd_string = " ".join(command)
+        LOG.info("Runnin command {0} \"{1}\"".format(index, cmd_string))
+        process = subprocess.Popen(command, stdout=subprocess.PIPE,
+                                   stderr=subprocess.PIPE,
+                                   preexec_fn=os.setsid)
+        with self._lock:
+            self._running[index] = process
+        if self._cancelled.is_set():
+            self._kill(index, process)
+        timer = None
+        if self._timeout is not None:
+            timer = threading.Timer(self._timeout, self._kill,
+                                    (index, process))
+            timer.start()
+        try:
+            stdout, stderr = process.communicate()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            with self._lock:
+                del self._running[index]
+        ret = process.returncode
+        if index in self._killed:
+            LOG.info("Command {0} killed".format(index))
+            ret = None
+        LOG.info("RC {0}: \"{1}\"".format(index, ret))
+        return (ret, stdout, stderr)
+
+
+    def _kill(self, index, process):
+        """
+        Kill a running process and its children, it runs in its own process
+        group so no child keeps its pipes open.
+        """
+        with self._lock:
+            self._killed.add(index)
+        _kill_group(process)
+
+
+class Future(object):
+    """ Class to represent a result that will be available later """
+
+    def __init__(self):
+        self._done = False
+        self._result = None
+        self._exception = None
+        self._callbacks = []
+
+
+    def done(self):
+        """ Check if the result is available """
+        return self._done
+
+
+    def result(self):
+        """
+        Get the result, it is None while it is not available. If the future
+        failed, its exception is raised.
+        """
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+
+    def exception(self):
+        """ Get the exception of a failed future, or None """
+        return self._exception
+
+
+    def set_result(self, result):
+        """ Set the result and call the done callbacks """
+        self._result = result
+        self._set_done()
+
+
+    def set_exception(self, exception):
+        """ Set the exception of a failed future and call the callbacks """
+        self._exception = exception
+        self._set_done()
+
+
+    def _set_done(self):
+        """ Mark the future as done and call the done callbacks """
+        self._done = True
+        for callback in self._callbacks:
+            callback(self)
+        self._callbacks = []
+
+
+    def add_done_callback(self, callback):
+        """
+        Call 'callback' with this future when the result is available, or
+        right away if it is already available.
+        """
+        if self._done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+
+class Job(Future):
+    """
+    Class to represent a command run by the AsyncRunner. Its result is the
+    (ret, stdout, stderr) tuple of the command, where 'ret' is None if it
+    timed out or was cancelled. When the job has an 'on_output' callback, the
+    output is given to it in chunks as it is read, as on_output(stream, data)
+    with stream "stdout" or "stderr", and it is not kept in the result.
+    """
+
+    def __init__(self, command, on_output=None, timeout=None):
+        super(Job, self).__init__()
+        self.command = command
+        self._on_output = on_output
+        self._timeout = timeout
+        self._deadline = None
+        self._process = None
+        self._streams = {}
+        self._output = {"stdout": [], "stderr": []}
+        self._killed = False
+
+
+    def cancel(self):
+        """ Cancel the job, killing its process if it is running """
+        if self._done:
+            return
+        self._killed = True
+        if self._process is None:
+            self._finish()
+        else:
+            _kill_group(self._process)
+
+
+    def _start(self):
+        """ Start the process of the job with non blocking pipes """
+        cmd_string = " ".join(self.command)
+        LOG.info("Runnin command \"{0}\"".format(cmd_string))
+        self._process = subprocess.Popen(self.command, stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE,
+                                         preexec_fn=os.setsid)
+        for (name, pipe) in (("stdout", self._process.stdout),
+                             ("stderr", self._process.stderr)):
+            flags = fcntl.fcntl(pipe, fcntl.F_GETFL)
+            fcntl.fcntl(pipe, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+            self._streams[pipe.fileno()] = (name, pipe)
+        if self._timeout is not None:
+            self._deadline = time.time() + self._timeout
+
+
+    def _read(self, file_descriptor):
+        """ Read the available output of one of the pipes """
+        (name, pipe) = self._streams[file_descriptor]
+        try:
+            data = os.read(file_descriptor, CHUNK_SIZE)
+        except OSError as error:
+            if error.errno == errno.EAGAIN:
+                return
+            raise
+        if not data:
+            pipe.close()
+            del self._streams[file_descriptor]
+        elif self._on_output is not None:
+            self._on_output(name, data)
+        else:
+            self._output[name].append(data)
+
+
+    def _finish(self):
+        """ Set the result of the job """
+        ret = None
+        if self._process is not None and not self._killed:
+            ret = self._process.returncode
+        stdout = stderr = None
+        if self._on_output is None:
+            stdout = "".join(self._output["stdout"])
+            stderr = "".join(self._output["stderr"])
+        LOG.info("RC: \"{0}\"".format(ret))
+        self.set_result((ret, stdout, stderr))
+
+
+class AsyncRunner(object):
+    """
+    Class to run command line calls asynchronously from a single thread. Jobs
+    are submitted and the event loop is driven with 'poll' or
+    'run_until_complete'; at most 'max_running' processes run at once and
+    the rest wait in a queue.
+    """
+
+    def __init__(self, max_running=DEFAULT_WORKERS):
+        self._max_running = max(1, max_running)
+        self._pending = []
+        self._running = []
+
+
+    def submit(self, command, on_output=None, timeout=None):
+        """
+        Submit a 'command' to be run and get its Job.
+        """
+        job = Job(command, on_output, timeout)
+        self._pending.append(job)
+        return job
+
+
+    def busy(self):
+        """ Check if there are pending or running jobs """
+        return bool(self._pending or self._running)
+
+
+    def poll(self, timeout=None):
+        """
+        Run one iteration of the event loop: start the pending jobs that fit,
+        wait up to 'timeout' seconds for output, read it, enforce the job
+        timeouts and set the results of the finished jobs. Jobs that can not
+        be started get the error as their exception. It returns right away if
+        there are no running jobs.
+        """
+        self._pending = [job for job in self._pending if not job.done()]
+        while self._pending and len(self._running) < self._max_running:
+            job = self._pending.pop(0)
+            try:
+                job._start()
+            except (OSError, ValueError) as error:
+                LOG.error("Command could not be started: {0}".format(error))
+                job.set_exception(error)
+                continue
+            self._running.append(job)
+        if not self._running:
+            return
+        streams = {}
+        wait = timeout
+        now = time.time()
+        for job in self._running:
+            for file_descriptor in job._streams:
+                streams[file_descriptor] = job
+            if job._deadline is not None:
+                remaining = max(0, job._deadline - now)
+                wait = remaining if wait is None else min(wait, remaining)
+        if streams:
+            try:
+                (readable, _, _) = select.select(streams.keys(), [], [], wait)
+            except select.error as error:
+                if error.args[0] != errno.EINTR:
+                    raise
+                readable = []
+            for file_descriptor in readable:
+                streams[file_descriptor]._read(file_descriptor)
+        elif wait is None:
+            self._running[0]._process.wait()
+        else:
+            time.sleep(min(wait, EXIT_POLL_INTERVAL))
+        now = time.time()
+        running = []
+        for job in self._running:
+            if job._deadline is not None and now >= job._deadline:
+                if not job._killed:
+                    LOG.info("Command timed out")
+                    job._killed = True
+                    _kill_group(job._process)
+            if job._streams or job._process.poll() is None:
+                running.append(job)
+            else:
+                job._finish()
+        self._running = running
+
+
+    def run_until_complete(self, jobs=None):
+        """
+        Drive the event loop until all the 'jobs' (all the submitted jobs by
+        default) are done.
+        """
+        while True:
+            if jobs is None:
+                if not self.busy():
+                    return
+            elif all(job.done() for job in jobs):
+                return
+            self.poll(1.0)
+
+
+def _kill_group(process):
+    """ Kill a process and all its children """
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
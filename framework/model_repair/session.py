@@ -0,0 +1,210 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the verification sessions, used to check a Petri Net
+  again after small changes of its flow functions. A session keeps the
+  reachability graph of the net and the labels of the formulae checked over
+  it, and reads the journal of the net to know which transitions changed.
+
+  After a change, only the states where a changed transition is enabled (or
+  was enabled) are affected, they are found from the token columns of the
+  graph. The changed transitions are fired again in those states and the
+  markings they newly reach are explored, updating the graph in place. The
+  labels are kept for the states which cannot reach a changed state. The
+  graph is only rebuilt from scratch when most of the transitions or states
+  are affected, or when places or transitions were added.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+  18-10-2026  ulisesma   Graph updated in place and labels kept outside of the
+                         changed states
+
+"""
+
+from logger import LOG
+from model_checker import ModelChecker
+from reachability import update_graph
+
+REBUILD_FRACTION = 0.5
+
+
+class VerificationSession(object):
+    """
+    Class to check CTL formulae over a Petri Net from the marking 'm_0',
+    updating the reachability graph incrementally after the net changes.
+    """
+
+    def __init__(self, net, m_0):
+        self._net = net
+        self._m_0 = net._fix_marking(dict(m_0))
+        self._position = net.journal_size()
+        self._graph = None
+        self._checker = None
+        self._statistics = {"updates": 0, "rebuilds": 0, "incremental": 0,
+                            "unchanged": 0, "affected_states": 0,
+                            "reused_states": 0, "explored_states": 0,
+                            "relabeled_states": 0}
+        self._rebuild()
+
+
+    def check(self, formula):
+        """
+        Check if the initial marking satisfies the CTL 'formula' in the
+        current version of the net.
+        """
+        self.update()
+        return self._checker.check(formula)
+
+
+    def check_many(self, formulas):
+        """ Check every formula in 'formulas', returns a list of results """
+        self.update()
+        return [self._checker.check(formula) for formula in formulas]
+
+
+    def get_graph(self):
+        """
+        Get the ReachabilityGraph of the current version of the net. The
+        graph is updated in place by the next incremental updates.
+        """
+        self.update()
+        return self._graph
+
+
+    def get_checker(self):
+        """ Get the ModelChecker of the current version of the net """
+        self.update()
+        return self._checker
+
+
+    def statistics(self):
+        """
+        Get the statistics of the session: updates applied, graphs built
+        from scratch (the first one included), updates exploring the graph
+        incrementally or keeping it unchanged, and the states affected,
+        reused, explored and labeled again by the incremental updates.
+        """
+        return dict(self._statistics)
+
+
+    def update(self):
+        """
+        Apply the changes of the net recorded in its journal since the last
+        update. Returns False if there were no changes.
+        """
+        changes = self._net.get_journal(self._position)
+        if not changes:
+            return False
+        self._position += len(changes)
+        self._statistics["updates"] += 1
+        if any([change[0] in ("P", "T", "L") for change in changes]):
+            self._rebuild()
+            return True
+        changed = set([self._net._transition_index[change[2]]
+                       for change in changes])
+        if len(changed) > REBUILD_FRACTION * len(self._net._transitions):
+            self._rebuild()
+            return True
+        candidates = self._get_candidates(changes, changed)
+        if len(candidates) > REBUILD_FRACTION * self._graph.num_states():
+            self._rebuild()
+            return True
+        size = self._graph.num_states()
+        (dirty, new, ids) = update_graph(self._net, self._graph, candidates,
+                                         changed)
+        self._statistics["affected_states"] += len(dirty)
+        if not dirty:
+            self._statistics["unchanged"] += 1
+            LOG.info("Net changes do not affect the reachability graph")
+            return True
+        self._statistics["incremental"] += 1
+        reused = size
+        if ids is not None:
+            reused = len([new_id for new_id in ids[:size] if new_id >= 0])
+        self._statistics["reused_states"] += reused
+        self._statistics["explored_states"] += len(new)
+        self._statistics["relabeled_states"] += self._checker.update(
+            self._graph, dirty + new, ids)
+        return True
+
+
+    def _get_candidates(self, changes, changed):
+        """
+        Get the ids of the states where a 'changed' transition index is
+        enabled, before or after the flow 'changes' of the journal.
+        """
+        net = self._net
+        presets = []
+        for t_index in changed:
+            preset = net._preset[net._transitions[t_index]]
+            previous = dict(preset)
+            for change in reversed(changes):
+                if (change[0] == "I" and
+                        net._transition_index[change[2]] == t_index):
+                    (_, place, _, old_value, _) = change
+                    if old_value:
+                        previous[place] = old_value
+                    else:
+                        previous.pop(place, None)
+            presets.extend([preset, previous])
+        candidates = set()
+        for preset in presets:
+            candidates.update(self._get_enabled(preset))
+        return sorted(candidates)
+
+
+    def _get_enabled(self, preset):
+        """
+        Get the ids of the states with enough tokens for the 'preset', a
+        dictionary from place to the tokens it needs.
+        """
+        members = None
+        for (place, value) in preset.iteritems():
+            tokens = self._graph.tokens(self._net._place_index[place])
+            if members is None:
+                members = [state_id for (state_id, count)
+                           in enumerate(tokens) if count >= value]
+            else:
+                members = [state_id for state_id in members
+                           if tokens[state_id] >= value]
+        if members is None:
+            return xrange(self._graph.num_states())
+        return members
+
+
+    def _rebuild(self):
+        """ Build the reachability graph of the net from scratch """
+        self._statistics["rebuilds"] += 1
+        self._set_graph(self._net.reachability_graph(self._m_0))
+
+
+    def _set_graph(self, graph):
+        """ Use 'graph' as the current graph, dropping all the labels """
+        self._graph = graph
+        self._checker = ModelChecker(self._net, graph=graph)
@@ -3,7 +3,9 @@
                               DESCRIPTION
 ================================================================================
 
-  This is module includes the Singleton class for some formulae and models.
+  This is module includes the Singleton class for some formulae and models,
+  and the HashConsed class to share one instance among all the objects built
+  with the same arguments.
 
 ================================================================================
                               MAINTAINERS
@@ -26,17 +28,41 @@
 ================================================================================
 
       Version: 0.1
-  Last Update: 27-03-2016
+  Last Update: 18-10-2026
 
   Date        Alias      Description
 --------------------------------------------------------------------------------
   27-03-2016  ulisesma   Initial creation of singleton
+  18-10-2026  ulisesma   Hash consing metaclass
 
 """
 
+import weakref
+
 class Singleton(type):
     _instances = {}
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
             cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
+
+
+class HashConsed(type):
+    """
+    Metaclass returning the existing instance of the class built with the same
+    arguments, if it is still alive, instead of creating a new one. The
+    arguments must be hashable; otherwise a new instance is always created.
+    """
+    def __init__(cls, name, bases, attributes):
+        super(HashConsed, cls).__init__(name, bases, attributes)
+        cls._instances = weakref.WeakValueDictionary()
+
+    def __call__(cls, *args):
+        try:
+            instance = cls._instances.get(args)
+        except TypeError:
+            return super(HashConsed, cls).__call__(*args)
+        if instance is None:
+            instance = super(HashConsed, cls).__call__(*args)
+            cls._instances[args] = instance
+        return instance
@@ -0,0 +1,593 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the on-disk state store, used to explore state spaces
+  larger than the memory. Every array of the graph is a file of a directory,
+  mapped in memory and only appended to:
+
+    * markings.bin: one fixed width row of 32 bits integers per state.
+    * parents.bin: the parent of every state (see ReachabilityGraph).
+    * offsets.bin, targets.bin and labels.bin: the edges in compressed
+      sparse row form.
+    * index.bin: an open addressing hash table from markings to state ids,
+      with linear probing, doubled when it is half full.
+    * bloom.bin: an optional Bloom filter in front of the index, so new
+      markings are found without probing the index.
+    * meta.json: the P and T sets and the sizes of the arrays.
+
+  Only the batch of markings being expanded is kept in memory, the frontier
+  is the range of states not expanded yet. A complete store can be opened
+  again as a StoredGraph, a read only ReachabilityGraph over the mapped
+  files, to check formulae without exploring the net again.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from error_handling import PetriNetException
+from logger import LOG
+from reachability import BATCH_SIZE, ReachabilityGraph, pack_marking
+
+STORE_VERSION = 1
+META_FILE_NAME = "meta.json"
+TOKEN_TYPECODE = "i"
+OFFSET_TYPECODE = "l"
+MIN_CAPACITY = 1024
+MIN_INDEX_SLOTS = 1024
+CHUNK_ITEMS = 1 << 20
+BLOOM_HASHES = 4
+BLOOM_SEED = 0x5bd1e995
+
+
+class MappedFile(object):
+    """
+    Class to keep an array of 'typecode' items in the file 'file_name',
+    mapped in memory. New items are appended at the end, and the file grows
+    doubling its capacity. It is truncated to its items when closed.
+    """
+
+    def __init__(self, file_name, typecode, writable=True, create=False):
+        self._typecode = typecode
+        self._itemsize = array(typecode).itemsize
+        self._format = "@" + typecode
+        self._writable = writable
+        mode = "rb"
+        if create:
+            mode = "w+b"
+        elif writable:
+            mode = "r+b"
+        self._file = open(file_name, mode)
+        self._file.seek(0, 2)
+        self._size = self._file.tell() // self._itemsize
+        self._capacity = self._size
+        self._map = None
+        self._remap()
+
+
+    def _remap(self):
+        """ Map the current capacity of the file in memory """
+        if self._map is not None:
+            self._map.close()
+        self._map = None
+        length = self._capacity * self._itemsize
+        if length:
+            access = mmap.ACCESS_READ
+            if self._writable:
+                access = mmap.ACCESS_WRITE
+            self._map = mmap.mmap(self._file.fileno(), length, access=access)
+
+
+    def reserve(self, capacity):
+        """ Grow the file to hold at least 'capacity' items """
+        if capacity <= self._capacity:
+            return
+        self._capacity = max(capacity, 2 * self._capacity, MIN_CAPACITY)
+        self._file.truncate(self._capacity * self._itemsize)
+        self._remap()
+
+
+    def resize(self, size):
+        """ Set the number of items, the new ones are zero """
+        self.reserve(size)
+        self._size = size
+
+
+    def __len__(self):
+        return self._size
+
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._get_slice(key)
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("Mapped array index out of range")
+        return struct.unpack_from(self._format, self._map,
+                                  key * self._itemsize)[0]
+
+
+    def _get_slice(self, key):
+        """ Get an array with the items of the slice 'key' """
+        (start, stop, step) = key.indices(self._size)
+        if step < 1:
+            raise ValueError("Mapped array slices need a positive step")
+        values = array(self._typecode)
+        chunk = step * max(1, CHUNK_ITEMS // step)
+        for first in xrange(start, stop, chunk):
+            last = min(first + chunk, stop)
+            part = array(self._typecode)
+            part.fromstring(self._map[first * self._itemsize:
+                                      last * self._itemsize])
+            if step > 1:
+                part = part[::step]
+            values.extend(part)
+        return values
+
+
+    def __setitem__(self, key, value):
+        if not 0 <= key < self._size:
+            raise IndexError("Mapped array index out of range")
+        struct.pack_into(self._format, self._map, key * self._itemsize,
+                         value)
+
+
+    def __iter__(self):
+        for first in xrange(0, self._size, CHUNK_ITEMS):
+            for value in self[first:first + CHUNK_ITEMS]:
+                yield value
+
+
+    def bytes(self, start, stop):
+        """ Get the raw bytes of the items from 'start' to 'stop' """
+        return self._map[start * self._itemsize:stop * self._itemsize]
+
+
+    def append(self, value):
+        """ Append 'value' at the end """
+        self.reserve(self._size + 1)
+        struct.pack_into(self._format, self._map,
+                         self._size * self._itemsize, value)
+        self._size += 1
+
+
+    def extend(self, values):
+        """ Append the items of the iterable 'values' at the end """
+        data = array(self._typecode, values).tostring()
+        if not data:
+            return
+        start = self._size * self._itemsize
+        self.reserve(self._size + len(data) // self._itemsize)
+        self._map[start:start + len(data)] = data
+        self._size += len(data) // self._itemsize
+
+
+    def close(self):
+        """ Unmap the file, truncating it to its items """
+        if self._map is not None:
+            if self._writable:
+                self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._writable:
+            self._file.truncate(self._size * self._itemsize)
+        self._file.close()
+
+
+class BloomFilter(object):
+    """
+    Class to represent a Bloom filter of 'bits' bits in a mapped file, with
+    BLOOM_HASHES positions per key from two CRC32 checksums.
+    """
+
+    def __init__(self, file_name, bits, create=False, writable=True):
+        self._bits = bits
+        self._array = MappedFile(file_name, "B", writable, create)
+        if create:
+            self._array.resize((bits + 7) // 8)
+
+
+    def _positions(self, key):
+        h_1 = zlib.crc32(key) & 0xffffffff
+        h_2 = (zlib.crc32(key, BLOOM_SEED) & 0xffffffff) | 1
+        return [(h_1 + i * h_2) % self._bits for i in xrange(BLOOM_HASHES)]
+
+
+    def add(self, key):
+        """ Add the string 'key' to the filter """
+        for position in self._positions(key):
+            byte = position >> 3
+            self._array[byte] = self._array[byte] | 1 << (position & 7)
+
+
+    def __contains__(self, key):
+        for position in self._positions(key):
+            if not self._array[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+
+    def close(self):
+        """ Close the mapped file """
+        self._array.close()
+
+
+class HashIndex(object):
+    """
+    Class to find the rows of the MappedFile 'markings' ('width' items per
+    row) with an open addressing hash table of state ids plus one (0 for an
+    empty slot) in the file 'file_name'.
+    """
+
+    def __init__(self, file_name, markings, width, create=False,
+                 writable=True):
+        self._file_name = file_name
+        self._markings = markings
+        self._width = width
+        self._slots = MappedFile(file_name, OFFSET_TYPECODE, writable, create)
+        if create:
+            self._slots.resize(MIN_INDEX_SLOTS)
+
+
+    def _hash(self, key):
+        return zlib.crc32(key) & 0xffffffff
+
+
+    def find(self, key):
+        """
+        Get the pair (slot, state id) of the row with bytes 'key', the state
+        id is None and the slot is empty if the row is not indexed.
+        """
+        mask = len(self._slots) - 1
+        slot = self._hash(key) & mask
+        while True:
+            value = self._slots[slot]
+            if not value:
+                return (slot, None)
+            state_id = value - 1
+            if self._markings.bytes(state_id * self._width,
+                                    (state_id + 1) * self._width) == key:
+                return (slot, state_id)
+            slot = (slot + 1) & mask
+
+
+    def free_slot(self, key):
+        """ Get the empty slot for a 'key' known not to be indexed """
+        mask = len(self._slots) - 1
+        slot = self._hash(key) & mask
+        while self._slots[slot]:
+            slot = (slot + 1) & mask
+        return slot
+
+
+    def insert(self, slot, state_id, count):
+        """
+        Store 'state_id' in the empty 'slot', doubling the table if it
+        holds more than half of 'count' states.
+        """
+        self._slots[slot] = state_id + 1
+        if 2 * count > len(self._slots):
+            self._rehash(count)
+
+
+    def _rehash(self, count):
+        """ Double the table, inserting again the first 'count' states """
+        size = 2 * len(self._slots)
+        LOG.info("State store index grown to {0} slots".format(size))
+        self._slots.close()
+        self._slots = MappedFile(self._file_name, OFFSET_TYPECODE,
+                                 create=True)
+        self._slots.resize(size)
+        for state_id in xrange(count):
+            key = self._markings.bytes(state_id * self._width,
+                                       (state_id + 1) * self._width)
+            self._slots[self.free_slot(key)] = state_id + 1
+
+
+    def num_slots(self):
+        """ Get the number of slots """
+        return len(self._slots)
+
+
+    def close(self):
+        """ Close the mapped file """
+        self._slots.close()
+
+
+def _get_key(state):
+    """ Get the bytes of the row of the packed marking 'state' """
+    try:
+        return array(TOKEN_TYPECODE, state).tostring()
+    except OverflowError:
+        err_message = "Marking exceeds the state store token size"
+        raise PetriNetException(err_message)
+
+
+def _get_files(directory):
+    """ Get the dictionary of file names of a store in 'directory' """
+    names = ["markings", "parents", "offsets", "targets", "labels", "index",
+             "bloom"]
+    return dict([(name, os.path.join(directory, name + ".bin"))
+                 for name in names])
+
+
+class StateStore(object):
+    """
+    Class to write the states and edges of a reachability graph of a net
+    with 'places' and 'transitions' into the files of 'directory'. If
+    'bloom_bits' is not 0 a Bloom filter of that size is kept in front of
+    the index.
+    """
+
+    def __init__(self, directory, places, transitions, bloom_bits=0):
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._directory = directory
+        self._places = list(places)
+        self._transitions = list(transitions)
+        self._width = len(self._places)
+        files = _get_files(directory)
+        self._markings = MappedFile(files["markings"], TOKEN_TYPECODE,
+                                    create=True)
+        self._parents = MappedFile(files["parents"], TOKEN_TYPECODE,
+                                   create=True)
+        self._offsets = MappedFile(files["offsets"], OFFSET_TYPECODE,
+                                   create=True)
+        self._offsets.append(0)
+        self._targets = MappedFile(files["targets"], TOKEN_TYPECODE,
+                                   create=True)
+        self._labels = MappedFile(files["labels"], TOKEN_TYPECODE,
+                                  create=True)
+        self._index = HashIndex(files["index"], self._markings,
+                                self._width, create=True)
+        self._bloom_bits = bloom_bits
+        self._bloom = None
+        if bloom_bits:
+            self._bloom = BloomFilter(files["bloom"], bloom_bits, create=True)
+        elif os.path.exists(files["bloom"]):
+            os.remove(files["bloom"])
+        self._size = 0
+        self._statistics = {"bloom_skips": 0, "index_probes": 0}
+        self._write_meta(False)
+
+
+    def add(self, state):
+        """
+        Get the id of the packed marking 'state', adding it to the store if
+        it is not there. Returns an (id, new) pair.
+        """
+        key = _get_key(state)
+        if self._bloom is not None and key not in self._bloom:
+            self._statistics["bloom_skips"] += 1
+            slot = self._index.free_slot(key)
+        else:
+            self._statistics["index_probes"] += 1
+            (slot, state_id) = self._index.find(key)
+            if state_id is not None:
+                return (state_id, False)
+        state_id = self._size
+        self._markings.extend(state)
+        self._parents.append(-1)
+        self._size += 1
+        self._index.insert(slot, state_id, self._size)
+        if self._bloom is not None:
+            self._bloom.add(key)
+        return (state_id, True)
+
+
+    def add_succesors(self, succ):
+        """
+        Add the (transition index, target id) edges of the next state without
+        succesors. States must get their succesors in id order.
+        """
+        source = len(self._offsets) - 1
+        self._labels.extend([t_index for (t_index, _) in succ])
+        self._targets.extend([target for (_, target) in succ])
+        self._offsets.append(len(self._targets))
+        for (_, target) in succ:
+            if target and self._parents[target] < 0:
+                self._parents[target] = source
+
+
+    def marking(self, state_id):
+        """ Get the packed marking of a state """
+        return tuple(self._markings[state_id * self._width:
+                                    (state_id + 1) * self._width])
+
+
+    def num_states(self):
+        """ Get the number of states """
+        return self._size
+
+
+    def num_expanded(self):
+        """ Get the number of states with their succesors stored """
+        return len(self._offsets) - 1
+
+
+    def get_statistics(self):
+        """
+        Get the number of markings found new by the Bloom filter without
+        probing the index, and of index probes.
+        """
+        return dict(self._statistics)
+
+
+    def _write_meta(self, complete):
+        """ Write the description of the store, 'complete' if explored """
+        meta = {"version": STORE_VERSION, "P": self._places,
+                "T": self._transitions, "states": self._size,
+                "edges": len(self._targets),
+                "expanded": len(self._offsets) - 1,
+                "index_slots": self._index.num_slots(),
+                "bloom_bits": self._bloom_bits,
+                "byteorder": sys.byteorder,
+                "offset_size": array(OFFSET_TYPECODE).itemsize,
+                "complete": complete}
+        with open(os.path.join(self._directory, META_FILE_NAME),
+                  "w") as out_file:
+            json.dump(meta, out_file)
+
+
+    def close(self, complete=True):
+        """ Close the files, writing whether the exploration is 'complete' """
+        for mapped in (self._markings, self._parents, self._offsets,
+                       self._targets, self._labels, self._index):
+            mapped.close()
+        if self._bloom is not None:
+            self._bloom.close()
+        self._write_meta(complete)
+        LOG.info("State store closed with {0} states in '{1}'".format(
+            self._size, self._directory))
+
+
+class StoredGraph(ReachabilityGraph):
+    """
+    Class to represent the ReachabilityGraph kept in the StateStore of
+    'directory'. The graph is read only and its arrays are the mapped files
+    of the store, so they are only loaded when they are used.
+    """
+
+    def __init__(self, directory):
+        meta_file_name = os.path.join(directory, META_FILE_NAME)
+        if not os.path.exists(meta_file_name):
+            err_message = "No state store in '{0}'".format(directory)
+            raise PetriNetException(err_message)
+        with open(meta_file_name) as in_file:
+            meta = json.load(in_file)
+        if meta["version"] != STORE_VERSION:
+            err_message = "Unsupported state store version: '{0}'".format(
+                meta["version"])
+            raise PetriNetException(err_message)
+        if not meta["complete"]:
+            err_message = "State store in '{0}' is not complete".format(
+                directory)
+            raise PetriNetException(err_message)
+        if (meta["byteorder"] != sys.byteorder or
+                meta["offset_size"] != array(OFFSET_TYPECODE).itemsize):
+            err_message = "State store written by a different platform"
+            raise PetriNetException(err_message)
+        ReachabilityGraph.__init__(self, meta["P"], meta["T"])
+        files = _get_files(directory)
+        self._markings = MappedFile(files["markings"], TOKEN_TYPECODE,
+                                    writable=False)
+        self._parents = MappedFile(files["parents"], TOKEN_TYPECODE,
+                                   writable=False)
+        self._offsets = MappedFile(files["offsets"], OFFSET_TYPECODE,
+                                   writable=False)
+        self._targets = MappedFile(files["targets"], TOKEN_TYPECODE,
+                                   writable=False)
+        self._labels = MappedFile(files["labels"], TOKEN_TYPECODE,
+                                  writable=False)
+        self._store_index = HashIndex(files["index"], self._markings,
+                                      self._width, writable=False)
+        self._bloom = None
+        if meta["bloom_bits"]:
+            self._bloom = BloomFilter(files["bloom"], meta["bloom_bits"],
+                                      writable=False)
+        self._size = meta["states"]
+        self._directory = directory
+
+
+    def _intern(self, state):
+        err_message = "Stored graphs are read only"
+        raise PetriNetException(err_message)
+
+
+    def state_id(self, state):
+        """ Get the id of a packed marking, or None if it is not a state """
+        try:
+            key = array(TOKEN_TYPECODE, state).tostring()
+        except OverflowError:
+            return None
+        if self._bloom is not None and key not in self._bloom:
+            return None
+        return self._store_index.find(key)[1]
+
+
+    def release_index(self):
+        """ The index of a stored graph is on disk, nothing to release """
+        pass
+
+
+    def close(self):
+        """ Close the mapped files of the store """
+        for mapped in (self._markings, self._parents, self._offsets,
+                       self._targets, self._labels, self._store_index):
+            mapped.close()
+        if self._bloom is not None:
+            self._bloom.close()
+
+
+def explore_to_store(net, m_0, directory, bloom_bits=0, max_states=None):
+    """
+    Explore the reachability set of 'net' from the marking 'm_0' in breadth
+    first order like explore, writing the graph into a StateStore in
+    'directory' (with a Bloom filter of 'bloom_bits' bits if it is not 0).
+    Returns the StoredGraph of the store. It fails if the graph exceeds
+    'max_states' states, leaving the store marked as not complete.
+    """
+    store = StateStore(directory, net._places, net._transitions, bloom_bits)
+    complete = False
+    try:
+        store.add(pack_marking(net._places, m_0))
+        expanded = 0
+        while expanded < store.num_states():
+            batch = range(expanded,
+                          min(store.num_states(), expanded + BATCH_SIZE))
+            states = [store.marking(source) for source in batch]
+            succ = net._get_succesors_batch(states)
+            position = 0
+            for row in xrange(len(batch)):
+                edges = []
+                while position < len(succ) and succ[position][0] == row:
+                    (_, t_index, target_state) = succ[position]
+                    edges.append((t_index, store.add(target_state)[0]))
+                    position += 1
+                store.add_succesors(edges)
+            expanded = batch[-1] + 1
+            if max_states is not None and store.num_states() > max_states:
+                err_message = "Reachability graph exceeds {0} states".format(
+                    max_states)
+                raise PetriNetException(err_message)
+        complete = True
+    finally:
+        store.close(complete)
+    LOG.info("Stored exploration statistics: {0}".format(
+        store.get_statistics()))
+    return StoredGraph(directory)
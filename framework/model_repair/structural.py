@@ -0,0 +1,264 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the structural analysis of Petri Nets, computed from
+  the incidence matrix C = O - I without exploring the state space:
+
+    * P-invariants and T-invariants: the minimal support semi-positive
+      solutions of y.C = 0 and C.x = 0, computed with the Farkas algorithm
+      over integers.
+    * Minimal siphons and traps, computed with a branching search.
+    * Structural bounds of the places covered by a P-invariant.
+
+  When NumPy is available every step of the Farkas algorithm combines the
+  rows with array operations, while the coefficients fit in 64 bits.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+from fractions import gcd
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from logger import LOG
+
+DENSE_COEFFICIENT_LIMIT = 1 << 30
+
+
+def incidence_matrix(net):
+    """
+    Get the incidence matrix of 'net' as a list with a row per place and a
+    column per transition, following the order of the P and T sets.
+    """
+    matrix = [[0] * len(net._transitions) for place in net._places]
+    for ((place, transition), value) in net._output.iteritems():
+        matrix[net._place_index[place]][
+            net._transition_index[transition]] += value
+    for ((place, transition), value) in net._input.iteritems():
+        matrix[net._place_index[place]][
+            net._transition_index[transition]] -= value
+    return matrix
+
+
+def farkas(matrix):
+    """
+    Get the minimal support semi-positive integer vectors 'y' with
+    y.matrix = 0, as lists with one coefficient per row of 'matrix'.
+    """
+    size = len(matrix)
+    columns = len(matrix[0]) if matrix else 0
+    rows = []
+    for (i, row) in enumerate(matrix):
+        identity = [0] * size
+        identity[i] = 1
+        rows.append(list(row) + identity)
+    for column in xrange(columns):
+        if not rows:
+            break
+        largest = max([abs(value) for row in rows for value in row])
+        if numpy is not None and largest < DENSE_COEFFICIENT_LIMIT:
+            rows = _dense_step(rows, column, columns)
+        else:
+            rows = _step(rows, column, columns)
+    return [row[columns:] for row in rows]
+
+
+def _step(rows, column, columns):
+    """
+    Eliminate 'column' combining every pair of rows with opposite signs in
+    it, then keep only the normalized rows of minimal support.
+    """
+    positive = [row for row in rows if row[column] > 0]
+    negative = [row for row in rows if row[column] < 0]
+    result = [row for row in rows if row[column] == 0]
+    for row_1 in positive:
+        for row_2 in negative:
+            result.append([-row_2[column] * value_1 + row_1[column] * value_2
+                           for (value_1, value_2) in zip(row_1, row_2)])
+    return _minimal_rows([_normalize(row) for row in result], columns)
+
+
+def _dense_step(rows, column, columns):
+    """ Same as _step, combining the rows with NumPy arrays """
+    matrix = numpy.array(rows, dtype=numpy.int64)
+    values = matrix[:, column]
+    positive = matrix[values > 0]
+    negative = matrix[values < 0]
+    parts = [matrix[values == 0]]
+    if len(positive) and len(negative):
+        combined = (-negative[:, column])[None, :, None] * positive[:, None, :]
+        combined += positive[:, column][:, None, None] * negative[None, :, :]
+        parts.append(combined.reshape((-1, matrix.shape[1])))
+    matrix = numpy.vstack(parts)
+    if len(matrix):
+        divisors = numpy.gcd.reduce(matrix, axis=1)
+        divisors[divisors == 0] = 1
+        matrix //= divisors[:, None]
+    return _minimal_rows(matrix.tolist(), columns)
+
+
+def _normalize(row):
+    """ Divide 'row' by the greatest common divisor of its values """
+    divisor = 0
+    for value in row:
+        divisor = gcd(divisor, abs(value))
+    if divisor > 1:
+        row = [value // divisor for value in row]
+    return row
+
+
+def _minimal_rows(rows, columns):
+    """
+    Remove the repeated rows and those whose support, over the columns from
+    'columns' on, includes the support of another row.
+    """
+    supports = []
+    unique = []
+    seen = set()
+    for row in rows:
+        key = tuple(row)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(row)
+        supports.append(frozenset([i for (i, value)
+                                   in enumerate(row[columns:]) if value]))
+    order = sorted(xrange(len(unique)), key=lambda i: len(supports[i]))
+    kept = []
+    for i in order:
+        if not any([supports[j] < supports[i] or supports[j] == supports[i]
+                    for j in kept]):
+            kept.append(i)
+    kept.sort()
+    return [unique[i] for i in kept]
+
+
+def p_invariants(net):
+    """
+    Get the minimal support P-invariants of 'net' as dictionaries from place
+    to non zero weight.
+    """
+    vectors = farkas(incidence_matrix(net))
+    LOG.info("{0} P-invariants found".format(len(vectors)))
+    return [dict([(place, value) for (place, value)
+                  in zip(net._places, vector) if value])
+            for vector in vectors]
+
+
+def t_invariants(net):
+    """
+    Get the minimal support T-invariants of 'net' as dictionaries from
+    transition to non zero number of firings.
+    """
+    matrix = incidence_matrix(net)
+    transposed = [list(column) for column in zip(*matrix)]
+    if not matrix:
+        transposed = [[] for transition in net._transitions]
+    vectors = farkas(transposed)
+    LOG.info("{0} T-invariants found".format(len(vectors)))
+    return [dict([(transition, value) for (transition, value)
+                  in zip(net._transitions, vector) if value])
+            for vector in vectors]
+
+
+def _minimal_siphons(net, inputs, outputs):
+    """
+    Get the minimal sets of places S where every transition with an output
+    place in S has an input place in S, given the 'inputs' and 'outputs'
+    dictionaries from transition to places. Siphons use the preset and
+    postset, traps the postset and preset.
+    """
+    producers = dict([(place, []) for place in net._places])
+    for transition in net._transitions:
+        for place in outputs[transition]:
+            producers[place].append(transition)
+    found = []
+
+    def search(siphon, excluded):
+        if any([other <= siphon for other in found]):
+            return
+        for place in sorted(siphon, key=net._place_index.get):
+            for transition in producers[place]:
+                if any([other in siphon for other in inputs[transition]]):
+                    continue
+                for other in sorted(inputs[transition],
+                                    key=net._place_index.get):
+                    if other not in excluded:
+                        search(siphon | frozenset([other]), excluded)
+                return
+        found[:] = [other for other in found if not siphon <= other]
+        found.append(siphon)
+
+    for (i, place) in enumerate(net._places):
+        search(frozenset([place]), frozenset(net._places[:i]))
+    return [sorted(siphon, key=net._place_index.get) for siphon in found]
+
+
+def minimal_siphons(net):
+    """
+    Get the minimal siphons of 'net', sets of places whose producers all
+    consume from them, so once empty they stay empty.
+    """
+    siphons = _minimal_siphons(net, net._preset, net._postset)
+    LOG.info("{0} minimal siphons found".format(len(siphons)))
+    return siphons
+
+
+def minimal_traps(net):
+    """
+    Get the minimal traps of 'net', sets of places whose consumers all
+    produce in them, so once marked they stay marked.
+    """
+    traps = _minimal_siphons(net, net._postset, net._preset)
+    LOG.info("{0} minimal traps found".format(len(traps)))
+    return traps
+
+
+def structural_bounds(net, m_0, invariants=None):
+    """
+    Get the bound of every place from the marking 'm_0' given by the
+    P-invariants of 'net' (or the given 'invariants'), as a dictionary. The
+    bound is None for the places not covered by an invariant.
+    """
+    if invariants is None:
+        invariants = p_invariants(net)
+    bounds = dict([(place, None) for place in net._places])
+    for invariant in invariants:
+        total = sum([value * m_0.get(place, 0)
+                     for (place, value) in invariant.iteritems()])
+        for (place, value) in invariant.iteritems():
+            bound = total // value
+            if bounds[place] is None or bound < bounds[place]:
+                bounds[place] = bound
+    return bounds
@@ -0,0 +1,377 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the symbolic engine. The tokens of every place are
+  encoded as a bounded integer over boolean variables, and sets of markings
+  are BDDs over those variables. Every place has a current and a next copy
+  of its variables, interleaved bit by bit.
+
+  The transition relation of every transition is built from the flow
+  functions I and O over the places it uses, so the image and preimage of a
+  set of markings only quantify those variables and the rest are kept
+  unchanged. The reachable markings are computed as a least fixpoint and the
+  CTL operators EX, EU and EG are evaluated as fixpoints over them, taking
+  the paths ending in a deadlock as maximal paths.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+from collections import deque
+
+from bdd import BDD, FALSE, TRUE
+from error_handling import CTLException, PetriNetException
+from logger import LOG
+
+ORDERINGS = ["structural", "net"]
+
+
+def structural_order(net):
+    """
+    Get the places of 'net' ordered so places sharing a transition are close,
+    with a Cuthill-McKee traversal of the graph linking the places used by
+    the same transition, starting every component from a place of minimum
+    degree.
+    """
+    neighbours = dict([(place, set()) for place in net._places])
+    for transition in net._transitions:
+        used = set(net._preset[transition]) | set(net._postset[transition])
+        for place in used:
+            neighbours[place].update(used)
+    for place in net._places:
+        neighbours[place].discard(place)
+    position = net._place_index
+    key = lambda place: (len(neighbours[place]), position[place])
+    order = []
+    seen = set()
+    for root in sorted(net._places, key=key):
+        if root in seen:
+            continue
+        seen.add(root)
+        frontier = deque([root])
+        while frontier:
+            place = frontier.popleft()
+            order.append(place)
+            for other in sorted(neighbours[place] - seen, key=key):
+                seen.add(other)
+                frontier.append(other)
+    return order
+
+
+class SymbolicStateSpace(object):
+    """
+    Class to represent the reachable markings of a Petri Net as a BDD. Every
+    place holds at most 'bound' tokens, by default the largest number of
+    tokens of a place in the initial marking (at least 1). The variable
+    'ordering' is "structural" (see structural_order) or "net".
+    """
+
+    def __init__(self, net, m_0, bound=None, ordering="structural"):
+        if ordering not in ORDERINGS:
+            err_message = "Invalid variable ordering: '{0}'".format(ordering)
+            raise PetriNetException(err_message)
+        m_0 = net._fix_marking(m_0)
+        if bound is None:
+            bound = max([1] + m_0.values())
+        self._net = net
+        self._bound = bound
+        self._bits = max(1, bound.bit_length())
+        places = list(net._places)
+        if ordering == "structural":
+            places = structural_order(net)
+        self._vars = {}
+        for (i, place) in enumerate(places):
+            start = 2 * i * self._bits
+            self._vars[place] = range(start, start + 2 * self._bits, 2)
+        self._state_vars = sorted([var for place in places
+                                   for var in self._vars[place]])
+        self._bdd = BDD(2 * len(places) * self._bits)
+        self._relations = []
+        for transition in net._transitions:
+            self._relations.append(self._get_relation(transition))
+        self._initial = TRUE
+        for place in reversed(places):
+            if m_0[place] > bound:
+                err_message = "Marking exceeds bound {0} in '{1}'".format(
+                    bound, place)
+                raise PetriNetException(err_message)
+            self._initial = self._bdd.conjunction(
+                self._value(place, m_0[place]), self._initial)
+        self._reachable = self._get_reachable()
+        enabled = FALSE
+        for relation in self._relations:
+            enabled = self._bdd.disjunction(enabled, relation[3])
+        self._deadlocks = self._bdd.difference(self._reachable, enabled)
+
+
+    def _value(self, place, value, primed=False):
+        """
+        Get the BDD of the markings where 'place' has 'value' tokens, over its
+        next variables if 'primed' is True.
+        """
+        u = TRUE
+        shift = 1 if primed else 0
+        for (position, var) in enumerate(reversed(self._vars[place])):
+            if value >> position & 1:
+                u = self._bdd.node(var + shift, FALSE, u)
+            else:
+                u = self._bdd.node(var + shift, u, FALSE)
+        return u
+
+
+    def _get_relation(self, transition):
+        """
+        Get the tuple (relation, current variables, next variables, enabled,
+        overflow, renaming to current, renaming to next) of 'transition'. The
+        relation links the tokens of the places it uses before and after
+        firing it, 'enabled' are the markings where it can fire and
+        'overflow' those where firing it exceeds the bound.
+        """
+        preset = self._net._preset[transition]
+        postset = self._net._postset[transition]
+        relation = TRUE
+        enabled = TRUE
+        overflow = FALSE
+        current = set()
+        for place in set(preset) | set(postset):
+            consumed = preset.get(place, 0)
+            produced = postset.get(place, 0)
+            place_relation = FALSE
+            place_enabled = FALSE
+            for value in xrange(consumed, (1 << self._bits)):
+                if value > self._bound:
+                    break
+                is_value = self._value(place, value)
+                place_enabled = self._bdd.disjunction(place_enabled, is_value)
+                target = value - consumed + produced
+                if target > self._bound:
+                    overflow = self._bdd.disjunction(overflow, is_value)
+                    continue
+                place_relation = self._bdd.disjunction(
+                    place_relation, self._bdd.conjunction(
+                        is_value, self._value(place, target, True)))
+            relation = self._bdd.conjunction(relation, place_relation)
+            enabled = self._bdd.conjunction(enabled, place_enabled)
+            current.update(self._vars[place])
+        overflow = self._bdd.conjunction(enabled, overflow)
+        following = frozenset([var + 1 for var in current])
+        to_current = dict([(var + 1, var) for var in current])
+        to_next = dict([(var, var + 1) for var in current])
+        return (relation, frozenset(current), following, enabled, overflow,
+                to_current, to_next)
+
+
+    def _image(self, states, relation):
+        """ Get the markings reached firing the transition of 'relation' """
+        (relation, current, _, _, overflow, to_current, _) = relation
+        if self._bdd.conjunction(states, overflow) != FALSE:
+            err_message = "Reachable marking exceeds bound {0}".format(
+                self._bound)
+            raise PetriNetException(err_message)
+        return self._bdd.rename(
+            self._bdd.and_exists(states, relation, current), to_current)
+
+
+    def preimage(self, states):
+        """
+        Get the markings with a succesor in 'states', not restricted to the
+        reachable ones.
+        """
+        result = FALSE
+        for (relation, _, following, _, _, _, to_next) in self._relations:
+            primed = self._bdd.rename(states, to_next)
+            result = self._bdd.disjunction(
+                result, self._bdd.and_exists(primed, relation, following))
+        return result
+
+
+    def _get_reachable(self):
+        """
+        Compute the reachable markings as a least fixpoint, chaining the
+        transitions: the image of every transition is added to the markings
+        before computing the image of the next one, which needs fewer steps
+        than a breadth first fixpoint.
+        """
+        reachable = self._initial
+        frontier = self._initial
+        steps = 0
+        while frontier != FALSE:
+            previous = reachable
+            for relation in self._relations:
+                image = self._image(frontier, relation)
+                frontier = self._bdd.disjunction(frontier, image)
+            frontier = self._bdd.difference(frontier, previous)
+            reachable = self._bdd.disjunction(previous, frontier)
+            steps += 1
+        LOG.info("Symbolic reachability in {0} steps, {1} nodes".format(
+            steps, self._bdd.size(reachable)))
+        return reachable
+
+
+    def get_manager(self):
+        """ Get the BDD manager """
+        return self._bdd
+
+
+    def initial(self):
+        """ Get the BDD of the initial marking """
+        return self._initial
+
+
+    def reachable(self):
+        """ Get the BDD of the reachable markings """
+        return self._reachable
+
+
+    def deadlocks(self):
+        """ Get the BDD of the reachable markings without succesors """
+        return self._deadlocks
+
+
+    def marked(self, place):
+        """ Get the BDD of the markings with at least one token in 'place' """
+        u = FALSE
+        for var in self._vars[place]:
+            u = self._bdd.disjunction(u, self._bdd.var(var))
+        return u
+
+
+    def count(self, states):
+        """ Get the number of markings in the set 'states' """
+        return self._bdd.count(states, self._state_vars)
+
+
+    def num_states(self):
+        """ Get the number of reachable markings """
+        return self.count(self._reachable)
+
+
+    def statistics(self):
+        """
+        Get the number of reachable markings, the nodes of their BDD and the
+        nodes allocated by the manager.
+        """
+        return {"states": self.num_states(),
+                "nodes": self._bdd.size(self._reachable),
+                "allocated": self._bdd.num_nodes()}
+
+
+class SymbolicChecker(object):
+    """ Class to perform symbolic CTL model checking over a Petri Net """
+
+    def __init__(self, net, m_0=None, bound=None, ordering="structural",
+                 space=None):
+        """
+        Compute the SymbolicStateSpace of 'net' from the marking 'm_0', or use
+        'space' if it is given.
+        """
+        if space is None:
+            space = SymbolicStateSpace(net, m_0, bound, ordering)
+        self._space = space
+        self._bdd = space.get_manager()
+        self._reachable = space.reachable()
+        self._place_index = net._place_index
+        self._labels = {}
+        LOG.info("Symbolic model checker ready: {0}".format(
+            space.statistics()))
+
+
+    def check(self, formula):
+        """
+        Check if the initial marking satisfies the CTL 'formula'.
+        """
+        sat = self.label(formula)
+        result = self._bdd.conjunction(self._space.initial(), sat) != FALSE
+        LOG.info("Symbolic model checking result: \"{0}\"".format(result))
+        return result
+
+
+    def label(self, formula):
+        """ Get the BDD of the reachable markings satisfying 'formula' """
+        if formula not in self._labels:
+            self._labels[formula] = formula.evaluate(self)
+        return self._labels[formula]
+
+
+    def true(self):
+        """ BDD of the markings satisfying TRUE """
+        return self._reachable
+
+
+    def false(self):
+        """ BDD of the markings satisfying FALSE """
+        return FALSE
+
+
+    def atomic(self, place):
+        """ BDD of the markings with at least one token in 'place' """
+        if place not in self._place_index:
+            err_message = "Invalid place in formula: '{0}'".format(place)
+            raise CTLException(err_message)
+        return self._bdd.conjunction(self._reachable,
+                                     self._space.marked(place))
+
+
+    def negation(self, sat):
+        """ BDD of the reachable markings not in 'sat' """
+        return self._bdd.difference(self._reachable, sat)
+
+
+    def conjunction(self, sat_1, sat_2):
+        """ BDD of the markings both in 'sat_1' and 'sat_2' """
+        return self._bdd.conjunction(sat_1, sat_2)
+
+
+    def exist_next(self, sat):
+        """ BDD of the reachable markings with a succesor in 'sat' """
+        return self._bdd.conjunction(self._reachable,
+                                     self._space.preimage(sat))
+
+
+    def exist_until(self, sat_1, sat_2):
+        """ Least fixpoint Z = sat_2 or (sat_1 and EX Z) """
+        result = sat_2
+        while True:
+            step = self._bdd.disjunction(
+                sat_2, self._bdd.conjunction(sat_1, self.exist_next(result)))
+            if step == result:
+                return result
+            result = step
+
+
+    def exist_globally(self, sat):
+        """ Greatest fixpoint Z = sat and (EX Z or deadlock) """
+        result = sat
+        while True:
+            step = self._bdd.conjunction(sat, self._bdd.disjunction(
+                self.exist_next(result), self._space.deadlocks()))
+            if step == result:
+                return result
+            result = step
@@ -0,0 +1,304 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the symmetry reduction used by the exploration engine.
+  A symmetry group is a list of copies of the same subnet, each copy given as
+  a pair (places, transitions) where corresponding elements of the copies
+  play the same role. Any permutation of the copies must be an automorphism
+  of the net; places and transitions out of the copies (like a shared
+  resource) are kept fixed.
+
+  Markings in the same orbit are explored only once, through a canonical
+  representative where the sub-markings of the copies are sorted. Groups can
+  be declared by the user or detected from the isomorphic connected
+  components of the net once the nodes fixed by every automorphism are
+  left out, so copies coupled through a shared place (like a lock) are
+  found too.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+  18-10-2026  ulisesma   Detection of copies sharing fixed places
+
+"""
+
+from collections import deque
+
+from error_handling import PetriNetException
+from logger import LOG
+
+
+def _factorial(n):
+    result = 1
+    for i in xrange(2, n + 1):
+        result *= i
+    return result
+
+
+class Symmetry(object):
+    """
+    Class to represent the symmetries of a Petri Net as a list of groups of
+    interchangeable copies. Every copy is a pair (places, transitions).
+    """
+
+    def __init__(self, net, groups):
+        self._net = net
+        self._groups = []
+        used = set()
+        for group in groups:
+            copies = [(list(places), list(transitions))
+                      for (places, transitions) in group]
+            if len(copies) < 2:
+                err_message = "Symmetry group with less than two copies"
+                raise PetriNetException(err_message)
+            for (places, transitions) in copies:
+                if (len(places) != len(copies[0][0]) or
+                        len(transitions) != len(copies[0][1])):
+                    err_message = "Copies of different size: '{0}'".format(
+                        places + transitions)
+                    raise PetriNetException(err_message)
+                for element in places + transitions:
+                    if element in used:
+                        err_message = ("Element in several copies: "
+                                       "'{0}'").format(element)
+                        raise PetriNetException(err_message)
+                    used.add(element)
+                self._check_elements(places, transitions)
+            for copy in copies[1:]:
+                self._check_automorphism(copies[0], copy)
+            self._groups.append([[net._place_index[place]
+                                  for place in places]
+                                 for (places, _) in copies])
+        LOG.info("Symmetry with {0} groups".format(len(self._groups)))
+
+
+    def _check_elements(self, places, transitions):
+        """ Check that every place and transition is in the net """
+        for place in places:
+            if place not in self._net._place_index:
+                err_message = "Invalid place: '{0}'".format(place)
+                raise PetriNetException(err_message)
+        for transition in transitions:
+            if transition not in self._net._transition_index:
+                err_message = "Invalid transition: '{0}'".format(transition)
+                raise PetriNetException(err_message)
+
+
+    def _check_automorphism(self, copy_1, copy_2):
+        """
+        Check that swapping 'copy_1' and 'copy_2' keeps the flow functions,
+        which makes every permutation of the copies an automorphism.
+        """
+        place_map = {}
+        transition_map = {}
+        for (mapping, elements_1, elements_2) in (
+                (place_map, copy_1[0], copy_2[0]),
+                (transition_map, copy_1[1], copy_2[1])):
+            for (element_1, element_2) in zip(elements_1, elements_2):
+                mapping[element_1] = element_2
+                mapping[element_2] = element_1
+        for flow_function in (self._net._input, self._net._output):
+            for ((place, transition), value) in flow_function.iteritems():
+                key = (place_map.get(place, place),
+                       transition_map.get(transition, transition))
+                if flow_function.get(key, 0) != value:
+                    err_message = ("Copies '{0}' and '{1}' are not "
+                                   "symmetric").format(copy_1[0], copy_2[0])
+                    raise PetriNetException(err_message)
+
+
+    def num_groups(self):
+        """ Get the number of symmetry groups """
+        return len(self._groups)
+
+
+    def canonical(self, state):
+        """
+        Get the representative of the orbit of the packed marking 'state',
+        where the sub-markings of the copies of every group are sorted.
+        """
+        if not self._groups:
+            return state
+        canonical = list(state)
+        for group in self._groups:
+            subs = sorted([tuple([state[i] for i in copy]) for copy in group])
+            for (copy, sub) in zip(group, subs):
+                for (i, value) in zip(copy, sub):
+                    canonical[i] = value
+        return tuple(canonical)
+
+
+    def orbit_size(self, state):
+        """ Get the number of markings in the orbit of 'state' """
+        size = 1
+        for group in self._groups:
+            counts = {}
+            for copy in group:
+                sub = tuple([state[i] for i in copy])
+                counts[sub] = counts.get(sub, 0) + 1
+            size *= _factorial(len(group))
+            for count in counts.itervalues():
+                size //= _factorial(count)
+        return size
+
+
+def detect_symmetry(net):
+    """
+    Get the Symmetry of 'net' whose groups are its isomorphic connected
+    components, leaving out the nodes of a structural color of their own,
+    which every automorphism keeps fixed (like a place shared by the copies
+    as a lock). Components are matched by a canonical traversal over the
+    structural colors of their nodes and of the fixed nodes they are linked
+    to, and groups which are not automorphisms are discarded.
+    """
+    (nodes, neighbours) = _get_structure(net)
+    colors = _refine_colors(nodes, neighbours)
+    sizes = {}
+    for node in nodes:
+        sizes[colors[node]] = sizes.get(colors[node], 0) + 1
+    fixed = set([node for node in nodes if sizes[colors[node]] == 1])
+    if fixed:
+        LOG.info("{0} nodes fixed by the symmetries".format(len(fixed)))
+    classes = {}
+    for component in _get_components(nodes, neighbours, fixed):
+        (code, order) = _canonical_traversal(component, neighbours, colors)
+        classes.setdefault(code, []).append(order)
+    groups = []
+    for code in sorted(classes):
+        orders = classes[code]
+        if len(orders) < 2:
+            continue
+        group = [([name for (kind, name) in order if kind == "p"],
+                  [name for (kind, name) in order if kind == "t"])
+                 for order in orders]
+        try:
+            Symmetry(net, [group])
+        except PetriNetException:
+            LOG.info("Discarding non symmetric components")
+            continue
+        groups.append(group)
+    LOG.info("Detected {0} symmetry groups".format(len(groups)))
+    return Symmetry(net, groups)
+
+
+def _get_structure(net):
+    """
+    Get the nodes of 'net' as (kind, name) pairs and the (direction, weight,
+    node) neighbours of every node.
+    """
+    nodes = ([("p", place) for place in net._places] +
+             [("t", transition) for transition in net._transitions])
+    neighbours = dict([(node, []) for node in nodes])
+    for ((place, transition), value) in net._input.iteritems():
+        neighbours[("p", place)].append((1, value, ("t", transition)))
+        neighbours[("t", transition)].append((-1, value, ("p", place)))
+    for ((place, transition), value) in net._output.iteritems():
+        neighbours[("t", transition)].append((1, value, ("p", place)))
+        neighbours[("p", place)].append((-1, value, ("t", transition)))
+    return (nodes, neighbours)
+
+
+def _refine_colors(nodes, neighbours):
+    """
+    Color the nodes by kind and refine the colors with the colors of their
+    neighbours until the number of colors is stable.
+    """
+    colors = dict([(node, node[0]) for node in nodes])
+    count = len(set(colors.itervalues()))
+    while True:
+        signatures = {}
+        for node in nodes:
+            signatures[node] = (colors[node], tuple(sorted(
+                [(direction, value, colors[other])
+                 for (direction, value, other) in neighbours[node]])))
+        palette = dict([(signature, i) for (i, signature)
+                        in enumerate(sorted(set(signatures.itervalues())))])
+        colors = dict([(node, palette[signatures[node]]) for node in nodes])
+        if len(palette) == count:
+            return colors
+        count = len(palette)
+
+
+def _get_components(nodes, neighbours, fixed):
+    """
+    Get the connected components of the net without the 'fixed' nodes as
+    lists of nodes.
+    """
+    seen = set(fixed)
+    components = []
+    for root in nodes:
+        if root in seen:
+            continue
+        seen.add(root)
+        component = [root]
+        frontier = deque([root])
+        while frontier:
+            node = frontier.popleft()
+            for (_, _, other) in neighbours[node]:
+                if other not in seen:
+                    seen.add(other)
+                    component.append(other)
+                    frontier.append(other)
+        components.append(component)
+    return components
+
+
+def _canonical_traversal(component, neighbours, colors):
+    """
+    Get the smallest code of the breadth first traversals of 'component'
+    starting from its nodes of smallest color, together with the node order
+    of that traversal. Fixed nodes out of the component are not traversed,
+    they are coded by their color, which only they have.
+    """
+    first = min([colors[node] for node in component])
+    members = set(component)
+    best = None
+    for root in component:
+        if colors[root] != first:
+            continue
+        order = [root]
+        position = {root: 0}
+        frontier = deque([root])
+        while frontier:
+            node = frontier.popleft()
+            arcs = sorted(neighbours[node],
+                          key=lambda arc: (arc[0], arc[1], colors[arc[2]]))
+            for (_, _, other) in arcs:
+                if other not in position and other in members:
+                    position[other] = len(order)
+                    order.append(other)
+                    frontier.append(other)
+        arcs = []
+        for node in order:
+            for (direction, value, other) in neighbours[node]:
+                target = position.get(other, ("fixed", colors[other]))
+                arcs.append((position[node], direction, value, target))
+        code = (tuple([colors[node] for node in order]), tuple(sorted(arcs)))
+        if best is None or code < best[0]:
+            best = (code, order)
+    return best
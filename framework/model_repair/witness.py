@@ -0,0 +1,142 @@
+"""
+================================================================================
+                              DESCRIPTION
+================================================================================
+
+  This module includes the results of model checking. A CheckResult behaves
+  as the boolean result of a formula, and it can carry the path showing it:
+  a witness of the formula if it holds, or a counterexample (a witness of
+  the negated formula) if it does not. Paths are given as the sequence of
+  fired transitions and the sequence of markings they reach, starting from
+  the initial marking.
+
+  Paths printed by LoLA with the --path option are read with lola_path,
+  which replays them over the net to get the markings.
+
+================================================================================
+                              MAINTAINERS
+================================================================================
+
+  This section contains all the maintainers primary information to get track of
+  the contributors to this code in the file. The maintainer's list contains a
+  maintainer alias (required), his name (optional) and contact mails (one
+  required).
+
+
+  Alias     Name              Mail
+--------------------------------------------------------------------------------
+  ulisesma  Ulises Martinez   ulises.martinezaraiza.mx@ieee.org
+                              umartinez@gdl.cinvestav.mx
+
+
+================================================================================
+                              CHANGE LOG
+================================================================================
+
+      Version: 0.1
+  Last Update: 18-10-2026
+
+  Date        Alias      Description
+--------------------------------------------------------------------------------
+  18-10-2026  ulisesma   Initial file creation
+
+"""
+
+from logger import LOG
+from reachability import fire, pack_marking, transition_flows
+from reachability import unpack_marking
+
+LOLA_PATH_PREFIX = "lola: print"
+
+
+class CheckResult(object):
+    """
+    Class to represent the result of checking 'formula' in an initial
+    marking. It is true or false as the boolean 'value'. The 'transitions'
+    and 'markings' (dictionaries, one more than the transitions) are the
+    witness or counterexample path, or None if there is no path. The path is
+    'complete' if it fully shows the result, it is not when the witness
+    needs several branches or the formula has universal operators.
+    """
+
+    def __init__(self, value, formula, transitions=None, markings=None,
+                 complete=False):
+        self.value = bool(value)
+        self.formula = formula
+        self.transitions = transitions
+        self.markings = markings
+        self.complete = complete and transitions is not None
+
+
+    def __nonzero__(self):
+        return self.value
+
+
+    def __eq__(self, other):
+        if isinstance(other, (bool, CheckResult)):
+            return self.value == bool(other)
+        return NotImplemented
+
+
+    def __ne__(self, other):
+        if isinstance(other, (bool, CheckResult)):
+            return self.value != bool(other)
+        return NotImplemented
+
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+    def __str__(self):
+        return str(self.value)
+
+
+    def __repr__(self):
+        return "CheckResult(value={0}, transitions={1})".format(
+            self.value, self.transitions)
+
+
+    def has_path(self):
+        """ Check if the result carries a witness or counterexample path """
+        return self.transitions is not None
+
+
+    def is_witness(self):
+        """
+        Check if the path is a witness of the formula, otherwise it is a
+        counterexample.
+        """
+        return self.value
+
+
+def lola_path(net, m_0, output):
+    """
+    Get the pair (transitions, markings) of the path printed by LoLA in its
+    standard 'output', replaying it from the marking 'm_0' of 'net'. Lines
+    which are not transitions of the net, like the cycle delimiters, are
+    skipped. Returns None if the path can not be fired.
+    """
+    flows = transition_flows(net)
+    state = pack_marking(net._places, net._fix_marking(dict(m_0)))
+    transitions = []
+    markings = [unpack_marking(net._places, state)]
+    for line in output.splitlines():
+        transition = line.strip()
+        if transition not in net._transition_index:
+            continue
+        state = fire(flows[net._transition_index[transition]], state)
+        if state is None:
+            LOG.info("LoLA path not fireable at '{0}'".format(transition))
+            return None
+        transitions.append(transition)
+        markings.append(unpack_marking(net._places, state))
+    return (transitions, markings)
+
+
+def has_lola_path(lola_output):
+    """ Check if LoLA reported in 'lola_output' that it printed a path """
+    for line in lola_output.splitlines():
+        if line.startswith(LOLA_PATH_PREFIX) and "path" in line:
+            return True
+    return False
@@ -0,0 +1,63 @@
+"""
+Tests of the parallel exploration of reachability sets, run from the
+framework directory with: python -m unittest discover tests
+"""
+
+import unittest
+
+from model_repair.petri_net import PetriNet
+
+
+def cycles_net(cycles, length):
+    """
+    Get a net of 'cycles' independent cycles of 'length' places with a token
+    in the first place of every cycle, and its initial marking.
+    """
+    net = PetriNet()
+    m_0 = {}
+    for cycle in xrange(cycles):
+        places = ["p{0}_{1}".format(cycle, i) for i in xrange(length)]
+        net.add_places(places)
+        for i in xrange(length):
+            transition = "t{0}_{1}".format(cycle, i)
+            net.add_transitions([transition])
+            net.change_input_flow(places[i], transition, 1)
+            net.change_output_flow(places[(i + 1) % length], transition, 1)
+        m_0[places[0]] = 1
+    return (net, m_0)
+
+
+class ParallelExplorationTest(unittest.TestCase):
+
+    def assert_same_graph(self, expected, graph):
+        for name in ("_markings", "_offsets", "_targets", "_labels",
+                     "_parents"):
+            self.assertEqual(getattr(expected, name).tolist(),
+                             getattr(graph, name).tolist(), name)
+        self.assertEqual(expected.num_states(), graph.num_states())
+
+
+    def test_same_graph_as_sequential(self):
+        (net, m_0) = cycles_net(3, 4)
+        expected = net.reachability_graph(dict(m_0), workers=1)
+        graph = net.reachability_graph(dict(m_0), workers=3)
+        self.assert_same_graph(expected, graph)
+
+
+    def test_same_bit_packed_graph(self):
+        (net, m_0) = cycles_net(2, 5)
+        expected = net.reachability_graph(dict(m_0), bit_packed=True)
+        graph = net.reachability_graph(dict(m_0), bit_packed=True,
+                                       workers=3)
+        self.assert_same_graph(expected, graph)
+
+
+    def test_same_indexed_set(self):
+        (net, m_0) = cycles_net(3, 3)
+        self.assertEqual(net.reachability_set(dict(m_0), indexed=True),
+                         net.reachability_set(dict(m_0), indexed=True,
+                                              workers=3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Tests of the symmetry reduction, run from the framework directory with:
+python -m unittest discover tests
+"""
+
+import unittest
+
+from model_repair.petri_net import PetriNet
+
+
+def lock_net(copies):
+    """
+    Get a net of 'copies' processes entering a critical section through a
+    shared lock place, its initial marking and the declared copies.
+    """
+    net = PetriNet()
+    net.add_places(["lock"])
+    m_0 = {"lock": 1}
+    group = []
+    for copy in xrange(copies):
+        places = ["idle{0}".format(copy), "wait{0}".format(copy),
+                  "crit{0}".format(copy)]
+        transitions = ["request{0}".format(copy), "enter{0}".format(copy),
+                       "exit{0}".format(copy)]
+        net.add_places(places)
+        net.add_transitions(transitions)
+        net.change_input_flow(places[0], transitions[0], 1)
+        net.change_output_flow(places[1], transitions[0], 1)
+        net.change_input_flow(places[1], transitions[1], 1)
+        net.change_input_flow("lock", transitions[1], 1)
+        net.change_output_flow(places[2], transitions[1], 1)
+        net.change_input_flow(places[2], transitions[2], 1)
+        net.change_output_flow(places[0], transitions[2], 1)
+        net.change_output_flow("lock", transitions[2], 1)
+        m_0[places[0]] = 1
+        group.append((places, transitions))
+    return (net, m_0, group)
+
+
+class SymmetryTest(unittest.TestCase):
+
+    def test_detect_copies_sharing_lock(self):
+        (net, m_0, group) = lock_net(4)
+        symmetry = net.get_symmetry()
+        self.assertEqual(symmetry.num_groups(), 1)
+        graph = net.reachability_graph(dict(m_0), symmetry=symmetry)
+        declared = net.reachability_graph(dict(m_0),
+                                          symmetry=net.get_symmetry([group]))
+        full = net.reachability_graph(dict(m_0))
+        self.assertEqual(graph.num_states(), declared.num_states())
+        self.assertEqual(graph.get_statistics()["markings"],
+                         full.num_states())
+        self.assertLess(graph.num_states(), full.num_states())
+
+
+if __name__ == "__main__":
+    unittest.main()